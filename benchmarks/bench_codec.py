@@ -0,0 +1,133 @@
+"""Per-request cost of request validation and response serialization
+
+Compares FastAPI's default handling of a /predict call (pydantic body
+validation, response_model validation, json encoding) with the codec
+path the prediction endpoints use (orjson decoding, precompiled field
+checks or unchecked construction for internal callers, ORJSONResponse).
+Scoring is stubbed out so only the codec differs. Reports each step on
+its own and whole requests through the ASGI app.
+
+Usage:
+    python -m benchmarks.bench_codec [--requests 20000]
+"""
+from typing import Optional
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+import orjson
+
+from src.api import codec
+from src.api.endpoints import CANARY_CUSTOMERS, PredictionResponse
+from src.data.ingestion import CustomerData
+
+BODY = orjson.dumps(CANARY_CUSTOMERS[0].dict(by_alias=True))
+RESULT = {
+    "customer_id": "CANARY1",
+    "churn_probability": 0.8342136794585354,
+    "risk_factors": {
+        "tenure_risk": 0.15401196, "payment_risk": 0.2, "contract_risk": 0.15,
+        "service_risk": 0.15, "cost_risk": 0.1, "age_risk": 0.016
+    },
+    "risk_level": "High"
+}
+
+def _per_call_us(func, repeats: int) -> float:
+    """Best of five runs, in microseconds per call"""
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeats)
+    return best * 1e6
+
+def _apps():
+    """A FastAPI-default /predict and a codec /predict, both with stub scoring"""
+    default_app = FastAPI()
+
+    @default_app.post("/predict", response_model=PredictionResponse)
+    async def default_predict(customer: CustomerData):
+        return dict(RESULT, customer_id=customer.customer_id)
+
+    codec_app = FastAPI()
+
+    @codec_app.post("/predict", response_model=PredictionResponse)
+    async def codec_predict(request: Request, x_internal_token: Optional[str] = Header(None)):
+        customer = codec.parse_customer(await codec.read_json(request), trusted=x_internal_token == "internal")
+        return codec.FastJSONResponse(dict(RESULT, customer_id=customer.customer_id))
+
+    return default_app, codec_app
+
+async def _request(app, headers) -> None:
+    """One POST /predict straight through the ASGI app"""
+    scope = {
+        "type": "http", "method": "POST", "path": "/predict", "query_string": b"",
+        "headers": headers, "http_version": "1.1", "scheme": "http",
+        "server": ("bench", 80), "client": ("bench", 1), "root_path": ""
+    }
+    messages = [{"type": "http.request", "body": BODY, "more_body": False}]
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+
+    await app(scope, receive, send)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+    n = args.requests
+
+    response_field = create_response_field(name="response", type_=PredictionResponse)
+    loop = asyncio.new_event_loop()
+
+    def default_response():
+        # serialize_response never awaits for async handlers; step it without a loop
+        coroutine = serialize_response(field=response_field, response_content=RESULT)
+        try:
+            coroutine.send(None)
+        except StopIteration as done:
+            return JSONResponse(done.value).body
+
+    steps = [
+        ("decode + validate", [
+            ("pydantic", lambda: CustomerData.parse_obj(orjson.loads(BODY))),
+            ("precompiled", lambda: codec.parse_customer(orjson.loads(BODY))),
+            ("internal", lambda: codec.parse_customer(orjson.loads(BODY), trusted=True))
+        ]),
+        ("validate + encode response", [
+            ("response_model + json", default_response),
+            ("orjson, no validation", lambda: codec.FastJSONResponse(RESULT).body),
+            ("jsonable_encoder only", lambda: JSONResponse(jsonable_encoder(RESULT)).body)
+        ])
+    ]
+    print(f"{'step':<28} {'variant':<24} {'us/call':>9}")
+    for step, variants in steps:
+        for name, func in variants:
+            print(f"{step:<28} {name:<24} {_per_call_us(func, n):>9.2f}")
+
+    default_app, codec_app = _apps()
+    json_headers = [(b"content-type", b"application/json")]
+    internal_headers = json_headers + [(b"x-internal-token", b"internal")]
+    print(f"\n{'whole request':<28} {'variant':<24} {'us/call':>9}")
+    for name, app, headers in [
+        ("fastapi default", default_app, json_headers),
+        ("codec", codec_app, json_headers),
+        ("codec, internal caller", codec_app, internal_headers)
+    ]:
+        elapsed = _per_call_us(lambda: loop.run_until_complete(_request(app, headers)), n // 10)
+        print(f"{'':<28} {name:<24} {elapsed:>9.2f}")
+    loop.close()
+
+if __name__ == "__main__":
+    main()
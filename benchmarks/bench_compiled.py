@@ -0,0 +1,66 @@
+"""Microbenchmarks for the compiled tree-ensemble inference engine
+
+Compares scikit-learn's predict_proba with CompiledEnsemble.predict_proba
+on the same fitted model for batch sizes from 1 to 100k rows, and checks
+that both return identical probabilities.
+
+Usage:
+    python -m benchmarks.bench_compiled [--engine gbm|hist] [--trees 500]
+"""
+import argparse
+import time
+import numpy as np
+
+from src.models.compiled import CompiledEnsemble
+from src.models.trainer import ModelTrainer
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000, 100000]
+
+def _best_time(func, X, min_seconds: float = 0.2, max_repeats: int = 1000) -> float:
+    """Best per-call wall time over repeated calls"""
+    best = float('inf')
+    total = 0.0
+    repeats = 0
+    while (total < min_seconds or repeats < 3) and repeats < max_repeats:
+        start = time.perf_counter()
+        func(X)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        repeats += 1
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--engine', choices=ModelTrainer.engines, default='gbm')
+    parser.add_argument('--trees', type=int, default=500)
+    parser.add_argument('--train-rows', type=int, default=20000)
+    parser.add_argument('--features', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(max(BATCH_SIZES), args.features))
+    y = (X[:, 0] + X[:, 1] ** 2 + rng.normal(size=len(X)) > 1).astype(int)
+
+    trainer = ModelTrainer(engine=args.engine)
+    if args.engine == 'hist':
+        trainer.model.set_params(max_iter=args.trees, early_stopping=False)
+    else:
+        trainer.model.set_params(n_estimators=args.trees)
+    trainer.model.fit(X[:args.train_rows], y[:args.train_rows])
+    compiled = CompiledEnsemble.from_estimator(trainer.model)
+
+    print(f"engine={args.engine} trees={args.trees} nodes={len(compiled.feature)} depth={compiled.max_depth}")
+    print(f"{'rows':>8} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8} {'identical':>10}")
+    for n in BATCH_SIZES:
+        batch = X[:n]
+        identical = np.array_equal(trainer.model.predict_proba(batch), compiled.predict_proba(batch))
+        sklearn_time = _best_time(trainer.model.predict_proba, batch)
+        compiled_time = _best_time(compiled.predict_proba, batch)
+        print(
+            f"{n:>8} {sklearn_time * 1e3:>12.3f} {compiled_time * 1e3:>12.3f} "
+            f"{sklearn_time / compiled_time:>8.2f} {str(identical):>10}"
+        )
+
+if __name__ == "__main__":
+    main()
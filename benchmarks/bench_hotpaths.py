@@ -0,0 +1,211 @@
+"""Scaling curves for the data and model hot paths
+
+Times each hot path at sizes from 1 row up to --max-rows on synthetic
+Kaggle-layout data (benchmarks.workload). It then fits the log-log
+slope of time against size above --fit-from. Each path declares the
+slope it should have: 1 when work is proportional to the rows, 0 for
+per-call costs that should not grow with what is already on disk (a
+log append that rewrote the whole file would show a slope of 1). A
+path whose slope exceeds its expectation by more than --slack is
+reported as super-linear.
+
+Usage:
+    python -m benchmarks.bench_hotpaths [--max-rows 10000000] [--only load_data,predict]
+        [--output curves.json] [--fail-on-superlinear]
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+from benchmarks.workload import kaggle_frame, write_kaggle_csv
+from src.data.ingestion import DataIngestion
+from src.data.validator import DataValidator
+from src.models.model_manager import ModelManager
+from src.models.trainer import ModelTrainer
+from src.monitoring.performance import ModelMonitor
+
+SIZES = [10 ** k for k in range(8)]  # 1 row to 10M rows
+APPENDS_PER_CALL = 1000
+
+class HotPath(NamedTuple):
+    """A function to time and how to build its input for a given size"""
+    name: str
+    setup: Callable[[int, str], Any]  # (size, scratch directory) -> argument of run
+    run: Callable[[Any], Any]
+    expected_slope: float
+    max_size: int = SIZES[-1]
+    unit: str = "rows"
+    teardown: Optional[Callable[[Any], Any]] = None
+
+_trained = {}
+
+def _trained_model() -> ModelTrainer:
+    """A small trained model on the risk score, shared by the model paths"""
+    if 'model' not in _trained:
+        ingestion = DataIngestion()
+        df = ingestion._transform(kaggle_frame(5000, seed=1))
+        trainer = ModelTrainer()
+        trainer.model.set_params(n_estimators=100)
+        trainer.preprocessing = ingestion.fit_preprocessing(df)
+        X, y = trainer.prepare_data(ingestion.preprocess_data(df, trainer.preprocessing))
+        trainer.train(X, y)
+        _trained['model'] = trainer
+    return _trained['model']
+
+def _transformed(n: int) -> pd.DataFrame:
+    """Rows as load_data returns them"""
+    return DataIngestion()._transform(kaggle_frame(n))
+
+def _setup_load_data(n: int, workdir: str):
+    return DataIngestion(), write_kaggle_csv(os.path.join(workdir, f"kaggle_{n}.csv"), n)
+
+def _setup_preprocess(n: int, workdir: str):
+    return DataIngestion(), _transformed(n), _trained_model().preprocessing
+
+def _setup_validate(n: int, workdir: str):
+    return DataValidator(), _transformed(n)
+
+def _setup_predict(n: int, workdir: str):
+    trainer = _trained_model()
+    ingestion = DataIngestion()
+    features = ingestion.preprocess_data(_transformed(n), trainer.preprocessing)
+    return trainer, features[trainer.feature_columns].values
+
+def _setup_load_model(n: int, workdir: str):
+    """A models directory whose registry lists n versions, the newest a real model"""
+    models_dir = os.path.join(workdir, f"models_{n}")
+    manager = ModelManager(models_dir)
+    with open(manager.registry.manifest_path, 'w') as f:
+        for i in range(n - 1):
+            f.write(json.dumps({
+                'type': 'version', 'version': f"v_bench_{i:08d}", 'timestamp': f"bench_{i:08d}",
+                'metrics': {'accuracy': 0.5}, 'feature_columns': ['risk_score'],
+                'artifact': f"model_v_bench_{i:08d}.pkl", 'sha256': ''
+            }) + "\n")
+    manager.save_model(_trained_model().get_model_data(), {'accuracy': 0.9})
+    return models_dir
+
+def _load_model(models_dir: str):
+    # A fresh manager, as at startup or in a scoring worker
+    return ModelManager(models_dir).load_model()
+
+def _setup_append(n: int, workdir: str):
+    """A monitor whose prediction log already holds n records"""
+    monitor = ModelMonitor(
+        log_dir=os.path.join(workdir, f"logs_{n}"), flush_interval=3600,
+        max_buffer_records=APPENDS_PER_CALL * 10, max_file_bytes=1 << 40
+    )
+    record = json.dumps({
+        "timestamp": "2024-01-01T00:00:00", "customer_id": "C", "prediction": 0.5,
+        "response_time": 0.001, "features": {"tenure": 12}, "model_version": None
+    }) + "\n"
+    with open(monitor.prediction_log_path, 'w') as f:
+        for start in range(0, n, 100000):
+            f.write(record * min(100000, n - start))
+    entry = json.loads(record)
+    return monitor, entry
+
+def _append(state):
+    monitor, entry = state
+    for _ in range(APPENDS_PER_CALL):
+        monitor._append_to_log(monitor.prediction_log_path, entry)
+    monitor.flush()
+
+HOT_PATHS = [
+    HotPath("load_data", _setup_load_data, lambda s: s[0].load_data(s[1]), 1.0),
+    HotPath("preprocess_data", _setup_preprocess, lambda s: s[0].preprocess_data(s[1], s[2]), 1.0),
+    HotPath("validate_data", _setup_validate, lambda s: s[0].validate_data(s[1]), 1.0),
+    HotPath("predict", _setup_predict, lambda s: s[0].predict(s[1]), 1.0),
+    HotPath("load_model", _setup_load_model, _load_model, 1.0, max_size=10 ** 6, unit="registered versions"),
+    HotPath("append_to_log", _setup_append, _append, 0.0, unit="records already logged",
+            teardown=lambda s: s[0].close())
+]
+
+def _best_time(func, arg, min_seconds: float = 0.5, max_repeats: int = 50) -> float:
+    """Best wall time over repeats; a single run when one call is already slow"""
+    best = float('inf')
+    total = 0.0
+    repeats = 0
+    while repeats < max_repeats and (repeats < 3 or total < min_seconds) and not (repeats and total > 5):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        repeats += 1
+    return best
+
+def fit_slope(sizes: List[int], seconds: List[float], fit_from: int = 1000) -> Optional[float]:
+    """Log-log slope of time against size, over sizes of at least fit_from"""
+    points = [(n, t) for n, t in zip(sizes, seconds) if n >= fit_from and t > 0]
+    if len(points) < 2:
+        return None
+    x, y = np.log10([n for n, _ in points]), np.log10([t for _, t in points])
+    return float(np.polyfit(x, y, 1)[0])
+
+def measure(path: HotPath, sizes: List[int], workdir: str, fit_from: int = 1000, slack: float = 0.2) -> Dict:
+    """Scaling curve of one hot path"""
+    measured, seconds = [], []
+    for n in sizes:
+        if n > path.max_size:
+            continue
+        state = path.setup(n, workdir)
+        elapsed = _best_time(path.run, state)
+        measured.append(n)
+        seconds.append(elapsed)
+        if path.teardown:
+            path.teardown(state)
+        print(f"{path.name:<16} {n:>10} {path.unit:<24} {elapsed * 1e3:>12.3f} ms", flush=True)
+
+    slope = fit_slope(measured, seconds, fit_from)
+    return {
+        "unit": path.unit,
+        "sizes": measured,
+        "seconds": seconds,
+        "slope": slope,
+        "expected_slope": path.expected_slope,
+        "superlinear": slope is not None and slope > path.expected_slope + slack
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-rows', type=int, default=10 ** 6, help="Largest size, up to 10M")
+    parser.add_argument('--only', default=None, help=f"Comma-separated subset of {', '.join(p.name for p in HOT_PATHS)}")
+    parser.add_argument('--fit-from', type=int, default=1000, help="Smallest size used to fit the slope")
+    parser.add_argument('--slack', type=float, default=0.2, help="Allowed slope above the expected one")
+    parser.add_argument('--output', default=None, help="Write the curves as JSON here")
+    parser.add_argument('--fail-on-superlinear', action='store_true')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    paths = HOT_PATHS
+    if args.only:
+        paths = [p for p in HOT_PATHS if p.name in args.only.split(",")]
+    sizes = [n for n in SIZES if n <= args.max_rows]
+
+    curves = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for path in paths:
+            curves[path.name] = measure(path, sizes, workdir, args.fit_from, args.slack)
+
+    print(f"\n{'hot path':<16} {'slope':>7} {'expected':>9}")
+    for name, curve in curves.items():
+        slope = "n/a" if curve["slope"] is None else f"{curve['slope']:.2f}"
+        flag = "  SUPER-LINEAR" if curve["superlinear"] else ""
+        print(f"{name:<16} {slope:>7} {curve['expected_slope']:>9.1f}{flag}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"max_rows": args.max_rows, "fit_from": args.fit_from, "curves": curves}, f, indent=2)
+    if args.fail_on_superlinear and any(c["superlinear"] for c in curves.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Per-request CPU spent on logging in the prediction path
+
+Replays the logging statements of one /predict and one /predict/batch
+request under three setups:
+- before: logging.basicConfig(level=INFO) at import, with f-string
+  dumps of the input and of the frame columns on every request, written
+  synchronously by the calling thread;
+- after: the structured setup (configure_logging) at INFO, where the
+  payload is only built for sampled requests at DEBUG;
+- after, DEBUG: the same at DEBUG level, with 1% of payloads sampled.
+Output goes to /dev/null in all cases. "caller" is the CPU of the
+thread that logs, which is the event loop in the service. "process"
+adds the writer thread, measured once the queue has drained. Records
+the queue had no room for are counted as dropped.
+
+Usage:
+    python -m benchmarks.bench_logging [--requests 20000]
+"""
+import argparse
+import logging
+import os
+import time
+
+from src.api.endpoints import CANARY_CUSTOMERS
+from src.api.scoring import risk_scorer
+from src.monitoring.app_logging import PayloadSampler, configure_logging, dropped_records, stop_logging
+
+logger = logging.getLogger("src.api.endpoints")
+CUSTOMER = CANARY_CUSTOMERS[0]
+BATCH = [CUSTOMER] * 100
+COLUMNS = risk_scorer.customers_to_frame(BATCH).columns
+
+def before(customers):
+    """The statements the prediction path ran before"""
+    if len(customers) == 1:
+        logger.info(f"Input data: {customers[0].dict()}")
+    else:
+        logger.info(f"Scoring batch of {len(customers)} customers")
+        logger.info(f"Processed columns: {COLUMNS.tolist()}")
+        logger.info(f"Final columns: {COLUMNS.tolist()}")
+
+def after(customers, sampler=PayloadSampler(0.01)):
+    """The statements it runs now"""
+    if len(customers) == 1:
+        if sampler.sample(logger):
+            logger.debug("Input data", extra={"customer_id": customers[0].customer_id, "payload": customers[0].dict()})
+    else:
+        logger.debug("Scoring batch of %d customers", len(customers))
+
+def _measure(setup, teardown, statements, customers, n):
+    """Microseconds of CPU per request (calling thread, whole process) and records dropped"""
+    setup()
+    start_thread, start_process = time.thread_time(), time.process_time()
+    for _ in range(n):
+        statements(customers)
+    caller = time.thread_time() - start_thread
+    dropped = dropped_records()
+    teardown()  # waits for queued records to be written
+    process = time.process_time() - start_process
+    return caller / n * 1e6, process / n * 1e6, dropped
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+    devnull = open(os.devnull, 'w')
+    root = logging.getLogger()
+
+    def basic_config():
+        logging.basicConfig(level=logging.INFO, stream=devnull, force=True)
+
+    def no_handlers():
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+    setups = [
+        ("before", basic_config, no_handlers, before),
+        ("after", lambda: configure_logging("INFO", stream=devnull), stop_logging, after),
+        ("after, DEBUG", lambda: configure_logging("DEBUG", stream=devnull), stop_logging, after)
+    ]
+    print(f"{'request':<16} {'setup':<14} {'caller us':>10} {'process us':>11} {'dropped':>8}")
+    for request, customers in [("/predict", [CUSTOMER]), ("/predict/batch", BATCH)]:
+        for name, setup, teardown, statements in setups:
+            caller, process, dropped = _measure(setup, teardown, statements, customers, args.requests)
+            print(f"{request:<16} {name:<14} {caller:>10.2f} {process:>11.2f} {dropped:>8}")
+    devnull.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""Load tests for the prediction API with baselines and regression checks
+
+Drives /api/predict, /api/predict/batch and /api/predict/stream with
+generated CustomerData payloads. Closed-loop scenarios keep a fixed
+number of requests in flight. Open-loop scenarios send at a fixed
+arrival rate whatever the response times. Their latency counts from
+the scheduled send time, so queueing behind a slow server shows up
+instead of being hidden. Each scenario reports throughput,
+p50/p95/p99 latency and server CPU per request.
+
+Targets:
+    inprocess  the app in this process via httpx's ASGI transport
+               (CPU per request then includes the client)
+    uvicorn    a uvicorn subprocess on a free local port (server CPU only)
+    URL        an already running server (no CPU figures)
+
+Usage:
+    python -m benchmarks.loadtest [--target uvicorn] [--duration 10]
+        [--scenarios predict-c1,batch100-c4] [--output results.json]
+        [--baseline baseline.json [--save-baseline] [--tolerance 0.15]]
+
+Exits with status 1 when a baseline comparison finds regressions.
+"""
+from typing import Dict, List, NamedTuple, Optional
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+import numpy as np
+import orjson
+
+from benchmarks.workload import customer_payloads
+
+class Scenario(NamedTuple):
+    """One load pattern against one endpoint"""
+    name: str
+    path: str
+    concurrency: int = 1  # Requests in flight for closed-loop runs
+    rate: Optional[float] = None  # Requests per second; makes the run open-loop
+    batch_size: int = 1  # Customers per request for batch and stream endpoints
+
+SUITE = [
+    Scenario("predict-c1", "/api/predict"),
+    Scenario("predict-c16", "/api/predict", concurrency=16),
+    Scenario("predict-open-100rps", "/api/predict", rate=100),
+    Scenario("batch100-c4", "/api/predict/batch", concurrency=4, batch_size=100),
+    Scenario("stream1000-c1", "/api/predict/stream", batch_size=1000)
+]
+
+# Metrics compared against a baseline, and which direction is worse
+REGRESSION_CHECKS = {
+    "throughput_rps": "lower",
+    "latency_p50_ms": "higher",
+    "latency_p95_ms": "higher",
+    "latency_p99_ms": "higher",
+    "cpu_ms_per_request": "higher"
+}
+
+class Target:
+    """A running API and a client for it"""
+
+    def __init__(self, kind: str, log_level: str = 'WARNING'):
+        self.kind = kind
+        self.log_level = log_level.upper()
+        self.client = None
+        self._app = None
+        self._server = None
+        self._server_log = None
+
+    async def __aenter__(self) -> "Target":
+        if self.kind == 'inprocess':
+            from src.config import settings
+            from src.main import app
+            # Startup configures logging from the settings; per-request logs would dominate
+            settings.log_level = self.log_level
+            self._app = app
+            await app.router.startup()
+            transport = httpx.ASGITransport(app=app)
+            self.client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60)
+        else:
+            base_url = self.kind
+            if self.kind == 'uvicorn':
+                base_url = self._start_uvicorn()
+            self.client = httpx.AsyncClient(
+                base_url=base_url, timeout=60,
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=1000)
+            )
+            await self._wait_healthy()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.client.aclose()
+        if self._app is not None:
+            await self._app.router.shutdown()
+        if self._server is not None:
+            self._server.terminate()
+            self._server.wait(timeout=30)
+            self._server_log.close()
+
+    def cpu_seconds(self) -> Optional[float]:
+        """CPU time used so far by the server"""
+        if self.kind == 'inprocess':
+            return time.process_time()
+        if self._server is None:
+            return None
+        try:
+            with open(f"/proc/{self._server.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            # utime and stime, in clock ticks
+            return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def _start_uvicorn(self) -> str:
+        """Start the app in a uvicorn subprocess on a free port"""
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        # The app logs every request; keep that out of the report
+        self._server_log = tempfile.TemporaryFile(mode='w+')
+        self._server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.main:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", self.log_level.lower()],
+            stdout=subprocess.DEVNULL, stderr=self._server_log,
+            env=dict(os.environ, CHURN_LOG_LEVEL=self.log_level)
+        )
+        return f"http://127.0.0.1:{port}"
+
+    async def _wait_healthy(self, timeout: float = 60.0) -> None:
+        """Wait until the server answers its health check"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                if (await self.client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.perf_counter() > deadline or (self._server is not None and self._server.poll() is not None):
+                output = ""
+                if self._server_log is not None:
+                    self._server_log.seek(0)
+                    output = self._server_log.read()[-2000:]
+                raise RuntimeError(f"Server at {self.client.base_url} did not become healthy\n{output}")
+            await asyncio.sleep(0.2)
+
+def _bodies(scenario: Scenario, payloads: List[Dict]) -> List[bytes]:
+    """Pre-encoded request bodies, so encoding does not count as latency"""
+    size = scenario.batch_size
+    if scenario.path.endswith("/stream"):
+        groups = [payloads[i:i + size] for i in range(0, len(payloads) - size + 1, size)]
+        return [b"".join(orjson.dumps(p) + b"\n" for p in group) for group in groups]
+    if scenario.path.endswith("/batch"):
+        groups = [payloads[i:i + size] for i in range(0, len(payloads) - size + 1, size)]
+        return [orjson.dumps({"customers": group}) for group in groups]
+    return [orjson.dumps(p) for p in payloads]
+
+async def _send(client: httpx.AsyncClient, scenario: Scenario, body: bytes) -> bool:
+    """Send one request, returning whether it succeeded"""
+    content_type = "application/x-ndjson" if scenario.path.endswith("/stream") else "application/json"
+    try:
+        response = await client.post(scenario.path, content=body, headers={"Content-Type": content_type})
+        return response.status_code == 200 and (
+            not scenario.path.endswith("/stream") or b'"error"' not in response.content
+        )
+    except httpx.HTTPError:
+        return False
+
+async def _closed_loop(client, scenario: Scenario, bodies: List[bytes], duration: float):
+    """Keep scenario.concurrency requests in flight for duration seconds"""
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            body = bodies[next(counter) % len(bodies)]
+            start = time.perf_counter()
+            ok = await _send(client, scenario, body)
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    return latencies, errors
+
+async def _open_loop(client, scenario: Scenario, bodies: List[bytes], duration: float):
+    """Send at scenario.rate per second for duration seconds, however slow responses are"""
+    latencies, errors = [], 0
+    interval = 1.0 / scenario.rate
+    start = time.perf_counter()
+
+    async def request(body: bytes, scheduled: float):
+        nonlocal errors
+        ok = await _send(client, scenario, body)
+        # From the scheduled time: waiting for a free connection is latency too
+        latencies.append(time.perf_counter() - scheduled)
+        errors += not ok
+
+    tasks = []
+    for i in range(int(duration * scenario.rate)):
+        scheduled = start + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(request(bodies[i % len(bodies)], scheduled)))
+    await asyncio.gather(*tasks)
+    return latencies, errors
+
+async def run_scenario(
+    target: Target,
+    scenario: Scenario,
+    payloads: List[Dict],
+    duration: float = 10.0,
+    warmup: float = 2.0
+) -> Dict:
+    """Warm up, then measure one scenario"""
+    bodies = _bodies(scenario, payloads)
+    run = _open_loop if scenario.rate is not None else _closed_loop
+    if warmup > 0:
+        await run(target.client, scenario, bodies, warmup)
+
+    cpu_start = target.cpu_seconds()
+    start = time.perf_counter()
+    latencies, errors = await run(target.client, scenario, bodies, duration)
+    elapsed = time.perf_counter() - start
+    cpu_end = target.cpu_seconds()
+
+    latencies_ms = np.array(latencies) * 1000
+    requests = len(latencies)
+    cpu_ms = None
+    if cpu_start is not None and cpu_end is not None and requests:
+        cpu_ms = (cpu_end - cpu_start) * 1000 / requests
+    return {
+        **scenario._asdict(),
+        "requests": requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": requests / elapsed,
+        "customers_per_second": requests * scenario.batch_size / elapsed,
+        "latency_p50_ms": float(np.percentile(latencies_ms, 50)) if requests else None,
+        "latency_p95_ms": float(np.percentile(latencies_ms, 95)) if requests else None,
+        "latency_p99_ms": float(np.percentile(latencies_ms, 99)) if requests else None,
+        "latency_max_ms": float(latencies_ms.max()) if requests else None,
+        "cpu_ms_per_request": cpu_ms
+    }
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.15) -> List[str]:
+    """Regressions of results against a baseline, beyond a relative tolerance
+
+    Open-loop throughput only follows the configured rate, so it is
+    only compared for closed-loop scenarios.
+    """
+    previous = {s["name"]: s for s in baseline["scenarios"]}
+    regressions = []
+    for current in results["scenarios"]:
+        before = previous.get(current["name"])
+        if before is None:
+            continue
+        if current["errors"] > before["errors"]:
+            regressions.append(f"{current['name']}: errors {before['errors']} -> {current['errors']}")
+        for metric, worse in REGRESSION_CHECKS.items():
+            if metric == "throughput_rps" and current.get("rate") is not None:
+                continue
+            old, new = before.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (worse == "higher" and change > tolerance) or (worse == "lower" and change < -tolerance):
+                regressions.append(f"{current['name']}: {metric} {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
+
+def _environment(target: str) -> Dict:
+    """Where the numbers were taken"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "target": target,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+async def run_suite(
+    target_kind: str,
+    scenarios: List[Scenario],
+    duration: float = 10.0,
+    warmup: float = 2.0,
+    seed: int = 0,
+    log_level: str = 'WARNING'
+) -> Dict:
+    """Run scenarios one after another against one server"""
+    payloads = customer_payloads(20000, seed)
+    results = {"environment": _environment(target_kind), "duration": duration, "scenarios": []}
+    async with Target(target_kind, log_level) as target:
+        for scenario in scenarios:
+            result = await run_scenario(target, scenario, payloads, duration, warmup)
+            results["scenarios"].append(result)
+            cpu = result["cpu_ms_per_request"]
+            print(
+                f"{scenario.name:<22} {result['throughput_rps']:>9.1f} req/s "
+                f"p50 {result['latency_p50_ms']:>8.2f}  p95 {result['latency_p95_ms']:>8.2f}  "
+                f"p99 {result['latency_p99_ms']:>8.2f} ms  "
+                f"cpu {cpu if cpu is None else round(cpu, 3)} ms/req  errors {result['errors']}",
+                flush=True
+            )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', default='inprocess', help="inprocess, uvicorn or a base URL")
+    parser.add_argument('--scenarios', default=None,
+                        help=f"Comma-separated subset of {', '.join(s.name for s in SUITE)}")
+    parser.add_argument('--duration', type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument('--warmup', type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--log-level', default='WARNING', help="Server log level, for in-process and uvicorn runs")
+    parser.add_argument('--output', default=None, help="Write results JSON here")
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Allowed relative change")
+    args = parser.parse_args()
+
+    scenarios = SUITE
+    if args.scenarios:
+        names = args.scenarios.split(",")
+        unknown = set(names) - {s.name for s in SUITE}
+        if unknown:
+            parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [s for s in SUITE if s.name in names]
+
+    results = asyncio.run(run_suite(args.target, scenarios, args.duration, args.warmup, args.seed, args.log_level))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
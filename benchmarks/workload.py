@@ -0,0 +1,81 @@
+"""Generated, reproducible workloads for load tests and benchmarks"""
+from typing import Dict, Iterator, List
+import numpy as np
+import pandas as pd
+
+def customer_payloads(n: int, seed: int = 0) -> List[Dict]:
+    """n /api/predict bodies shaped like CustomerData, the same for a given seed
+
+    Charges are continuous, so payloads practically never repeat and the
+    prediction cache does not flatter the results.
+    """
+    rng = np.random.default_rng(seed)
+    tenure = rng.integers(0, 72, n)
+    monthly_charges = rng.uniform(20, 1000, n).round(2)
+    contract_type = rng.choice(['Basic', 'Standard', 'Premium'], n)
+    tech_support = rng.choice(['Yes', 'No'], n)
+    internet_service = rng.choice(['Fiber optic', 'DSL', 'No'], n)
+    age = rng.integers(18, 80, n)
+    gender = rng.choice(['Male', 'Female'], n)
+    payment_delay = rng.integers(0, 30, n)
+    return [
+        {
+            "customer_id": f"LOAD{seed:03d}{i:08d}",
+            "tenure": int(tenure[i]),
+            "monthly_charges": float(monthly_charges[i]),
+            "total_charges": float(round(monthly_charges[i] * tenure[i], 2)),
+            "contract_type": str(contract_type[i]),
+            "tech_support": str(tech_support[i]),
+            "internet_service": str(internet_service[i]),
+            "churn": 0,
+            "Age": int(age[i]),
+            "Gender": str(gender[i]),
+            "Payment Delay": int(payment_delay[i])
+        }
+        for i in range(n)
+    ]
+
+# Columns of the Kaggle churn dataset, in file order
+KAGGLE_COLUMNS = [
+    'CustomerID', 'Age', 'Gender', 'Tenure', 'Usage Frequency', 'Support Calls',
+    'Payment Delay', 'Subscription Type', 'Contract Length', 'Total Spend',
+    'Last Interaction', 'Churn'
+]
+
+def _kaggle_block(seed: int, block: int, n: int, first_id: int) -> pd.DataFrame:
+    """One block of Kaggle-layout rows, seeded by its position"""
+    rng = np.random.default_rng([seed, block])
+    return pd.DataFrame({
+        'CustomerID': np.arange(first_id, first_id + n) + 1.0,
+        'Age': rng.integers(18, 66, n).astype(float),
+        'Gender': rng.choice(['Male', 'Female'], n),
+        'Tenure': rng.integers(1, 61, n).astype(float),
+        'Usage Frequency': rng.integers(1, 31, n).astype(float),
+        'Support Calls': rng.integers(0, 11, n).astype(float),
+        'Payment Delay': rng.integers(0, 31, n).astype(float),
+        'Subscription Type': rng.choice(['Basic', 'Standard', 'Premium'], n),
+        'Contract Length': rng.choice(['Monthly', 'Quarterly', 'Annual'], n),
+        'Total Spend': rng.uniform(100, 1000, n).round(2),
+        'Last Interaction': rng.integers(1, 31, n).astype(float),
+        'Churn': rng.integers(0, 2, n).astype(float)
+    }, columns=KAGGLE_COLUMNS)
+
+def _kaggle_blocks(n: int, seed: int, block_rows: int) -> Iterator[pd.DataFrame]:
+    for block, first_id in enumerate(range(0, n, block_rows)):
+        yield _kaggle_block(seed, block, min(block_rows, n - first_id), first_id)
+
+def kaggle_frame(n: int, seed: int = 0, block_rows: int = 1_000_000) -> pd.DataFrame:
+    """n rows in the layout of the Kaggle CSV, before load_data's transform
+
+    Rows are generated in seeded blocks, so the result depends only on
+    n, seed and block_rows, and matches write_kaggle_csv.
+    """
+    return pd.concat(list(_kaggle_blocks(n, seed, block_rows)), ignore_index=True)
+
+def write_kaggle_csv(path: str, n: int, seed: int = 0, block_rows: int = 1_000_000) -> str:
+    """Write kaggle_frame(n, seed) as a CSV one block at a time, in bounded memory"""
+    with open(path, 'w', newline='') as f:
+        f.write(",".join(KAGGLE_COLUMNS) + "\n")
+        for block in _kaggle_blocks(n, seed, block_rows):
+            block.to_csv(f, header=False, index=False)
+    return path
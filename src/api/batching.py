@@ -0,0 +1,114 @@
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BatcherOverloaded(Exception):
+    """Raised when too many requests are already waiting to be scored"""
+
+class MicroBatcher:
+    """Groups concurrent single predictions into batches scored off the event loop
+
+    Each request is queued with a future. A batch is sent to the executor
+    when max_batch_size requests are waiting, when the oldest has waited
+    max_wait_ms, or right away when no batch is in flight, so a lone
+    request is not delayed. score_batch receives the queued items and
+    must return one result per item, in order. Queue delay is bounded by
+    max_pending (callers beyond it get BatcherOverloaded) and timeout
+    (callers waiting longer get asyncio.TimeoutError).
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[List[Any]], List[Any]],
+        executor: Executor,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_in_flight: int = 1,
+        max_pending: int = 1024,
+        timeout: Optional[float] = 1.0
+    ):
+        self.score_batch = score_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.batches = 0
+        self.batched_items = 0
+        self._queue = []  # (item, future) pairs waiting for a batch
+        self._in_flight = 0
+        self._timer = None
+        self._loop = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures and timers belong to one loop; start afresh on a new one
+            self._loop, self._queue, self._in_flight, self._timer = loop, [], 0, None
+        if len(self._queue) >= self.max_pending:
+            raise BatcherOverloaded(f"{len(self._queue)} predictions already queued")
+
+        future = loop.create_future()
+        self._queue.append((item, future))
+        if self._in_flight < self.max_in_flight or len(self._queue) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._on_timer)
+
+        # Shield so a timed-out caller does not cancel the batch for the others
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    def stats(self) -> dict:
+        """Batching counters for monitoring"""
+        return {
+            "queued": len(self._queue),
+            "in_flight": self._in_flight,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_items / self.batches if self.batches else 0.0
+        }
+
+    def _on_timer(self) -> None:
+        """Send the waiting requests once the oldest reached max_wait"""
+        self._timer = None
+        if self._queue:
+            self._dispatch(force=True)
+
+    def _dispatch(self, force: bool = False) -> None:
+        """Send queued requests to the executor, max_batch_size at a time"""
+        while self._queue and (force or self._in_flight < self.max_in_flight
+                               or len(self._queue) >= self.max_batch_size):
+            batch = self._queue[:self.max_batch_size]
+            del self._queue[:self.max_batch_size]
+            self._in_flight += 1
+            self.batches += 1
+            self.batched_items += len(batch)
+
+            task = self._loop.run_in_executor(self.executor, self.score_batch, [item for item, _ in batch])
+            task.add_done_callback(lambda done, batch=batch: self._resolve(batch, done))
+            force = False
+
+        if not self._queue and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _resolve(self, batch: List, done: asyncio.Future) -> None:
+        """Hand each caller its result and start the next batch"""
+        self._in_flight -= 1
+        error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        results = None if error is not None else done.result()
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results[i])
+
+        # Whatever queued up meanwhile goes out as the next batch
+        if self._queue:
+            self._dispatch()
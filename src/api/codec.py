@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type, get_args, get_origin
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+import orjson
+
+from src.data.ingestion import CustomerData
+
+# Lean request and response handling for the prediction endpoints.
+#
+# FastAPI validates a CustomerData body with pydantic, then validates the
+# returned dict against the response_model and encodes it with the json
+# module. Here bodies are decoded with orjson and checked against a field
+# table compiled once from CustomerData; only payloads that need
+# pydantic's coercion (strings for numbers and the like) or that fail the
+# checks go through pydantic itself, so accepted values and error
+# responses are unchanged. Handlers return FastJSONResponse, which FastAPI
+# sends as-is without validating it against response_model.
+
+FastJSONResponse = ORJSONResponse
+
+def _compile_fields(model: Type[BaseModel]) -> List[Tuple[str, str, Any, Optional[frozenset]]]:
+    """(name, alias, type, allowed values) per field, for exact-type checks"""
+    fields = []
+    for name, field in model.__fields__.items():
+        field_type = field.outer_type_
+        allowed = None
+        if get_origin(field_type) is Literal:
+            allowed = frozenset(get_args(field_type))
+            field_type = str
+        fields.append((name, field.alias, field_type, allowed))
+    return fields
+
+_CUSTOMER_FIELDS = _compile_fields(CustomerData)
+_CUSTOMER_FIELD_NAMES = frozenset(name for name, _, _, _ in _CUSTOMER_FIELDS)
+
+def _build_customer(values: Dict[str, Any]) -> CustomerData:
+    """What CustomerData.construct does, minus its per-field default handling"""
+    customer = CustomerData.__new__(CustomerData)
+    object.__setattr__(customer, '__dict__', values)
+    object.__setattr__(customer, '__fields_set__', set(_CUSTOMER_FIELD_NAMES))
+    return customer
+
+def _field_value(payload: Dict, name: str, alias: str) -> Any:
+    """Field value as pydantic would pick it: alias first, then field name"""
+    if alias in payload:
+        return payload[alias]
+    return payload.get(name)
+
+def fast_customer(payload: Any) -> Optional[CustomerData]:
+    """CustomerData for a payload whose values already have the exact field types
+
+    Returns None when pydantic has to decide: missing fields, values of
+    other types that it may coerce, or invalid values.
+    """
+    if type(payload) is not dict:
+        return None
+
+    values = {}
+    for name, alias, field_type, allowed in _CUSTOMER_FIELDS:
+        value = _field_value(payload, name, alias)
+        value_type = type(value)
+        if field_type is float and value_type is int:
+            value = float(value)
+        elif value_type is not field_type or (allowed is not None and value not in allowed):
+            return None
+        values[name] = value
+    return _build_customer(values)
+
+def trusted_customer(payload: Any) -> Optional[CustomerData]:
+    """CustomerData built without type checks, for trusted internal callers
+
+    Returns None when a field is missing or null, or a category is not
+    one the model knows, so such payloads still get pydantic's error
+    instead of a null prediction.
+    """
+    if type(payload) is not dict:
+        return None
+
+    values = {}
+    for name, alias, _, allowed in _CUSTOMER_FIELDS:
+        value = _field_value(payload, name, alias)
+        if value is None or (allowed is not None and (type(value) is not str or value not in allowed)):
+            return None
+        values[name] = value
+    return _build_customer(values)
+
+def parse_customer(payload: Any, trusted: bool = False) -> CustomerData:
+    """Validate a customer payload, raising pydantic's ValidationError when invalid"""
+    customer = trusted_customer(payload) if trusted else fast_customer(payload)
+    return customer if customer is not None else CustomerData.parse_obj(payload)
+
+async def read_json(request: Request) -> Any:
+    """Decode a JSON request body, rejecting malformed JSON like FastAPI does"""
+    body = await request.body()
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([ErrorWrapper(e, ("body", e.pos))], body=e.doc) from e
+
+def request_error(error: ValidationError) -> RequestValidationError:
+    """FastAPI's 422 response for an invalid body"""
+    return RequestValidationError([ErrorWrapper(error, ("body",))])
+
+def json_body(schema: Dict) -> Dict:
+    """openapi_extra documenting a JSON body a handler reads itself"""
+    return {"requestBody": {"content": {"application/json": {"schema": schema}}, "required": True}}
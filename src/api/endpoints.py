@@ -1,24 +1,83 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-import pandas as pd
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from starlette.requests import ClientDisconnect
+from pydantic import BaseModel, Field, ValidationError
+from functools import partial
+from typing import List, Optional, Tuple
+import asyncio
+import hmac
 import logging
 import time
+from datetime import timedelta
 import numpy as np
 
-from src.data.ingestion import DataIngestion, CustomerData
+from src.api import codec, scoring
+from src.api.batching import BatcherOverloaded, MicroBatcher
+from src.api.executor import ScoringExecutor
+from src.api.prediction_cache import PredictionCache
+from src.api.routing import CandidateRoute, ShadowScorer
+from src.api.streaming import CustomerStreamParser, ParsedLine, UploadStreamingResponse, ndjson_lines
+from src.config import settings
+from src.data.ingestion import CustomerData
+from src.models.model_manager import ModelManager
 from src.models.trainer import ModelTrainer
+from src.monitoring.app_logging import PayloadSampler, dropped_records
+from src.monitoring.performance import ModelMonitor, PerformanceMetrics
+from src.monitoring.profiler import ProfilerBusy, SamplingProfiler
+from src.monitoring.tracing import prometheus_gauges, prometheus_histograms, stage_timers
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Handlers and level are set up by the application (see src.main)
 logger = logging.getLogger(__name__)
 
 # Initialize router (changed from FastAPI app)
 router = APIRouter()
 
 # Initialize components
-data_ingestion = DataIngestion()
+risk_scorer = scoring.risk_scorer
+monitor = ModelMonitor()
+model_manager = ModelManager(settings.models_dir)
 model = None
+model_version = None  # Version of the served model, None for the startup file
+candidate_route = None  # Optional second version for split or shadow scoring
+shadow_scorer = ShadowScorer(monitor, max_workers=settings.shadow_workers)
+prediction_cache = PredictionCache(settings.prediction_cache_size, settings.prediction_cache_ttl)
+scoring_executor = ScoringExecutor(
+    settings.scoring_executor,
+    settings.scoring_workers,
+    initializer=scoring.init_worker,
+    initargs=(settings.model_path, settings.models_dir)
+)
+micro_batcher = None
+if settings.micro_batching:
+    micro_batcher = MicroBatcher(
+        scoring.score_customers,
+        scoring_executor,
+        max_batch_size=settings.micro_batch_size,
+        max_wait_ms=settings.micro_batch_wait_ms,
+        max_in_flight=settings.scoring_workers,
+        max_pending=settings.micro_batch_max_pending,
+        timeout=settings.micro_batch_timeout
+    )
+stage_timers.enabled = settings.stage_timing
+profiler = SamplingProfiler()
+payload_sampler = PayloadSampler(settings.log_payload_sample_rate)
+_reload_lock = asyncio.Lock()
+_watch_task = None
+
+# Fixed customers every new model must score before it takes traffic
+CANARY_CUSTOMERS = [
+    CustomerData(
+        customer_id="CANARY1", tenure=2, monthly_charges=900.0, total_charges=1800.0,
+        contract_type="Basic", tech_support="No", internet_service="Fiber optic",
+        churn=0, Age=22, Gender="Male", Payment_Delay=25
+    ),
+    CustomerData(
+        customer_id="CANARY2", tenure=48, monthly_charges=150.0, total_charges=7200.0,
+        contract_type="Premium", tech_support="Yes", internet_service="No",
+        churn=0, Age=45, Gender="Female", Payment_Delay=0
+    )
+]
 
 class RiskFactors(BaseModel):
     """Risk factors that contributed to the prediction"""
@@ -57,127 +116,584 @@ class PredictionResponse(BaseModel):
             }
         }
 
+class BatchPredictionRequest(BaseModel):
+    """Request model for batch churn predictions"""
+    customers: List[CustomerData] = Field(..., description="Customers to score")
+
+class BatchPredictionResponse(BaseModel):
+    """Response model for batch churn predictions"""
+    predictions: List[PredictionResponse] = Field(...,
+        description="Predictions in the same order as the request"
+    )
+
 @router.on_event("startup")
 async def startup_event():
     """Load model on startup"""
-    global model
+    global model, _watch_task
     try:
-        model = ModelTrainer.load_model("models/churn_model.pkl")
+        model = ModelTrainer.load_model(settings.model_path)
+        _warm_up(model)
         logger.info("Model loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load model: {str(e)}")
         raise
+    
+    if settings.candidate_version is not None:
+        try:
+            await set_candidate(settings.candidate_version, settings.routing_mode, settings.candidate_traffic)
+        except Exception as e:
+            # Serve the primary alone rather than failing to start
+            logger.error(f"Failed to load candidate model: {str(e)}")
+    
+    if scoring_executor.kind == 'process':
+        # Start every worker now so no request waits for one to load the model
+        pids = await run_in_threadpool(scoring_executor.broadcast, scoring.worker_pid)
+        logger.info(f"Started {len(set(pids))} scoring processes")
+    
+    if settings.model_watch_interval > 0:
+        _watch_task = asyncio.create_task(_watch_models(settings.model_watch_interval))
+
+@router.on_event("shutdown")
+async def shutdown_event():
+    """Stop watching for new model versions and finish background scoring"""
+    if _watch_task is not None:
+        _watch_task.cancel()
+    await run_in_threadpool(shadow_scorer.shutdown)
+    await run_in_threadpool(scoring_executor.shutdown)
+
+def _warm_up(candidate: ModelTrainer) -> None:
+    """Run the canary customers through both prediction paths of a model"""
+    probabilities = np.concatenate([
+        scoring.predict_customer(candidate, customer) for customer in CANARY_CUSTOMERS
+    ])
+    scoring.predict_frame(candidate, risk_scorer.customers_to_frame(CANARY_CUSTOMERS))
+    
+    if not np.isfinite(probabilities).all():
+        raise RuntimeError(f"Canary predictions are not finite: {probabilities.tolist()}")
+
+def _load_candidate(version: Optional[str]) -> Tuple[ModelTrainer, str]:
+    """Load and warm up a model version; runs in a worker thread
+    
+    Process workers load their own copy, so each of them is warmed up
+    too before the version can take traffic.
+    """
+    candidate = ModelTrainer.from_model_data(model_manager.load_model(version))
+    _warm_up(candidate)
+    candidate_version = model_manager.current_version
+    if scoring_executor.kind == 'process':
+        scoring_executor.broadcast(scoring.warm_up_worker, candidate_version, CANARY_CUSTOMERS)
+    return candidate, candidate_version
+
+async def reload_model(version: Optional[str] = None) -> dict:
+    """Swap in a model version (the latest by default) without pausing requests
+    
+    Loading and warm-up happen in a worker thread while the current model
+    keeps serving. The swap is a single reference assignment, and handlers
+    read the reference once, so requests in flight finish on the model
+    they started with.
+    """
+    global model, model_version
+    async with _reload_lock:
+        start_time = time.perf_counter()
+        candidate, candidate_version = await run_in_threadpool(_load_candidate, version)
+        
+        previous_version = model_version
+        model = candidate
+        model_version = candidate_version
+        prediction_cache.clear()
+        
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Swapped model {previous_version} -> {candidate_version} after {elapsed:.2f}s")
+        return {
+            "version": candidate_version,
+            "previous_version": previous_version,
+            "load_seconds": elapsed
+        }
+
+async def set_candidate(version: str, mode: str, traffic: float = 0.0) -> CandidateRoute:
+    """Load a second model version and start routing to it"""
+    global candidate_route
+    async with _reload_lock:
+        candidate, candidate_version = await run_in_threadpool(_load_candidate, version)
+        candidate_route = CandidateRoute(candidate, candidate_version, mode, traffic)
+        prediction_cache.clear()  # Split routing changes which version serves a customer
+        logger.info(f"Routing to candidate {candidate_version} in {mode} mode")
+        return candidate_route
 
-@router.post("/predict", response_model=PredictionResponse)
-async def predict_churn(customer: CustomerData):
+async def _watch_models(interval: float) -> None:
+    """Reload whenever a version newer than the ones seen at startup is saved"""
+    seen = await run_in_threadpool(model_manager.latest_version)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            latest = await run_in_threadpool(model_manager.latest_version)
+            if latest is not None and latest != seen:
+                # Mark it seen first so a broken version is not retried forever
+                seen = latest
+                await reload_model(latest)
+        except Exception as e:
+            logger.error(f"Model watcher failed to reload: {str(e)}")
+
+def _model_ref(current_model: ModelTrainer, version: Optional[str]) -> scoring.ModelRef:
+    """How executor workers find a model: the object on threads, its version in processes"""
+    return current_model if scoring_executor.kind == 'thread' else version
+
+def _route_batch(
+    customer_ids: List[str],
+    current_version: Optional[str],
+    route: Optional[CandidateRoute]
+) -> Tuple[Optional[np.ndarray], scoring.ModelRef, List[Optional[str]]]:
+    """Split routing for a batch: candidate mask, candidate reference and serving versions"""
+    if route is None or route.mode != 'split':
+        return None, None, [current_version] * len(customer_ids)
+    to_candidate = route.assign(customer_ids)
+    versions = [route.version if c else current_version for c in to_candidate]
+    return to_candidate, _model_ref(route.model, route.version), versions
+
+def _is_internal(token: Optional[str]) -> bool:
+    """Whether a caller may skip request validation"""
+    return (
+        settings.internal_token is not None and token is not None
+        and hmac.compare_digest(token.encode(), settings.internal_token.encode())
+    )
+
+def _parse_batch(payload, trusted: bool) -> List[CustomerData]:
+    """Customers of a batch body; pydantic only sees bodies the fast path cannot take"""
+    items = payload.get("customers") if isinstance(payload, dict) else None
+    if isinstance(items, list):
+        parse = codec.trusted_customer if trusted else codec.fast_customer
+        customers = [parse(item) for item in items]
+        if all(customer is not None for customer in customers):
+            return customers
+    return BatchPredictionRequest.parse_obj(payload).customers
+
+@router.post(
+    "/predict",
+    response_model=PredictionResponse,
+    openapi_extra=codec.json_body(CustomerData.schema())
+)
+async def predict_churn(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    x_internal_token: Optional[str] = Header(None)
+):
     """Predict the probability of customer churn"""
-    if model is None:
+    current_model = model  # Keep one model for the whole request across reloads
+    current_version = model_version
+    route = candidate_route
+    cache_generation = prediction_cache.generation  # Results of a replaced model are not cached
+    if current_model is None:
         raise HTTPException(status_code=500, detail="Model not loaded")
     
+    payload = await codec.read_json(request)
     try:
-        # Convert input to DataFrame
-        customer_dict = customer.dict()
-        customer_id = customer_dict.pop('customer_id')
-        
-        # Convert Payment_Delay to Payment Delay
-        if 'Payment_Delay' in customer_dict:
-            customer_dict['Payment Delay'] = customer_dict.pop('Payment_Delay')
-        
-        df = pd.DataFrame([customer_dict])
-        
-        # Log the input data for debugging
-        logger.info(f"Input data: {df.to_dict()}")
-        
-        # Preprocess data
-        df_processed = data_ingestion.preprocess_data(df)
-        logger.info(f"Processed columns: {df_processed.columns.tolist()}")
-        
-        # Ensure all feature columns from training are present
-        missing_cols = set(model.feature_columns) - set(df_processed.columns)
-        for col in missing_cols:
-            df_processed[col] = 0
-            
-        # Reorder columns to match training data
-        df_processed = df_processed[model.feature_columns]
-        logger.info(f"Final columns: {df_processed.columns.tolist()}")
-        
-        # Make prediction
-        prediction = model.predict(df_processed.values)
-        churn_prob = float(prediction[0])
-        
-        # Calculate individual risk factors
-        # Tenure risk (0-30%)
-        tenure_risk = 30 * np.exp(-float(df['tenure'].iloc[0]) / 3) / 100
-        
-        # Payment risk (0-25%)
-        payment_risk = np.minimum(25, float(df['Payment Delay'].iloc[0]) * 0.8) / 100
+        with stage_timers.stage("validate"):
+            customer = codec.parse_customer(payload, trusted=_is_internal(x_internal_token))
+    except ValidationError as e:
+        raise codec.request_error(e)
+    
+    start_time = time.perf_counter()
+    try:
+        # Log the input data of a sample of requests for debugging
+        if payload_sampler.sample(logger):
+            logger.debug("Input data", extra={"customer_id": customer.customer_id, "payload": customer.dict()})
         
-        # Contract risk (0-15%)
-        contract_risk = {
-            'Basic': 0.15,
-            'Standard': 0.07,
-            'Premium': 0
-        }[customer.contract_type]
+        # Split routing may hand this customer to the candidate
+        serving_model, serving_version = current_model, current_version
+        if route is not None and route.assign([customer.customer_id])[0]:
+            serving_model, serving_version = route.model, route.version
         
-        # Service risk (0-15%)
-        service_risk = 0
-        if customer.tech_support == 'No':
-            service_risk += 0.10
-        if customer.internet_service == 'Fiber optic':
-            service_risk += 0.05  # Higher risk for premium service
-        elif customer.internet_service == 'No':
-            service_risk -= 0.05  # Lower risk for no internet
+        # Customers with unchanged attributes reuse the last result
+        cache_key = prediction_cache.key(customer, serving_version)
+        cached = prediction_cache.get(cache_key)
+        if cached is None:
+            ref = _model_ref(serving_model, serving_version)
+            # Includes the wait for a batch and a worker
+            with stage_timers.stage("score"):
+                if micro_batcher is not None:
+                    # Scored on a worker together with concurrent requests
+                    result, model_output = await micro_batcher.submit((customer, ref))
+                else:
+                    result, model_output = await asyncio.wrap_future(
+                        scoring_executor.submit(scoring.score_customer, ref, customer)
+                    )
+            prediction_cache.put(cache_key, (result, model_output), generation=cache_generation)
+        else:
+            cached_result, model_output = cached
+            result = {**cached_result, "customer_id": customer.customer_id}
         
-        # Cost risk (0-10%)
-        median_charge = 100
-        cost_multiplier = float(df['monthly_charges'].iloc[0]) / median_charge
-        cost_risk = min(0.10, max(0, (cost_multiplier - 1) * 0.05))
+        with stage_timers.stage("log"):
+            monitor.log_prediction(
+                customer.customer_id,
+                result["churn_probability"],
+                customer.dict(exclude={'customer_id'}),
+                time.perf_counter() - start_time,
+                model_version=serving_version
+            )
+        if route is not None and route.mode == 'shadow':
+            # Runs after the response is sent
+            background_tasks.add_task(
+                shadow_scorer.submit, route, serving_version, [customer.customer_id],
+                model_output, partial(scoring.predict_customer, customer=customer)
+            )
+        # Sent as-is: the result already has the PredictionResponse shape
+        return codec.FastJSONResponse(result)
         
-        # Age risk (0-5%)
-        age_risk = max(0, (30 - float(df['Age'].iloc[0])) * 0.002)  # Higher risk for younger customers
+    except (BatcherOverloaded, asyncio.TimeoutError) as e:
+        monitor.log_error(e, {"customer_id": customer.customer_id})
+        logger.warning("Prediction shed under load: %s", type(e).__name__)
+        raise HTTPException(status_code=503, detail="Prediction queue is full, retry later")
+    except Exception as e:
+        monitor.log_error(e, {"customer_id": customer.customer_id})
+        logger.exception("Prediction error: %s", e, extra={"customer_id": customer.customer_id})
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    openapi_extra=codec.json_body({
+        "title": "BatchPredictionRequest",
+        "type": "object",
+        "properties": {"customers": {"type": "array", "items": CustomerData.schema()}},
+        "required": ["customers"]
+    })
+)
+async def predict_churn_batch(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    x_internal_token: Optional[str] = Header(None)
+):
+    """Predict churn for many customers with one vectorized scoring pass"""
+    current_model = model  # Keep one model for the whole request across reloads
+    current_version = model_version
+    route = candidate_route
+    if current_model is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    
+    payload = await codec.read_json(request)
+    try:
+        with stage_timers.stage("validate"):
+            customers = _parse_batch(payload, _is_internal(x_internal_token))
+    except ValidationError as e:
+        raise codec.request_error(e)
+    if not customers:
+        return codec.FastJSONResponse({"predictions": []})
+    
+    start_time = time.perf_counter()
+    try:
+        customer_ids = [customer.customer_id for customer in customers]
+        logger.debug("Scoring batch of %d customers", len(customer_ids))
         
-        # Gender-based risk (based on historical data patterns)
-        gender_factor = 1.1 if customer.Gender == 'Male' else 0.9
+        # Split routing may hand some customers to the candidate
+        to_candidate, candidate_ref, versions = _route_batch(customer_ids, current_version, route)
         
-        # Calculate total risk score
-        total_risk = (
-            tenure_risk +
-            payment_risk +
-            contract_risk +
-            service_risk +
-            cost_risk +
-            age_risk
-        ) * gender_factor
+        with stage_timers.stage("score"):
+            predictions, model_outputs, probabilities = await asyncio.wrap_future(scoring_executor.submit(
+                scoring.score_batch, customers,
+                _model_ref(current_model, current_version), candidate_ref, to_candidate
+            ))
         
-        # Normalize to 0-1 range
-        churn_prob = min(1.0, max(0.0, total_risk))
+        with stage_timers.stage("log"):
+            monitor.log_batch(
+                customer_ids,
+                probabilities,
+                time.perf_counter() - start_time,
+                model_versions=versions
+            )
+        if route is not None and route.mode == 'shadow':
+            # Runs after the response is sent
+            background_tasks.add_task(
+                shadow_scorer.submit, route, current_version, customer_ids, model_outputs,
+                partial(scoring.predict_frame, df=risk_scorer.customers_to_frame(customers))
+            )
+        return codec.FastJSONResponse({"predictions": predictions})
         
-        # Get risk level
-        risk_level = "High" if churn_prob > 0.6 else "Medium" if churn_prob > 0.2 else "Low"
+    except Exception as e:
+        monitor.log_error(e, {"batch_size": len(customers)})
+        logger.exception("Batch prediction error: %s", e, extra={"batch_size": len(customers)})
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predict/stream")
+async def predict_churn_stream(
+    request: Request,
+    upload_format: Optional[str] = Query(None, alias="format", regex="^(ndjson|csv)$",
+        description="ndjson or csv, taken from Content-Type when omitted"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=100000, description="Lines scored together")
+):
+    """Score an NDJSON or CSV upload chunk by chunk, streaming NDJSON results back
+    
+    Each output line is a prediction, or {"line": n, "error": ...} for an
+    upload line that failed validation, in upload order. Results for the
+    first chunk are sent while the rest is still being uploaded.
+    """
+    current_model = model  # Keep one model for the whole upload across reloads
+    current_version = model_version
+    route = candidate_route
+    if current_model is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    
+    if upload_format is None:
+        upload_format = 'csv' if 'csv' in request.headers.get('content-type', '') else 'ndjson'
+    parser = CustomerStreamParser(upload_format)
+    return UploadStreamingResponse(_stream_predictions(
+        request, parser, chunk_size or settings.stream_chunk_size,
+        current_model, current_version, route
+    ))
+
+async def _stream_predictions(
+    request: Request,
+    parser: CustomerStreamParser,
+    chunk_size: int,
+    current_model: ModelTrainer,
+    current_version: Optional[str],
+    route: Optional[CandidateRoute]
+):
+    """Read, score and encode an upload one chunk at a time
+    
+    Each full chunk is scored and sent before more of the body is read;
+    the server keeps buffering the socket meanwhile, so memory is bounded
+    by the chunk size plus that buffer.
+    """
+    pending = []  # Parsed lines waiting for a full chunk
+    try:
+        async for data in request.stream():
+            pending.extend(parser.feed(data))
+            while len(pending) >= chunk_size:
+                chunk, pending = pending[:chunk_size], pending[chunk_size:]
+                yield await _score_stream_chunk(chunk, current_model, current_version, route)
         
-        return {
-            "customer_id": customer_id,
-            "churn_probability": churn_prob,
-            "risk_factors": {
-                "tenure_risk": float(tenure_risk),
-                "payment_risk": float(payment_risk),
-                "contract_risk": float(contract_risk),
-                "service_risk": float(service_risk),
-                "cost_risk": float(cost_risk),
-                "age_risk": float(age_risk)
-            },
-            "risk_level": risk_level
-        }
+        pending.extend(parser.close())
+        if pending:
+            yield await _score_stream_chunk(pending, current_model, current_version, route)
         
+    except ClientDisconnect:
+        logger.warning("Client disconnected after %d uploaded lines", parser.line_number)
     except Exception as e:
-        logger.error(f"Prediction error: {str(e)}")
-        logger.exception("Full traceback:")
-        raise HTTPException(status_code=500, detail=str(e))
+        # Headers are already sent, so report the failure in the stream
+        monitor.log_error(e, {"stream_lines": parser.line_number})
+        logger.exception("Streaming prediction error: %s", e, extra={"stream_lines": parser.line_number})
+        yield ndjson_lines([{"error": str(e)}])
+
+async def _score_stream_chunk(
+    lines: List[ParsedLine],
+    current_model: ModelTrainer,
+    current_version: Optional[str],
+    route: Optional[CandidateRoute]
+) -> bytes:
+    """Score the valid customers of a chunk and encode its output lines"""
+    start_time = time.perf_counter()
+    customers = [customer for _, customer in lines if isinstance(customer, CustomerData)]
+    predictions = []
+    if customers:
+        customer_ids = [customer.customer_id for customer in customers]
+        to_candidate, candidate_ref, versions = _route_batch(customer_ids, current_version, route)
+        predictions, _, probabilities = await asyncio.wrap_future(scoring_executor.submit(
+            scoring.score_batch, customers,
+            _model_ref(current_model, current_version), candidate_ref, to_candidate
+        ))
+        monitor.log_batch(
+            customer_ids,
+            probabilities,
+            time.perf_counter() - start_time,
+            model_versions=versions
+        )
+    
+    # Put validation errors back between the predictions, in upload order
+    predictions = iter(predictions)
+    return ndjson_lines([
+        next(predictions) if isinstance(customer, CustomerData) else {"line": line, "error": customer}
+        for line, customer in lines
+    ])
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "model_loaded": model is not None
-    } 
\ No newline at end of file
+        "model_loaded": model is not None,
+        "model_version": model_version,
+        "candidate": candidate_route.describe() if candidate_route is not None else None
+    }
+
+@router.post("/admin/reload")
+async def admin_reload(
+    version: Optional[str] = None,
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Load a model version or alias (the latest by default) and swap it in"""
+    _check_admin_token(x_admin_token)
+    try:
+        return await reload_model(version)
+    except ValueError as e:
+        # Unknown version or no saved versions
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model reload failed: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Reload failed, still serving {model_version}: {str(e)}"
+        )
+
+@router.get(
+    "/metrics",
+    response_model=PerformanceMetrics,
+    responses={200: {"content": {"text/plain": {}}, "description": "JSON, or Prometheus text when asked for"}}
+)
+async def performance_metrics(
+    request: Request,
+    window_minutes: int = Query(60, ge=1, le=24 * 60),
+    output_format: Optional[str] = Query(None, alias="format", regex="^(json|prometheus)$",
+        description="Taken from the Accept header when omitted")
+):
+    """Rolling performance metrics over the last window_minutes
+    
+    Prometheus scrapers (Accept: text/plain or application/openmetrics-text)
+    get the text exposition format, with per-stage timing histograms.
+    """
+    metrics = monitor.get_performance_metrics(timedelta(minutes=window_minutes))
+    if metrics is None:
+        # No traffic in the window yet
+        metrics = PerformanceMetrics(
+            avg_response_time=0.0,
+            p95_response_time=0.0,
+            requests_per_minute=0.0,
+            error_rate=0.0,
+            prediction_distribution={}
+        )
+    metrics.cache = prediction_cache.stats()
+    if micro_batcher is not None:
+        metrics.batching = micro_batcher.stats()
+    metrics.executor = scoring_executor.stats()
+    metrics.logging = {
+        "app_records_dropped": dropped_records(),
+        **{f"{name}_records_dropped": n for name, n in monitor.dropped_records().items()}
+    }
+    if output_format == 'prometheus' or (output_format is None and _wants_prometheus(request)):
+        return PlainTextResponse(_prometheus_text(metrics), media_type=PROMETHEUS_CONTENT_TYPE)
+    return metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _wants_prometheus(request: Request) -> bool:
+    """Whether the Accept header asks for text rather than JSON"""
+    accept = request.headers.get('accept', '')
+    return 'application/json' not in accept and ('text/plain' in accept or 'openmetrics' in accept)
+
+def _prometheus_text(metrics: PerformanceMetrics) -> str:
+    """Stage histograms and the rolling metrics in Prometheus text format"""
+    lines = prometheus_histograms(
+        "churn_stage_duration_seconds", "Time spent in each stage of the prediction path", stage_timers
+    )
+    lines += prometheus_gauges("churn", {
+        "avg_response_time_seconds": metrics.avg_response_time,
+        "p95_response_time_seconds": metrics.p95_response_time,
+        "requests_per_minute": metrics.requests_per_minute,
+        "error_rate": metrics.error_rate
+    }, "Rolling prediction metrics")
+    lines += prometheus_gauges("churn_cache", metrics.cache, "Prediction cache")
+    lines += prometheus_gauges("churn_batching", metrics.batching, "Micro-batching")
+    lines += prometheus_gauges("churn_executor", metrics.executor, "Scoring executor")
+    lines += prometheus_gauges("churn_logging", metrics.logging, "Log records dropped")
+    return "\n".join(lines) + "\n"
+
+@router.post("/admin/tracing")
+async def admin_tracing(
+    enabled: Optional[bool] = None,
+    reset: bool = False,
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Switch stage timing on or off, or clear its histograms"""
+    _check_admin_token(x_admin_token)
+    if enabled is not None:
+        stage_timers.enabled = enabled
+    if reset:
+        stage_timers.reset()
+    return {"enabled": stage_timers.enabled}
+
+@router.post("/admin/profile", response_class=PlainTextResponse)
+async def admin_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1.0, le=1000.0),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Sample every thread's stack for a few seconds, as folded stacks for a flame graph
+    
+    Pipe the output into flamegraph.pl or open it in speedscope. Requests
+    keep being served while the profile is captured.
+    """
+    _check_admin_token(x_admin_token)
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled, set CHURN_PROFILING_ENABLED")
+    seconds = min(seconds, settings.profile_max_seconds)
+    try:
+        stacks = await run_in_threadpool(profiler.sample, seconds, interval_ms / 1000)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(profiler.folded(stacks))
+
+@router.post("/admin/models/{version}/alias/{alias}")
+async def admin_set_alias(
+    version: str,
+    alias: str,
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Point an alias such as 'production' at a model version"""
+    _check_admin_token(x_admin_token)
+    try:
+        model_manager.registry.set_alias(alias, version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"alias": alias, "version": version}
+
+@router.post("/admin/candidate")
+async def admin_set_candidate(
+    version: str,
+    mode: str = Query('shadow', regex="^(split|shadow)$"),
+    traffic: float = Query(0.0, ge=0.0, le=1.0),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """Load a version or alias as the candidate, served to a share of customers or in shadow"""
+    _check_admin_token(x_admin_token)
+    try:
+        route = await set_candidate(version, mode, traffic)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Candidate load failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Candidate load failed: {str(e)}")
+    return route.describe()
+
+@router.delete("/admin/candidate")
+async def admin_clear_candidate(x_admin_token: Optional[str] = Header(None)):
+    """Stop routing to the candidate"""
+    global candidate_route
+    _check_admin_token(x_admin_token)
+    candidate_route = None
+    prediction_cache.clear()
+    return {"candidate": None}
+
+@router.get("/models")
+async def list_models(
+    alias: Optional[str] = None,
+    since: Optional[str] = Query(None, description="Earliest timestamp, YYYYmmdd_HHMMSS"),
+    metric: Optional[str] = Query(None, description="Only versions reporting this metric"),
+    min_value: Optional[float] = Query(None, description="Minimum value of metric"),
+    limit: int = Query(50, ge=1, le=1000)
+):
+    """Registered model versions, newest first, from the registry index"""
+    registry = model_manager.registry
+    return {
+        "models": registry.list_versions(
+            alias=alias, since=since, metric=metric, min_value=min_value, limit=limit
+        ),
+        "aliases": registry.aliases(),
+        "serving": model_version,
+        "candidate": candidate_route.describe() if candidate_route is not None else None
+    }
+
+def _check_admin_token(token: Optional[str]) -> None:
+    """Reject admin calls without the configured token; without one, admin endpoints are off"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled, set CHURN_ADMIN_TOKEN")
+    if token is None or not hmac.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
@@ -0,0 +1,139 @@
+from collections import deque
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import multiprocessing
+import numpy as np
+import threading
+import time
+
+def _timed_call(fn: Callable, submitted_at: float, args: Tuple, kwargs: Dict):
+    """Run a task and report how long it waited for a worker"""
+    started_at = time.time()
+    return started_at - submitted_at, fn(*args, **kwargs)
+
+# Barrier shared by the process workers of one executor, see broadcast()
+_worker_barrier = None
+
+def _init_process(barrier, initializer: Optional[Callable], initargs: Tuple) -> None:
+    global _worker_barrier
+    _worker_barrier = barrier
+    if initializer is not None:
+        initializer(*initargs)
+
+def _call_then_wait(fn: Callable, args: Tuple, timeout: float):
+    """Run fn, then hold this worker until every other worker has done the same"""
+    result = fn(*args)
+    _worker_barrier.wait(timeout)
+    return result
+
+class ScoringExecutor(Executor):
+    """Thread or process pool for scoring work that reports queue depth and wait time
+
+    Thread workers share the models the API already holds and keep the
+    event loop free, but contend for the GIL in pure-Python steps.
+    Process workers run in parallel on separate cores. They are started
+    with spawn, not fork, because the API process runs background
+    threads. The initializer loads the model once per worker; payloads
+    are memory-mapped, so workers share its arrays.
+    """
+
+    kinds = ('thread', 'process')
+
+    def __init__(
+        self,
+        kind: str = 'thread',
+        workers: int = 2,
+        initializer: Optional[Callable] = None,
+        initargs: Tuple = ()
+    ):
+        if kind not in self.kinds:
+            raise ValueError(f"Unknown executor kind {kind!r}, expected one of {self.kinds}")
+
+        self.kind = kind
+        self.workers = workers
+        if kind == 'thread':
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scoring")
+        else:
+            context = multiprocessing.get_context('spawn')
+            self._barrier = context.Barrier(workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_process,
+                initargs=(self._barrier, initializer, initargs)
+            )
+        self._broadcast_lock = threading.Lock()
+        self.completed = 0
+        self._pending = 0
+        self._waits = deque(maxlen=1000)  # Seconds recent tasks waited for a worker
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Schedule fn(*args, **kwargs) and return a future for its result"""
+        result = Future()
+        result.set_running_or_notify_cancel()  # Work cannot be pulled back from a process
+        with self._lock:
+            self._pending += 1
+
+        task = self._pool.submit(_timed_call, fn, time.time(), args, kwargs)
+        task.add_done_callback(lambda done: self._finish(done, result))
+        return result
+
+    def broadcast(self, fn: Callable, *args, timeout: float = 120.0) -> List[Any]:
+        """Run fn(*args) once on every process worker and return the results; blocks
+
+        Each task waits on a barrier after running fn, so no worker can
+        take a second one before all have taken theirs. Used to load a
+        model into every worker before it takes traffic. Thread workers
+        share the API's memory, so fn then runs once.
+        """
+        if self.kind == 'thread':
+            return [self.submit(fn, *args).result(timeout)]
+
+        with self._broadcast_lock:
+            tasks = [self.submit(_call_then_wait, fn, args, timeout) for _ in range(self.workers)]
+            try:
+                return [task.result(timeout * 2) for task in tasks]
+            except Exception:
+                # A worker failed or timed out; let the next broadcast start clean
+                self._barrier.abort()
+                for task in tasks:
+                    try:
+                        task.result(timeout)
+                    except Exception:
+                        pass
+                self._barrier.reset()
+                raise
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop the workers"""
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth and wait times for sizing workers against cores"""
+        with self._lock:
+            pending = self._pending
+            waits = np.array(self._waits) * 1000
+        return {
+            "workers": self.workers,
+            "pending": pending,
+            "queue_depth": max(0, pending - self.workers),
+            "completed": self.completed,
+            "avg_wait_ms": float(waits.mean()) if len(waits) else 0.0,
+            "p95_wait_ms": float(np.quantile(waits, 0.95)) if len(waits) else 0.0
+        }
+
+    def _finish(self, done: Future, result: Future) -> None:
+        """Record the task's wait and pass its outcome on"""
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+        error = CancelledError() if done.cancelled() else done.exception()
+        if error is not None:
+            result.set_exception(error)
+            return
+
+        wait, value = done.result()
+        with self._lock:
+            self._waits.append(wait)
+        result.set_result(value)
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+from src.data.ingestion import CustomerData
+from src.models.scoring import RISK_COLUMNS, RowFeaturePlan
+
+class PredictionCache:
+    """Bounded LRU cache of prediction results with a time-to-live
+
+    Entries are keyed by the customer fields that the model features and
+    risk factors read, plus the serving model version. Two requests that
+    differ only in other fields (id, churn label, total charges) share an
+    entry. At most max_entries results are kept, least recently used
+    first out. Call clear() when the served model changes; results
+    computed before it, and stored after, are dropped (see generation).
+    """
+
+    # Everything that feeds the features and risk factors
+    key_fields = tuple(sorted(set(RISK_COLUMNS.values()) | set(RowFeaturePlan.record_fields.values())))
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0  # Bumped by clear()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, customer: CustomerData, model_version: Optional[str]) -> Tuple:
+        """Cache key for a customer scored by a model version"""
+        # Tuples hash by value, and equal ints and floats hash alike
+        return (model_version,) + tuple(getattr(customer, name) for name in self.key_fields)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for a key, or None if missing or expired"""
+        if self.max_entries <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, evicting the least recently used entry when full
+
+        Pass the generation read before computing the value: if clear()
+        ran in the meantime the value may come from a replaced model, and
+        it is dropped.
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
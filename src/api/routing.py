@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+import numpy as np
+import logging
+import threading
+import time
+import zlib
+
+from src.models.trainer import ModelTrainer
+from src.monitoring.performance import ModelMonitor
+
+logger = logging.getLogger(__name__)
+
+class CandidateRoute:
+    """A second model version and how requests reach it
+
+    In split mode a fixed share of customers is served by the candidate.
+    Customers are assigned by a hash of their id, so a customer stays in
+    the same arm across requests. In shadow mode the primary model serves
+    everyone and the candidate scores the same inputs on the side.
+    """
+
+    modes = ('split', 'shadow')
+
+    def __init__(self, model: ModelTrainer, version: str, mode: str = 'shadow', traffic: float = 0.0):
+        if mode not in self.modes:
+            raise ValueError(f"Unknown routing mode {mode!r}, expected one of {self.modes}")
+        if not 0.0 <= traffic <= 1.0:
+            raise ValueError(f"Candidate traffic must be between 0 and 1, got {traffic}")
+
+        self.model = model
+        self.version = version
+        self.mode = mode
+        self.traffic = traffic
+
+    def assign(self, customer_ids: List[str]) -> np.ndarray:
+        """Mask of customers the candidate serves"""
+        if self.mode != 'split':
+            return np.zeros(len(customer_ids), dtype=bool)
+        buckets = np.array([zlib.crc32(c.encode()) % 10000 for c in customer_ids])
+        return buckets < self.traffic * 10000
+
+    def describe(self) -> dict:
+        """Routing summary for status endpoints"""
+        return {"version": self.version, "mode": self.mode, "traffic": self.traffic}
+
+class ShadowScorer:
+    """Scores shadow models on a worker pool and logs them next to the primary
+
+    Handlers submit work after their response is sent. If shadows fall
+    behind by max_pending jobs, new jobs are dropped instead of queued, so
+    a slow candidate can never build up memory or slow down the primary.
+    """
+
+    def __init__(self, monitor: ModelMonitor, max_workers: int = 2, max_pending: int = 1000):
+        self.monitor = monitor
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shadow")
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def submit(
+        self,
+        route: CandidateRoute,
+        primary_version: Optional[str],
+        customer_ids: List[str],
+        primary_outputs: np.ndarray,
+        score: Callable[[ModelTrainer], np.ndarray]
+    ) -> bool:
+        """Queue a shadow scoring job, returning False if it was dropped"""
+        with self._idle:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending += 1
+
+        self._pool.submit(self._run, route, primary_version, customer_ids, primary_outputs, score)
+        return True
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued job has finished"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self) -> None:
+        """Finish queued jobs and stop the workers"""
+        self._pool.shutdown(wait=True)
+
+    def _run(
+        self,
+        route: CandidateRoute,
+        primary_version: Optional[str],
+        customer_ids: List[str],
+        primary_outputs: np.ndarray,
+        score: Callable[[ModelTrainer], np.ndarray]
+    ) -> None:
+        """Score one job with the shadow model and log the comparison"""
+        try:
+            start_time = time.perf_counter()
+            shadow_outputs = score(route.model)
+            self.monitor.log_shadow(
+                customer_ids,
+                primary_version,
+                route.version,
+                np.asarray(primary_outputs, dtype=float).tolist(),
+                np.asarray(shadow_outputs, dtype=float).tolist(),
+                time.perf_counter() - start_time
+            )
+        except Exception as e:
+            # Shadow failures are not request errors
+            logger.error(f"Shadow scoring with {route.version} failed: {str(e)}")
+        finally:
+            with self._idle:
+                self._pending -= 1
+                self._idle.notify_all()
@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
+from threadpoolctl import threadpool_limits
+import pandas as pd
+import numpy as np
+import logging
+import os
+
+from src.data.ingestion import DataIngestion, CustomerData
+from src.models.model_manager import ModelManager
+from src.models.scoring import RiskScorer, compile_row_plan
+from src.models.trainer import ModelTrainer
+from src.monitoring.tracing import stage_timers
+
+logger = logging.getLogger(__name__)
+
+# Scoring work sent to the API's executor. Functions take a model
+# reference: the ModelTrainer itself on thread workers, or the version
+# name (None for the startup model file) on process workers, which load
+# and keep their own copies. Importing this module has no side effects,
+# so process workers can do it cheaply.
+ModelRef = Union[ModelTrainer, str, None]
+
+data_ingestion = DataIngestion()
+risk_scorer = RiskScorer()
+
+# Per-process state of process workers
+_worker_config = {}
+_worker_models = OrderedDict()  # model reference -> ModelTrainer, most recent last
+_max_worker_models = 3
+
+def init_worker(model_path: str, models_dir: str, preload: ModelRef = None) -> None:
+    """Process worker initializer: preload a model once, the startup model by default"""
+    _worker_config['model_path'] = model_path
+    _worker_config['models_dir'] = models_dir
+    # Parallelism comes from the process pool; avoid oversubscribing cores
+    threadpool_limits(1)
+    resolve_model(preload)
+    logger.info(f"Scoring worker {os.getpid()} ready")
+
+def worker_pid() -> int:
+    """Used to start process workers ahead of the first request"""
+    return os.getpid()
+
+def warm_up_worker(ref: ModelRef, customers: List[CustomerData]) -> int:
+    """Load a model version in this worker and score through both of its paths"""
+    for customer in customers:
+        predict_customer(ref, customer)
+    predict_frame(ref, risk_scorer.customers_to_frame(customers))
+    return os.getpid()
+
+def resolve_model(ref: ModelRef) -> ModelTrainer:
+    """The model a reference points to, loading it on first use in this process"""
+    if isinstance(ref, ModelTrainer):
+        return ref
+
+    current = _worker_models.get(ref)
+    if current is None:
+        if ref is None:
+            current = ModelTrainer.load_model(_worker_config['model_path'])
+        else:
+            model_data = ModelManager(_worker_config['models_dir']).load_model(ref)
+            current = ModelTrainer.from_model_data(model_data)
+        _worker_models[ref] = current
+        # Keep the few versions that can still be routed to after reloads
+        while len(_worker_models) > _max_worker_models:
+            _worker_models.popitem(last=False)
+    _worker_models.move_to_end(ref)
+    return current
+
+def predict_customer(ref: ModelRef, customer: CustomerData) -> np.ndarray:
+    """Run the model on one customer, filling the input row from the validated fields"""
+    current_model = resolve_model(ref)
+    with stage_timers.stage("features"):
+        row_plan = compile_row_plan(tuple(current_model.feature_columns))
+        X = row_plan.fill(customer, current_model.preprocessing)
+    with stage_timers.stage("model"):
+        return current_model.predict(X)
+
+def score_customer(ref: ModelRef, customer: CustomerData) -> Tuple[dict, np.ndarray]:
+    """Response record and model output for one customer, without pandas"""
+    model_output = predict_customer(ref, customer)
+
+    # Calculate individual risk factors and the blended churn probability
+    with stage_timers.stage("risk_factors"):
+        scores = risk_scorer.score(risk_scorer.customer_columns(customer))
+        record = risk_scorer.to_records([customer.customer_id], scores)[0]
+    return record, model_output
+
+def score_customers(items: List[Tuple[CustomerData, ModelRef]]) -> List[Tuple[dict, np.ndarray]]:
+    """Score queued single predictions together, matching score_customer exactly
+
+    Micro-batches are small, so rows are filled with the single-row plan
+    and scored from plain column arrays: building a DataFrame costs more
+    than it saves below a few dozen rows.
+    """
+    if len(items) == 1:
+        customer, ref = items[0]
+        return [score_customer(ref, customer)]
+
+    customers = [customer for customer, _ in items]
+
+    # Requests queued across a reload or split between versions use different models
+    model_outputs = np.empty(len(items))
+    groups = {}
+    for i, (_, ref) in enumerate(items):
+        current_model = resolve_model(ref)
+        groups.setdefault(id(current_model), (current_model, []))[1].append(i)
+    for current_model, rows in groups.values():
+        with stage_timers.stage("features"):
+            row_plan = compile_row_plan(tuple(current_model.feature_columns))
+            X = row_plan.fill_many([customers[i] for i in rows], current_model.preprocessing)
+        with stage_timers.stage("model"):
+            model_outputs[rows] = current_model.predict(X)
+
+    with stage_timers.stage("risk_factors"):
+        scores = risk_scorer.score(risk_scorer.customers_to_columns(customers))
+        records = risk_scorer.to_records([customer.customer_id for customer in customers], scores)
+    return [(record, model_outputs[i:i + 1]) for i, record in enumerate(records)]
+
+def predict_frame(ref: ModelRef, df: pd.DataFrame) -> np.ndarray:
+    """Run the model pipeline over a raw customer frame"""
+    current_model = resolve_model(ref)
+
+    # Preprocess data
+    with stage_timers.stage("preprocess"):
+        df_processed = data_ingestion.preprocess_data(df, current_model.preprocessing)
+
+    with stage_timers.stage("align"):
+        # Ensure all feature columns from training are present
+        missing_cols = set(current_model.feature_columns) - set(df_processed.columns)
+        for col in missing_cols:
+            df_processed[col] = 0
+
+        # Reorder columns to match training data
+        X = df_processed[current_model.feature_columns].values
+
+    # Make prediction
+    with stage_timers.stage("model"):
+        return current_model.predict(X)
+
+def score_batch(
+    customers: List[CustomerData],
+    primary: ModelRef,
+    candidate: ModelRef = None,
+    to_candidate: Optional[np.ndarray] = None
+) -> Tuple[List[dict], np.ndarray, List[float]]:
+    """Score a batch request with one vectorized pass per serving model
+
+    Returns the response records, the model outputs and the churn
+    probabilities. Rows flagged in to_candidate are run through the
+    candidate model.
+    """
+    df = risk_scorer.customers_to_frame(customers)
+    if to_candidate is None or not to_candidate.any():
+        model_outputs = predict_frame(primary, df)
+    else:
+        model_outputs = np.empty(len(df))
+        model_outputs[to_candidate] = predict_frame(candidate, df[to_candidate])
+        if not to_candidate.all():
+            model_outputs[~to_candidate] = predict_frame(primary, df[~to_candidate])
+
+    # Calculate individual risk factors and the blended churn probability
+    with stage_timers.stage("risk_factors"):
+        scores = risk_scorer.score(df)
+        customer_ids = [customer.customer_id for customer in customers]
+        records = risk_scorer.to_records(customer_ids, scores)
+    return records, model_outputs, scores['churn_probability'].tolist()
@@ -0,0 +1,106 @@
+from typing import List, Tuple, Union
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+import csv
+import orjson
+
+from src.api import codec
+from src.data.ingestion import CustomerData
+
+# A parsed upload line: its 1-based line number and the customer, or why it was rejected
+ParsedLine = Tuple[int, Union[CustomerData, str]]
+
+class CustomerStreamParser:
+    """Turns an upload arriving in arbitrary byte pieces into validated customers
+
+    Supports NDJSON (one /predict body per line) and CSV with a header
+    row of CustomerData field names. Only the current partial line is
+    buffered, so memory does not grow with the upload; lines longer than
+    max_line_bytes are rejected. Quoted CSV fields cannot contain newlines.
+    """
+
+    formats = ('ndjson', 'csv')
+
+    def __init__(self, fmt: str = 'ndjson', max_line_bytes: int = 1 << 20):
+        if fmt not in self.formats:
+            raise ValueError(f"Unknown upload format {fmt!r}, expected one of {self.formats}")
+
+        self.fmt = fmt
+        self.max_line_bytes = max_line_bytes
+        self.line_number = 0
+        self._header = None
+        self._buffer = b""
+        self._skipping = False  # Inside a line that was already rejected as too long
+
+    def feed(self, data: bytes) -> List[ParsedLine]:
+        """Parse every line completed by data"""
+        parsed = []
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        for line in lines:
+            self._add_line(line, parsed)
+
+        if len(self._buffer) > self.max_line_bytes:
+            if not self._skipping:
+                self.line_number += 1
+                parsed.append((self.line_number, f"Line longer than {self.max_line_bytes} bytes"))
+            self._skipping = True
+            self._buffer = b""
+        return parsed
+
+    def close(self) -> List[ParsedLine]:
+        """Parse the last line if the upload did not end with a newline"""
+        parsed = []
+        if self._buffer:
+            self._add_line(self._buffer, parsed)
+            self._buffer = b""
+        return parsed
+
+    def _add_line(self, line: bytes, parsed: List[ParsedLine]) -> None:
+        """Validate one complete line"""
+        if self._skipping:
+            # Rest of an overlong line
+            self._skipping = False
+            return
+
+        self.line_number += 1
+        text = line.decode("utf-8", errors="replace").strip()
+        if not text:
+            return
+
+        try:
+            if self.fmt == 'ndjson':
+                customer = codec.parse_customer(orjson.loads(text))
+            elif self._header is None:
+                self._header = next(csv.reader([text]))
+                return
+            else:
+                values = next(csv.reader([text]))
+                if len(values) != len(self._header):
+                    raise ValueError(f"Expected {len(self._header)} fields, got {len(values)}")
+                customer = CustomerData.parse_obj(dict(zip(self._header, values)))
+        except (ValidationError, ValueError) as e:
+            parsed.append((self.line_number, str(e).replace("\n", " ")))
+            return
+        parsed.append((self.line_number, customer))
+
+def ndjson_lines(records: List[dict]) -> bytes:
+    """Encode records as newline-delimited JSON"""
+    return b"".join(orjson.dumps(record) + b"\n" for record in records)
+
+class UploadStreamingResponse(StreamingResponse):
+    """StreamingResponse that may start sending before the request body is read
+
+    Starlette's StreamingResponse reads from receive() to watch for a
+    client disconnect, which would swallow the body of a request still
+    being uploaded. This response leaves receive() to the body iterator;
+    a disconnect during the upload surfaces there as ClientDisconnect.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,35 @@
+from pydantic import BaseSettings
+from typing import Optional
+
+class Settings(BaseSettings):
+    """Service configuration, overridable with CHURN_* environment variables"""
+    model_path: str = "models/churn_model.pkl"
+    models_dir: str = "models"
+    model_watch_interval: float = 0.0  # Seconds between checks for new versions, 0 disables
+    admin_token: Optional[str] = None  # Required in X-Admin-Token; admin endpoints are disabled while unset
+    internal_token: Optional[str] = None  # Callers sending it in X-Internal-Token skip request validation
+    candidate_version: Optional[str] = None  # Version or alias to compare against the primary
+    routing_mode: str = "shadow"  # split: candidate serves candidate_traffic; shadow: scores on the side
+    candidate_traffic: float = 0.0  # Share of customers the candidate serves in split mode
+    shadow_workers: int = 2
+    prediction_cache_size: int = 10000  # Cached /predict results, 0 disables
+    prediction_cache_ttl: float = 300.0  # Seconds a cached result stays valid
+    scoring_executor: str = "thread"  # thread: share the loaded models; process: one copy per core
+    scoring_workers: int = 2
+    micro_batching: bool = True  # Group concurrent /predict calls and score them together
+    micro_batch_size: int = 64
+    micro_batch_wait_ms: float = 2.0  # Longest a request waits for its batch to fill
+    micro_batch_timeout: float = 1.0  # Seconds before a queued request gets a 503
+    micro_batch_max_pending: int = 1024
+    stream_chunk_size: int = 1000  # Upload lines scored together by /predict/stream
+    stage_timing: bool = True  # Per-stage timing histograms, switchable at /admin/tracing
+    profiling_enabled: bool = False  # Allow sampling profiles through /admin/profile
+    profile_max_seconds: float = 60.0
+    log_level: str = "INFO"
+    log_json: bool = True  # JSON lines, or plain text
+    log_payload_sample_rate: float = 0.01  # Share of requests whose payload is logged at DEBUG
+    
+    class Config:
+        env_prefix = "CHURN_"
+
+settings = Settings()
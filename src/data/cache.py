@@ -0,0 +1,108 @@
+from typing import Callable, Dict, Optional
+import pandas as pd
+import pyarrow.feather as feather
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+class FeatureCache:
+    """On-disk columnar cache of transformed data keyed by source fingerprint
+
+    Entries are uncompressed Feather (Arrow IPC) files named after the
+    stage, the SHA-256 of the source file and the transformation version,
+    so editing either the data or the transformation code misses the
+    cache. Files are memory-mapped on reload and string columns are stored
+    as categoricals. Source hashes are remembered by (size, mtime) so an
+    unchanged file is not even re-read.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache"):
+        self.cache_dir = cache_dir
+        self.fingerprint_path = os.path.join(cache_dir, "fingerprints.json")
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def fingerprint(self, filepath: str) -> str:
+        """Content hash of a source file, reused while it is unchanged"""
+        stat = os.stat(filepath)
+        abspath = os.path.abspath(filepath)
+        known = self._load_fingerprints()
+
+        entry = known.get(abspath)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+        known[abspath] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest.hexdigest()
+        }
+        with open(self.fingerprint_path, 'w') as f:
+            json.dump(known, f)
+
+        return digest.hexdigest()
+
+    def path_for(self, filepath: str, stage: str, version: str) -> str:
+        """Cache file location for a stage of a source file"""
+        key = f"{stage}-{self.fingerprint(filepath)[:16]}-v{version}"
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def load(self, path: str) -> Optional[pd.DataFrame]:
+        """Memory-map a cached frame, or None if it is missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+            return table.to_pandas(split_blocks=True)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {str(e)}")
+            return None
+
+    def save(self, path: str, df: pd.DataFrame) -> None:
+        """Write a frame as uncompressed Feather with categorical strings"""
+        df = df.reset_index(drop=True)
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = df[col].astype('category')
+
+        # Write to a temporary name first so readers never see a partial file
+        tmp_path = f"{path}.tmp"
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+
+    def get_or_compute(
+        self,
+        filepath: str,
+        stage: str,
+        version: str,
+        compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Return the cached stage output for a source file, computing it on a miss"""
+        path = self.path_for(filepath, stage, version)
+
+        df = self.load(path)
+        if df is not None:
+            logger.info(f"Loaded {stage} data from cache: {path}")
+            return df
+
+        logger.info(f"Cache miss for {stage} data, computing")
+        df = compute()
+        self.save(path, df)
+        return df
+
+    def _load_fingerprints(self) -> Dict:
+        """Read the remembered source hashes"""
+        if not os.path.exists(self.fingerprint_path):
+            return {}
+        try:
+            with open(self.fingerprint_path, 'r') as f:
+                return json.load(f)
+        except ValueError:
+            return {}
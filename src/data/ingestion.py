@@ -1,5 +1,5 @@
 import pandas as pd
-from typing import Optional, Literal
+from typing import Dict, Iterator, Optional, Literal
 from pydantic import BaseModel
 import os
 import logging
@@ -32,6 +32,10 @@ class CustomerData(BaseModel):
 class DataIngestion:
     """Handles data loading and preprocessing operations"""
     
+    # Bump whenever _transform or preprocess_data change their output so
+    # cached results (see FeatureCache) are not reused
+    transform_version = "2"
+    
     def __init__(self):
         self.categorical_columns = [
             'contract_type', 'tech_support', 
@@ -44,6 +48,52 @@ class DataIngestion:
             'Age', 'Payment Delay'
         ]
         
+        # Map Kaggle column names to our format
+        self.column_mapping = {
+            'CustomerID': 'customer_id',
+            'Tenure': 'tenure',
+            'Total Spend': 'monthly_charges',
+            'Subscription Type': 'contract_type',
+            'Support Calls': 'tech_support',
+            'Usage Frequency': 'internet_service',
+            'Churn': 'churn',
+            'Gender': 'Gender',
+            'Age': 'Age',
+            'Payment Delay': 'Payment Delay',
+            'Contract Length': 'Contract Length'
+        }
+        
+        # Parse the low-cardinality text columns as categories; _transform
+        # turns them back into strings. Numeric types are inferred as before.
+        self.source_dtypes = {
+            'Subscription Type': 'category',
+            'Gender': 'category',
+            'Contract Length': 'category'
+        }
+        
+        # Features preprocess_data derives, in output order
+        self.row_features = ['risk_score']
+        
+        # Defaults for missing values and risk points per category
+        self.fill_values = {
+            'tenure': 0,
+            'monthly_charges': 0,
+            'total_charges': 0,
+            'Age': 0,
+            'Payment Delay': 0,
+            'contract_type': 'Basic',
+            'tech_support': 'No',
+            'internet_service': 'No',
+            'Gender': 'Male'
+        }
+        self.category_maps = {
+            'contract_type': {'Basic': 15, 'Standard': 7, 'Premium': 0},
+            'tech_support': {'No': 15, 'Yes': 0}
+        }
+        
+        # Statistics frozen at training time (see fit_preprocessing)
+        self.preprocessing_state = None
+        
         self.scaler = StandardScaler()
     
     def load_data(self, filepath: str) -> pd.DataFrame:
@@ -54,90 +104,150 @@ class DataIngestion:
                 raise FileNotFoundError(f"File not found: {filepath}")
             
             # Read the CSV file
-            df = pd.read_csv(filepath)
+            df = pd.read_csv(filepath, **self._read_options())
             
             # Log the actual columns for debugging
             logger.info(f"Actual columns in CSV: {df.columns.tolist()}")
             
-            # Map Kaggle column names to our format
-            column_mapping = {
-                'CustomerID': 'customer_id',
-                'Tenure': 'tenure',
-                'Total Spend': 'monthly_charges',
-                'Subscription Type': 'contract_type',
-                'Support Calls': 'tech_support',
-                'Usage Frequency': 'internet_service',
-                'Churn': 'churn',
-                'Gender': 'Gender',
-                'Age': 'Age',
-                'Payment Delay': 'Payment Delay',
-                'Contract Length': 'Contract Length'
-            }
-            
-            # Check which columns are actually present
-            available_columns = {
-                orig: new for orig, new in column_mapping.items()
-                if orig in df.columns
-            }
-            
-            # Rename columns
-            df = df.rename(columns=available_columns)
-            
-            # Convert categorical values
-            contract_type_map = {
-                'Basic': 'Basic',
-                'Premium': 'Premium',
-                'Standard': 'Standard'
-            }
-            
-            # Map contract types
-            if 'contract_type' in df.columns:
-                df['contract_type'] = df['contract_type'].map(contract_type_map)
-            
-            # Convert support calls to Yes/No
-            if 'tech_support' in df.columns:
-                df['tech_support'] = df['tech_support'].apply(lambda x: 'Yes' if x > 2 else 'No')
-            
-            # Convert usage frequency to service types
-            if 'internet_service' in df.columns:
-                df['internet_service'] = df['internet_service'].apply(
-                    lambda x: 'Fiber optic' if x > 5 else 'DSL' if x > 2 else 'No'
-                )
-            
-            # Convert numeric columns
-            if 'monthly_charges' in df.columns:
-                df['monthly_charges'] = pd.to_numeric(df['monthly_charges'], errors='coerce')
-                df['total_charges'] = df['monthly_charges'] * df['tenure']
-            
-            if 'churn' in df.columns:
-                df['churn'] = df['churn'].astype(int)
+            df = self._transform(df)
             
             # Log transformed data sample
             logger.info("\nSample of transformed data:")
             logger.info(df[['contract_type', 'tech_support', 'internet_service', 'Payment Delay']].head())
             
-            return df.dropna()
+            return df
             
         except Exception as e:
             logger.error(f"Error loading data from {filepath}: {str(e)}")
             raise Exception(f"Error loading data: {str(e)}")
     
-    def preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate risk score for churn prediction"""
+    def iter_load_data(
+        self,
+        filepath: str,
+        chunksize: int = 100000
+    ) -> Iterator[pd.DataFrame]:
+        """Load data from CSV file in transformed chunks of at most chunksize rows
+        
+        Peak memory is bounded by the chunk size rather than the file size;
+        concatenating the chunks gives the same rows as load_data.
+        """
+        logger.info(f"Streaming CSV from: {filepath} in chunks of {chunksize}")
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File not found: {filepath}")
+        
+        try:
+            reader = pd.read_csv(filepath, chunksize=chunksize, **self._read_options())
+            with reader:
+                for chunk in reader:
+                    yield self._transform(chunk)
+        except Exception as e:
+            logger.error(f"Error loading data from {filepath}: {str(e)}")
+            raise Exception(f"Error loading data: {str(e)}")
+    
+    def _read_options(self) -> Dict:
+        """read_csv arguments for the Kaggle layout
+        
+        Every column is read, including unmapped ones, because dropna in
+        _transform drops rows missing any of them.
+        """
+        return {'dtype': self.source_dtypes}
+    
+    def _transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Map Kaggle columns and values to our format"""
+        # Check which columns are actually present
+        available_columns = {
+            orig: new for orig, new in self.column_mapping.items()
+            if orig in df.columns
+        }
+        
+        # Rename columns
+        df = df.rename(columns=available_columns)
+        
+        # Map contract types, unknown types become missing
+        if 'contract_type' in df.columns:
+            contract_type = df['contract_type'].astype(object)
+            df['contract_type'] = contract_type.where(
+                contract_type.isin(['Basic', 'Premium', 'Standard'])
+            )
+        
+        # Convert support calls to Yes/No
+        if 'tech_support' in df.columns:
+            df['tech_support'] = np.where(df['tech_support'] > 2, 'Yes', 'No')
+        
+        # Convert usage frequency to service types
+        if 'internet_service' in df.columns:
+            usage = df['internet_service']
+            df['internet_service'] = np.select(
+                [usage > 5, usage > 2],
+                ['Fiber optic', 'DSL'],
+                default='No'
+            )
+        
+        # Keep the remaining categoricals as plain strings like read_csv infers
+        for col in ('Gender', 'Contract Length'):
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+        
+        # Convert numeric columns
+        if 'monthly_charges' in df.columns:
+            df['monthly_charges'] = pd.to_numeric(df['monthly_charges'], errors='coerce')
+            df['total_charges'] = df['monthly_charges'] * df['tenure']
+        
+        df = df.dropna()
+        
+        if 'churn' in df.columns:
+            df['churn'] = df['churn'].astype(int)
+        
+        return df
+    
+    def fit_preprocessing(self, df: pd.DataFrame) -> Dict:
+        """Capture the statistics preprocess_data needs from training data
+        
+        The returned state is a plain dict so it can be stored in the model
+        payload; passing it to preprocess_data makes every row's features
+        independent of the rest of the batch.
+        """
+        # Missing charges count as 0, as they do when scoring
+        charge_median = df['monthly_charges'].fillna(0).median() if 'monthly_charges' in df else 0
+        age_median = df['Age'].median() if 'Age' in df else 0
+        
+        state = {
+            'medians': {
+                'monthly_charges': float(charge_median) if pd.notna(charge_median) else 0.0,
+                'Age': float(age_median) if pd.notna(age_median) else 0.0
+            },
+            'fill_values': dict(self.fill_values),
+            'category_maps': {
+                col: dict(mapping) for col, mapping in self.category_maps.items()
+            }
+        }
+        state['fill_values']['Age'] = state['medians']['Age']
+        
+        self.preprocessing_state = state
+        return state
+    
+    def preprocess_data(
+        self,
+        df: pd.DataFrame,
+        state: Optional[Dict] = None
+    ) -> pd.DataFrame:
+        """Calculate risk score for churn prediction
+        
+        Uses the fitted preprocessing state when one is available and falls
+        back to statistics of the given frame otherwise.
+        """
+        state = state or self.preprocessing_state
         df = df.copy()
         
         # Handle missing values
-        df = df.fillna({
-            'tenure': 0,
-            'monthly_charges': 0,
-            'total_charges': 0,
-            'Age': df['Age'].median() if 'Age' in df else 0,
-            'Payment Delay': 0,
-            'contract_type': 'Basic',
-            'tech_support': 'No',
-            'internet_service': 'No',
-            'Gender': 'Male'
-        })
+        if state is not None:
+            fill_values = state['fill_values']
+        else:
+            fill_values = dict(self.fill_values)
+            fill_values['Age'] = df['Age'].median() if 'Age' in df else 0
+        df = df.fillna(fill_values)
+        
+        category_maps = state['category_maps'] if state is not None else self.category_maps
         
         # Calculate risk score (0-100)
         risk_score = np.zeros(len(df))
@@ -149,20 +259,16 @@ class DataIngestion:
         risk_score += np.minimum(25, df['Payment Delay'] * 0.8)
         
         # Contract risk (0-15 points)
-        risk_score += df['contract_type'].map({
-            'Basic': 15,
-            'Standard': 7,
-            'Premium': 0
-        }).fillna(15)
+        risk_score += df['contract_type'].map(category_maps['contract_type']).astype(float).fillna(15)
         
         # Service risk (0-15 points)
-        risk_score += df['tech_support'].map({
-            'No': 15,
-            'Yes': 0
-        }).fillna(15)
+        risk_score += df['tech_support'].map(category_maps['tech_support']).astype(float).fillna(15)
         
         # Cost risk (0-10 points)
-        median_charge = df['monthly_charges'].median()
+        if state is not None:
+            median_charge = state['medians']['monthly_charges']
+        else:
+            median_charge = df['monthly_charges'].median()
         risk_score += np.where(
             df['monthly_charges'] > median_charge * 1.5,
             10, 0
@@ -181,6 +287,45 @@ class DataIngestion:
         
         return result
     
+    def preprocess_record(
+        self,
+        record: Dict,
+        state: Optional[Dict] = None
+    ) -> Dict[str, float]:
+        """Calculate the preprocess_data features for a single raw record
+        
+        Mirrors preprocess_data on a one-row frame without building any
+        DataFrame. Without a fitted state the batch median of one row is
+        the row's own value.
+        """
+        state = state or self.preprocessing_state
+        fill_values = state['fill_values'] if state is not None else self.fill_values
+        category_maps = state['category_maps'] if state is not None else self.category_maps
+        
+        def value(name):
+            v = record.get(name)
+            return fill_values.get(name, 0) if v is None else v
+        
+        tenure = value('tenure')
+        monthly_charges = value('monthly_charges')
+        age = value('Age')
+        payment_delay = value('Payment Delay')
+        
+        if state is not None:
+            median_charge = state['medians']['monthly_charges']
+        else:
+            median_charge = monthly_charges
+        
+        risk_score = 0.0
+        risk_score += 30 * np.exp(-np.float64(tenure) / 3)
+        risk_score += np.minimum(25, payment_delay * 0.8)
+        risk_score += category_maps['contract_type'].get(value('contract_type'), 15)
+        risk_score += category_maps['tech_support'].get(value('tech_support'), 15)
+        risk_score += 10 if monthly_charges > median_charge * 1.5 else 0
+        risk_score += 5 if age < 25 else 0
+        
+        return {'risk_score': float(risk_score)}
+    
     def validate_customer_data(self, data: dict) -> CustomerData:
         """Validate incoming customer data"""
         return CustomerData(**data)
\ No newline at end of file
@@ -1,9 +1,12 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Literal, Optional, get_args, get_origin
+from collections import Counter
 import pandas as pd
 import numpy as np
-from pydantic import BaseModel, validator
+from pydantic import BaseModel
 from datetime import datetime
 
+from src.data.ingestion import CustomerData, DataIngestion
+
 class DataValidationReport(BaseModel):
     timestamp: str
     total_records: int
@@ -13,69 +16,199 @@ class DataValidationReport(BaseModel):
     validation_errors: List[str]
     is_valid: bool
 
-class DataValidator:
-    """Validates data quality and generates reports"""
+class _NumericStats:
+    """Count, mean, sum of squared deviations, min and max of one column
+    
+    Partial results merge exactly (Chan et al.), so chunks can be
+    validated separately or in parallel and combined.
+    """
+    __slots__ = ('count', 'nulls', 'invalid', 'mean', 'm2', 'min', 'max')
     
     def __init__(self):
-        self.required_columns = [
-            'tenure', 'monthly_charges', 'total_charges',
-            'contract_type', 'payment_method', 'online_security',
-            'tech_support', 'internet_service'
-        ]
+        self.count = 0
+        self.nulls = 0
+        self.invalid = 0  # Values that were not numbers at all
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+    
+    def update(self, values: np.ndarray, block_rows: int) -> None:
+        """Add a float column, one cache-sized block at a time"""
+        for start in range(0, len(values), block_rows):
+            block = values[start:start + block_rows]
+            missing = np.isnan(block)
+            n_missing = int(np.count_nonzero(missing))
+            if n_missing:
+                self.nulls += n_missing
+                block = block[~missing]
+            if len(block):
+                mean = float(block.mean())
+                deviations = block - mean
+                self._combine(len(block), mean, float(np.dot(deviations, deviations)),
+                              float(block.min()), float(block.max()))
+    
+    def merge(self, other: '_NumericStats') -> None:
+        self.nulls += other.nulls
+        self.invalid += other.invalid
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+    
+    def _combine(self, count: int, mean: float, m2: float, low: float, high: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = float(np.fmin(self.min, low))
+        self.max = float(np.fmax(self.max, high))
+    
+    def statistics(self) -> Dict[str, float]:
+        """The report's figures; std is the sample standard deviation like pandas"""
+        return {
+            "mean": self.mean if self.count else np.nan,
+            "std": float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan,
+            "min": self.min,
+            "max": self.max
+        }
+
+class ValidationStats:
+    """Partial statistics of the chunks seen so far, mergeable with other partials
+    
+    Each column is read once per chunk: numeric columns in blocks small
+    enough that all their reductions run on cached data, categorical
+    columns through a single value count that also yields the nulls.
+    """
+    
+    def __init__(self, numerical_columns: List[str], categorical_columns: List[str], block_rows: int = 1 << 16):
+        self.block_rows = block_rows
+        self.total_records = 0
+        self.missing_columns = set()
+        self.numeric = {col: _NumericStats() for col in numerical_columns}
+        self.categories = {col: Counter() for col in categorical_columns}
+        self.category_nulls = {col: 0 for col in categorical_columns}
+    
+    def update(self, df: pd.DataFrame) -> 'ValidationStats':
+        """Add one chunk"""
+        self.total_records += len(df)
         
-        self.categorical_columns = [
-            'contract_type', 'payment_method', 'online_security',
-            'tech_support', 'internet_service'
-        ]
+        for col, stats in self.numeric.items():
+            if col not in df.columns:
+                self.missing_columns.add(col)
+                continue
+            series = df[col]
+            invalid = 0
+            if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                numbers = pd.to_numeric(series, errors='coerce')
+                invalid = int(numbers.isna().sum() - series.isna().sum())
+                series = numbers
+            stats.update(series.to_numpy(dtype=np.float64, na_value=np.nan), self.block_rows)
+            # Values that were not numbers count as invalid, not as missing
+            stats.invalid += invalid
+            stats.nulls -= invalid
         
-        self.numerical_columns = [
-            'tenure', 'monthly_charges', 'total_charges'
-        ]
+        for col, counts in self.categories.items():
+            if col not in df.columns:
+                self.missing_columns.add(col)
+                continue
+            for value, count in df[col].value_counts(dropna=False, sort=False).items():
+                if pd.isna(value):
+                    self.category_nulls[col] += int(count)
+                else:
+                    counts[value] += int(count)
+        return self
+    
+    def merge(self, other: 'ValidationStats') -> 'ValidationStats':
+        """Fold in the statistics of other chunks"""
+        self.total_records += other.total_records
+        self.missing_columns |= other.missing_columns
+        for col, stats in other.numeric.items():
+            self.numeric[col].merge(stats)
+        for col, counts in other.categories.items():
+            self.categories[col].update(counts)
+            self.category_nulls[col] += other.category_nulls[col]
+        return self
+
+def _allowed_values() -> Dict[str, set]:
+    """Values of the Literal fields of CustomerData, by column name"""
+    allowed = {}
+    for field in CustomerData.__fields__.values():
+        if get_origin(field.outer_type_) is Literal:
+            allowed[field.alias] = set(get_args(field.outer_type_))
+    return allowed
+
+class DataValidator:
+    """Validates data quality and generates reports
+    
+    Checks frames as DataIngestion produces them: its categorical and
+    numeric columns are required, and categories must be ones the API
+    accepts. Large inputs can be validated chunk by chunk with
+    validate_chunks, or as partial ValidationStats merged later.
+    """
+    
+    def __init__(self, ingestion: Optional[DataIngestion] = None, block_rows: int = 1 << 16):
+        ingestion = ingestion or DataIngestion()
+        self.categorical_columns = list(ingestion.categorical_columns)
+        self.numerical_columns = list(ingestion.numeric_columns)
+        self.required_columns = self.numerical_columns + self.categorical_columns
+        self.allowed_values = {
+            col: values for col, values in _allowed_values().items()
+            if col in self.categorical_columns
+        }
+        self.block_rows = block_rows
+    
+    def new_stats(self) -> ValidationStats:
+        """Empty partial statistics for this validator's columns"""
+        return ValidationStats(self.numerical_columns, self.categorical_columns, self.block_rows)
     
     def validate_data(self, df: pd.DataFrame) -> DataValidationReport:
         """Validate data and generate report"""
+        return self.report(self.new_stats().update(df))
+    
+    def validate_chunks(self, chunks: Iterable[pd.DataFrame]) -> DataValidationReport:
+        """Validate a stream of chunks, such as DataIngestion.iter_load_data, in bounded memory"""
+        stats = self.new_stats()
+        for chunk in chunks:
+            stats.update(chunk)
+        return self.report(stats)
+    
+    def report(self, stats: ValidationStats) -> DataValidationReport:
+        """Turn merged statistics into a report"""
         errors = []
         
         # Check required columns
-        missing_cols = set(self.required_columns) - set(df.columns)
-        if missing_cols:
-            errors.append(f"Missing required columns: {missing_cols}")
+        if stats.missing_columns:
+            errors.append(f"Missing required columns: {sorted(stats.missing_columns)}")
         
-        # Generate report
-        report = {
-            "timestamp": datetime.now().isoformat(),
-            "total_records": len(df),
-            "missing_values": self._check_missing_values(df),
-            "categorical_distributions": self._check_categorical_distributions(df),
-            "numerical_statistics": self._check_numerical_statistics(df),
-            "validation_errors": errors,
-            "is_valid": len(errors) == 0
-        }
+        missing_values = {}
+        numerical_statistics = {}
+        for col, numeric in stats.numeric.items():
+            if col in stats.missing_columns:
+                continue
+            missing_values[col] = numeric.nulls
+            numerical_statistics[col] = numeric.statistics()
+            if numeric.invalid:
+                errors.append(f"Non-numeric values in {col}: {numeric.invalid}")
+        
+        categorical_distributions = {}
+        for col, counts in stats.categories.items():
+            if col in stats.missing_columns:
+                continue
+            missing_values[col] = stats.category_nulls[col]
+            total = sum(counts.values())
+            categorical_distributions[col] = {
+                str(value): count / total for value, count in counts.most_common()
+            }
+            unexpected = set(counts) - self.allowed_values.get(col, set(counts))
+            if unexpected:
+                errors.append(f"Unexpected values in {col}: {sorted(map(str, unexpected))[:10]}")
         
-        return DataValidationReport(**report)
-    
-    def _check_missing_values(self, df: pd.DataFrame) -> Dict[str, int]:
-        """Check for missing values in each column"""
-        return df[self.required_columns].isnull().sum().to_dict()
-    
-    def _check_categorical_distributions(self, df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
-        """Calculate distribution of categorical variables"""
-        distributions = {}
-        for col in self.categorical_columns:
-            if col in df.columns:
-                dist = df[col].value_counts(normalize=True).to_dict()
-                distributions[col] = dist
-        return distributions
-    
-    def _check_numerical_statistics(self, df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
-        """Calculate statistics for numerical variables"""
-        stats = {}
-        for col in self.numerical_columns:
-            if col in df.columns:
-                stats[col] = {
-                    "mean": float(df[col].mean()),
-                    "std": float(df[col].std()),
-                    "min": float(df[col].min()),
-                    "max": float(df[col].max())
-                }
-        return stats 
\ No newline at end of file
+        return DataValidationReport(
+            timestamp=datetime.now().isoformat(),
+            total_records=stats.total_records,
+            missing_values=missing_values,
+            categorical_distributions=categorical_distributions,
+            numerical_statistics=numerical_statistics,
+            validation_errors=errors,
+            is_valid=len(errors) == 0
+        )
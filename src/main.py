@@ -5,12 +5,20 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi import Request
 from src.api.endpoints import router as api_router
+from src.config import settings
+from src.monitoring.app_logging import configure_logging, stop_logging
 
 # Re-export the FastAPI app
 __all__ = ['app']
 
 app = FastAPI()
 
+# Registered before the router's handlers, so model loading logs go through it
+@app.on_event("startup")
+async def setup_logging():
+    # Log records are written from a background thread, never on the event loop
+    configure_logging(settings.log_level, json_output=settings.log_json)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="src/static"), name="static")
 
@@ -20,6 +28,10 @@ app.include_router(api_router, prefix="/api")
 # Templates
 templates = Jinja2Templates(directory="src/templates")
 
+@app.on_event("shutdown")
+async def flush_logging():
+    stop_logging()
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
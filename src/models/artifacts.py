@@ -0,0 +1,24 @@
+from typing import Dict
+import joblib
+import os
+
+def dump_artifact(data: Dict, filepath: str) -> None:
+    """Write a model payload as an uncompressed joblib file, atomically
+    
+    Arrays stay uncompressed so load_artifact can map them straight from
+    the file. The payload goes to a temporary name and is renamed into
+    place, so processes that still map the previous file keep reading it
+    intact.
+    """
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    joblib.dump(data, tmp_path, compress=0)
+    os.replace(tmp_path, filepath)
+
+def load_artifact(filepath: str) -> Dict:
+    """Load a model payload with its arrays memory-mapped from the file
+    
+    Copy-on-write maps share pages through the OS page cache, so every
+    worker loading the same file shares one copy of the arrays. Unlike
+    read-only maps, they can be passed to scikit-learn's Cython predictors.
+    """
+    return joblib.load(filepath, mmap_mode='c')
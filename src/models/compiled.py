@@ -0,0 +1,224 @@
+from typing import Dict, List
+from scipy.special import expit
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+import numpy as np
+
+class CompiledEnsemble:
+    """Flat, array-backed form of a fitted binary boosted tree ensemble
+
+    All trees are concatenated into contiguous node arrays (split feature,
+    threshold, children, leaf value, missing-value direction) with leaves
+    pointing at themselves, so every tree can be walked in lock-step for a
+    whole block of rows with a fixed number of vectorized steps; the next
+    node is children[2 * node + go_right]. Leaf values are summed in the
+    same order scikit-learn uses and inputs are cast the same way, so
+    probabilities are bit-identical to the source estimator's predict_proba.
+    
+    The engine avoids scikit-learn's per-call validation, which dominates
+    when scoring one or a few rows. For large batches scikit-learn's
+    compiled traversal is faster; see benchmarks/bench_compiled.py. The
+    arrays are used as stored, so a memory-mapped payload is never copied.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children: np.ndarray,
+        value: np.ndarray,
+        missing_left: np.ndarray,
+        roots: np.ndarray,
+        baseline: float,
+        max_depth: int,
+        n_features: int,
+        float32_inputs: bool,
+        block_size: int = 256
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.baseline = baseline
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.float32_inputs = float32_inputs
+        self.block_size = block_size
+
+    @classmethod
+    def from_estimator(cls, model) -> 'CompiledEnsemble':
+        """Export a fitted GradientBoostingClassifier or HistGradientBoostingClassifier"""
+        if isinstance(model, HistGradientBoostingClassifier):
+            return cls._from_hist(model)
+        if isinstance(model, GradientBoostingClassifier):
+            return cls._from_gbm(model)
+        raise TypeError(f"Cannot compile {type(model).__name__}")
+
+    @classmethod
+    def _from_gbm(cls, model: GradientBoostingClassifier) -> 'CompiledEnsemble':
+        """Flatten the regression trees of an exact gradient boosting model"""
+        if model.estimators_.shape[1] != 1:
+            raise ValueError("Only binary classifiers can be compiled")
+        if not (model.init_ == 'zero' or isinstance(model.init_, DummyClassifier)):
+            raise ValueError("Only constant init estimators can be compiled")
+
+        # The prior init estimator predicts the same log-odds for every row
+        baseline = float(model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0])
+
+        trees = []
+        for estimator in model.estimators_[:, 0]:
+            tree = estimator.tree_
+            trees.append({
+                'feature': tree.feature,
+                'threshold': tree.threshold,
+                'left': tree.children_left,
+                'right': tree.children_right,
+                # predict_stages adds learning_rate * value for each tree
+                'value': model.learning_rate * tree.value[:, 0, 0],
+                'missing_left': np.zeros(tree.node_count, dtype=bool),
+                'is_leaf': tree.children_left == -1
+            })
+
+        # Trees compare float32 inputs against float64 thresholds
+        return cls._concatenate(trees, baseline, model.n_features_in_, float32_inputs=True)
+
+    @classmethod
+    def _from_hist(cls, model: HistGradientBoostingClassifier) -> 'CompiledEnsemble':
+        """Flatten the predictors of a histogram gradient boosting model"""
+        if model.n_trees_per_iteration_ != 1:
+            raise ValueError("Only binary classifiers can be compiled")
+
+        trees = []
+        for predictors in model._predictors:
+            nodes = predictors[0].nodes
+            if nodes['is_categorical'].any():
+                raise ValueError("Categorical splits cannot be compiled")
+            trees.append({
+                'feature': nodes['feature_idx'],
+                'threshold': nodes['num_threshold'],
+                'left': nodes['left'],
+                'right': nodes['right'],
+                'value': nodes['value'],
+                'missing_left': nodes['missing_go_to_left'].astype(bool),
+                'is_leaf': nodes['is_leaf'].astype(bool)
+            })
+
+        baseline = float(model._baseline_prediction.ravel()[0])
+        return cls._concatenate(trees, baseline, model.n_features_in_, float32_inputs=False)
+
+    @classmethod
+    def _concatenate(
+        cls,
+        trees: List[Dict],
+        baseline: float,
+        n_features: int,
+        float32_inputs: bool
+    ) -> 'CompiledEnsemble':
+        """Join per-tree node arrays into one flat node table"""
+        sizes = [len(tree['feature']) for tree in trees]
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+
+        feature, threshold, children, value, missing_left = [], [], [], [], []
+        max_depth = 0
+        for root, tree in zip(roots, trees):
+            is_leaf = tree['is_leaf']
+            own = np.arange(len(is_leaf)) + root
+            # Leaves loop back to themselves so extra steps are no-ops
+            feature.append(np.where(is_leaf, 0, tree['feature']).astype(np.intp))
+            threshold.append(np.asarray(tree['threshold'], dtype=np.float64))
+            tree_children = np.empty(2 * len(is_leaf), dtype=np.intp)
+            tree_children[0::2] = np.where(is_leaf, own, np.asarray(tree['left']) + root)
+            tree_children[1::2] = np.where(is_leaf, own, np.asarray(tree['right']) + root)
+            children.append(tree_children)
+            value.append(np.where(is_leaf, tree['value'], 0.0).astype(np.float64))
+            missing_left.append(np.asarray(tree['missing_left'], dtype=bool))
+            max_depth = max(max_depth, cls._depth(tree['left'], tree['right'], is_leaf))
+
+        return cls(
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            children=np.concatenate(children),
+            value=np.concatenate(value),
+            missing_left=np.concatenate(missing_left),
+            roots=roots,
+            baseline=baseline,
+            max_depth=max_depth,
+            n_features=n_features,
+            float32_inputs=float32_inputs
+        )
+
+    @staticmethod
+    def _depth(left: np.ndarray, right: np.ndarray, is_leaf: np.ndarray) -> int:
+        """Depth of a tree given its local child indices"""
+        depth = 0
+        level = [0]
+        while True:
+            children = [c for n in level if not is_leaf[n] for c in (left[n], right[n])]
+            if not children:
+                return depth
+            level = children
+            depth += 1
+
+    def to_dict(self) -> Dict:
+        """Arrays and metadata for storing in a model payload"""
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'children': self.children,
+            'value': self.value,
+            'missing_left': self.missing_left,
+            'roots': self.roots,
+            'baseline': self.baseline,
+            'max_depth': self.max_depth,
+            'n_features': self.n_features,
+            'float32_inputs': self.float32_inputs
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CompiledEnsemble':
+        """Restore from to_dict output"""
+        return cls(**data)
+
+    def predict_raw(self, X: np.ndarray) -> np.ndarray:
+        """Sum of leaf values plus baseline (log-odds) per row"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has shape {X.shape} but the model expects {self.n_features} features"
+            )
+        if self.float32_inputs:
+            X = X.astype(np.float32).astype(np.float64)
+
+        raw = np.empty(len(X))
+        for start in range(0, len(X), self.block_size):
+            block = X[start:start + self.block_size]
+            raw[start:start + len(block)] = self._predict_block(block)
+        return raw
+
+    def _predict_block(self, X: np.ndarray) -> np.ndarray:
+        """Walk every tree for a block of rows at once"""
+        n_rows, n_features = X.shape
+        X_flat = np.ascontiguousarray(X).ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * n_features)[None, :]
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        has_missing = np.isnan(X_flat).any()
+
+        for _ in range(self.max_depth):
+            x = X_flat[row_offsets + self.feature[nodes]]
+            go_right = x > self.threshold[nodes]
+            if has_missing:
+                go_right = np.where(np.isnan(x), ~self.missing_left[nodes], go_right)
+            nodes = self.children[2 * nodes + go_right]
+
+        # Accumulate tree by tree, in order, starting from the baseline
+        leaf_values = np.empty((len(self.roots) + 1, n_rows))
+        leaf_values[0] = self.baseline
+        leaf_values[1:] = self.value[nodes]
+        return np.add.accumulate(leaf_values, axis=0)[-1]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities with the same layout as predict_proba"""
+        positive = expit(self.predict_raw(X))
+        return np.column_stack([1 - positive, positive])
@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import Dict, Optional
-import joblib
 import json
 import os
 
+from .artifacts import dump_artifact, load_artifact
+from .registry import ModelRegistry
+
 class ModelManager:
     """Manages model versions and metrics"""
     
@@ -12,6 +14,7 @@ class ModelManager:
         self.current_version = None
         self.model_info = None
         os.makedirs(models_dir, exist_ok=True)
+        self.registry = ModelRegistry(models_dir)
     
     def save_model(self, model_data: Dict, metrics: Dict) -> str:
         """Save model with version info and metrics"""
@@ -30,24 +33,31 @@ class ModelManager:
         model_path = os.path.join(self.models_dir, f"model_{version}.pkl")
         info_path = os.path.join(self.models_dir, f"info_{version}.json")
         
-        joblib.dump(model_data, model_path)
+        dump_artifact(model_data, model_path)
         with open(info_path, 'w') as f:
             json.dump(model_info, f)
+        self.registry.register(
+            version, timestamp, metrics, model_data["feature_columns"], model_path
+        )
         
         self.current_version = version
         self.model_info = model_info
         
         return version
     
+    def latest_version(self) -> Optional[str]:
+        """Newest saved version, or None if there are none"""
+        latest = self.registry.latest()
+        return latest['version'] if latest else None
+    
     def load_model(self, version: Optional[str] = None) -> Dict:
-        """Load a specific model version or the latest one"""
+        """Load a specific model version or alias, or the latest one"""
         if version is None:
-            # Get latest version
-            versions = [f for f in os.listdir(self.models_dir) 
-                       if f.startswith("model_v_")]
-            if not versions:
+            version = self.latest_version()
+            if version is None:
                 raise ValueError("No models found")
-            version = versions[-1].replace("model_", "").replace(".pkl", "")
+        else:
+            version = self.registry.resolve(version) or version
         
         model_path = os.path.join(self.models_dir, f"model_{version}.pkl")
         info_path = os.path.join(self.models_dir, f"info_{version}.json")
@@ -59,10 +69,15 @@ class ModelManager:
             self.model_info = json.load(f)
         
         self.current_version = version
-        return joblib.load(model_path)
+        return load_artifact(model_path)
     
-    def get_model_info(self) -> Dict:
-        """Get current model information"""
+    def get_model_info(self, version: Optional[str] = None) -> Dict:
+        """Get current model information, or the registry entry of a version or alias"""
+        if version is not None:
+            entry = self.registry.get(version)
+            if entry is None:
+                raise ValueError(f"Model version {version} not found")
+            return entry
         if self.model_info is None:
             raise ValueError("No model currently loaded")
         return self.model_info 
\ No newline at end of file
@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Index of saved model versions and aliases in a JSON-lines manifest
+
+    The manifest is append-only: one line per registered version and one
+    per alias assignment, where later lines win. It is read once into
+    in-memory dicts, and later calls only read lines appended since, so
+    latest and alias lookups never scan the models directory or open a
+    model payload. Directories saved before the manifest existed are
+    indexed from their info_<version>.json files on first use.
+    """
+
+    manifest_name = "registry.jsonl"
+
+    def __init__(self, models_dir: str = "models"):
+        self.models_dir = models_dir
+        self.manifest_path = os.path.join(models_dir, self.manifest_name)
+        self._versions = {}  # version -> entry, in registration order
+        self._aliases = {}  # alias -> version
+        self._latest = None
+        self._offset = 0  # Bytes of the manifest already indexed
+        self._inode = None
+        self._lock = threading.Lock()
+        os.makedirs(models_dir, exist_ok=True)
+
+        if not os.path.exists(self.manifest_path):
+            self._backfill()
+
+    def register(
+        self,
+        version: str,
+        timestamp: str,
+        metrics: Dict,
+        feature_columns: List[str],
+        artifact_path: str
+    ) -> Dict:
+        """Record a saved model version"""
+        entry = {
+            'type': 'version',
+            'version': version,
+            'timestamp': timestamp,
+            # Only headline numbers; the info file keeps the full metrics
+            'metrics': {k: v for k, v in metrics.items() if isinstance(v, (int, float))},
+            'feature_columns': list(feature_columns),
+            'artifact': os.path.basename(artifact_path),
+            'sha256': _file_sha256(artifact_path)
+        }
+        self._append(entry)
+        return entry
+
+    def set_alias(self, alias: str, version: str) -> None:
+        """Point an alias such as 'production' at a registered version
+
+        An alias given as the target is resolved now, so the new alias
+        pins that version rather than following the other alias.
+        """
+        resolved = self.resolve(version)
+        if resolved is None:
+            raise ValueError(f"Model version {version} not found")
+        self._append({'type': 'alias', 'alias': alias, 'version': resolved})
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Version for a version name or alias"""
+        self._refresh()
+        if name in self._versions:
+            return name
+        return self._aliases.get(name)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Entry for a version name or alias, with its aliases"""
+        version = self.resolve(name)
+        if version is None:
+            return None
+        return self._describe(self._versions[version])
+
+    def latest(self) -> Optional[Dict]:
+        """Most recently registered version"""
+        self._refresh()
+        if self._latest is None:
+            return None
+        return self._describe(self._versions[self._latest])
+
+    def aliases(self) -> Dict[str, str]:
+        """Current alias assignments"""
+        self._refresh()
+        return dict(self._aliases)
+
+    def list_versions(
+        self,
+        alias: Optional[str] = None,
+        since: Optional[str] = None,
+        metric: Optional[str] = None,
+        min_value: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Registered versions, newest first, optionally filtered"""
+        self._refresh()
+        entries = []
+        for entry in reversed(list(self._versions.values())):
+            if alias is not None and self._aliases.get(alias) != entry['version']:
+                continue
+            if since is not None and entry['timestamp'] < since:
+                continue
+            if metric is not None:
+                value = entry['metrics'].get(metric)
+                if value is None or (min_value is not None and value < min_value):
+                    continue
+            entries.append(self._describe(entry))
+            if limit is not None and len(entries) >= limit:
+                break
+        return entries
+
+    def _describe(self, entry: Dict) -> Dict:
+        """Public view of a version entry"""
+        described = {k: v for k, v in entry.items() if k != 'type'}
+        aliases = list(self._aliases.items())  # Snapshot, other threads may append
+        described['aliases'] = sorted(a for a, v in aliases if v == entry['version'])
+        return described
+
+    def _append(self, record: Dict) -> None:
+        """Add a record to the manifest and the in-memory index"""
+        with self._lock:
+            with open(self.manifest_path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """Index manifest lines written since the last call, by any process"""
+        with self._lock:
+            try:
+                stat = os.stat(self.manifest_path)
+            except FileNotFoundError:
+                return
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                # The manifest was replaced, start over
+                self._versions, self._aliases, self._latest = {}, {}, None
+                self._offset, self._inode = 0, stat.st_ino
+            if stat.st_size == self._offset:
+                return
+
+            with open(self.manifest_path, 'rb') as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Partially written line, pick it up next time
+                    self._offset += len(line)
+                    self._apply(json.loads(line))
+
+    def _apply(self, record: Dict) -> None:
+        """Update the index with one manifest record"""
+        if record['type'] == 'version':
+            self._versions[record['version']] = record
+            self._latest = record['version']
+        elif record['type'] == 'alias':
+            self._aliases[record['alias']] = record['version']
+
+    def _backfill(self) -> None:
+        """Index versions saved before the manifest existed"""
+        infos = sorted(f for f in os.listdir(self.models_dir)
+                       if f.startswith("info_v_") and f.endswith(".json"))
+        for info_file in infos:
+            with open(os.path.join(self.models_dir, info_file), 'r') as f:
+                info = json.load(f)
+            artifact_path = os.path.join(self.models_dir, f"model_{info['version']}.pkl")
+            if os.path.exists(artifact_path):
+                self.register(
+                    info['version'], info['timestamp'], info['metrics'],
+                    info['feature_columns'], artifact_path
+                )
+        if infos:
+            logger.info(f"Indexed {len(self._versions)} existing model versions")
+
+def _file_sha256(filepath: str) -> str:
+    """Content hash of a model artifact"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,253 @@
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from threadpoolctl import threadpool_limits
+import joblib
+import numpy as np
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from .trainer import ModelTrainer
+
+logger = logging.getLogger(__name__)
+
+# Data shared by every task in a search worker, memory-mapped once per process
+_worker_data = None
+
+def bin_features(X: np.ndarray, max_bins: int = 255) -> np.ndarray:
+    """Quantize each column to at most max_bins quantile bins
+
+    The search uses bin codes only for the histogram engine, which bins
+    raw values the same way when it is refit and served. The exact
+    engine would be scored on splits it cannot make once refit, so it
+    searches on the raw features.
+    """
+    binned = np.empty(X.shape, dtype=np.float32)
+    for j in range(X.shape[1]):
+        column = X[:, j]
+        present = column[~np.isnan(column)]
+        unique = np.unique(present)
+        if len(unique) <= max_bins:
+            edges = unique
+        else:
+            # Quantiles of the rows, not of the distinct values, as the histogram engine bins
+            edges = np.unique(np.quantile(present, np.linspace(0, 1, max_bins + 1)[1:-1]))
+        binned[:, j] = np.searchsorted(edges, column)
+    return binned
+
+def _init_worker(data_path: str) -> None:
+    """Map the shared search data and keep each worker single-threaded"""
+    global _worker_data
+    _worker_data = joblib.load(data_path, mmap_mode='r')
+    # Parallelism comes from the process pool; avoid oversubscribing cores
+    threadpool_limits(1)
+
+def _evaluate_fold(
+    engine: str,
+    params: Dict,
+    fold: int,
+    n_samples: int,
+    random_state: int
+) -> float:
+    """Fit one candidate on one fold (subsampled to n_samples rows) and score it"""
+    X, y = _worker_data['X'], _worker_data['y']
+    train_idx = _worker_data['train_indices'][fold][:n_samples]
+    test_idx = _worker_data['test_indices'][fold]
+
+    model = ModelTrainer(random_state=random_state, engine=engine).model
+    model.set_params(**params)
+    model.fit(X[train_idx], y[train_idx])
+    return float(roc_auc_score(y[test_idx], model.predict_proba(X[test_idx])[:, 1]))
+
+class HyperparameterSearch:
+    """Cross-validated successive-halving or randomized search over boosting parameters
+
+    Fold splits and the feature matrix (binned for the histogram engine)
+    are computed once and dumped uncompressed to a temporary file that
+    every worker memory-maps, so candidates never re-process or re-pickle
+    the data. Each (candidate, fold) fit is a separate task on a process
+    pool. With successive halving, all candidates start on a small share
+    of each fold's training rows and the best 1/eta move on to eta times
+    more rows. The search stops submitting work once budget_seconds have
+    passed; fits already running are allowed to finish.
+    """
+
+    def __init__(
+        self,
+        engine: str = 'gbm',
+        strategy: str = 'halving',
+        n_candidates: int = 27,
+        n_splits: int = 3,
+        eta: int = 3,
+        min_samples: int = 1000,
+        budget_seconds: Optional[float] = None,
+        n_jobs: Optional[int] = None,
+        random_state: int = 42
+    ):
+        if strategy not in ('halving', 'random'):
+            raise ValueError(f"Unknown search strategy {strategy!r}")
+        if engine not in ModelTrainer.engines:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ModelTrainer.engines}")
+
+        self.engine = engine
+        self.strategy = strategy
+        self.n_candidates = n_candidates
+        self.n_splits = n_splits
+        self.eta = eta
+        self.min_samples = min_samples
+        self.budget_seconds = budget_seconds
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.random_state = random_state
+        self.leaderboard = []
+
+    def sample_candidates(self) -> List[Dict]:
+        """Draw random parameter sets for the configured engine"""
+        rng = np.random.default_rng(self.random_state)
+        candidates = []
+        for _ in range(self.n_candidates):
+            params = {
+                'learning_rate': float(np.exp(rng.uniform(np.log(0.01), np.log(0.3)))),
+                'max_depth': int(rng.integers(2, 9))
+            }
+            if self.engine == 'hist':
+                # The histogram engine has no row subsampling
+                params['max_iter'] = int(rng.choice([100, 200, 300, 500]))
+            else:
+                params['subsample'] = float(rng.uniform(0.5, 1.0))
+                params['n_estimators'] = int(rng.choice([100, 200, 300, 500]))
+            candidates.append(params)
+        return candidates
+
+    def run(self, X: np.ndarray, y: np.ndarray) -> Dict:
+        """Run the search and return the best parameters"""
+        start = time.perf_counter()
+        deadline = start + self.budget_seconds if self.budget_seconds else None
+
+        folds = list(StratifiedKFold(
+            n_splits=self.n_splits,
+            shuffle=True,
+            random_state=self.random_state
+        ).split(X, y))
+        rng = np.random.default_rng(self.random_state)
+        X = np.asarray(X, dtype=float)
+        data = {
+            'X': bin_features(X) if self.engine == 'hist' else X,
+            'y': np.asarray(y),
+            # Shuffled once so every rung's subsample is a prefix
+            'train_indices': [rng.permutation(train) for train, _ in folds],
+            'test_indices': [test for _, test in folds]
+        }
+        n_train = min(len(train) for train, _ in folds)
+        schedule = self._schedule(n_train)
+
+        tmp_dir = tempfile.mkdtemp(prefix="churn-search-")
+        data_path = os.path.join(tmp_dir, "search_data.joblib")
+        joblib.dump(data, data_path)
+
+        candidates = self.sample_candidates()
+        self.leaderboard = []
+        timed_out = False
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_init_worker,
+                initargs=(data_path,)
+            ) as pool:
+                for rung, n_samples in enumerate(schedule):
+                    results = self._run_rung(pool, candidates, rung, n_samples, deadline)
+                    self.leaderboard.extend(results)
+                    if len(results) < len(candidates):
+                        timed_out = True
+                        break
+
+                    if rung < len(schedule) - 1:
+                        n_keep = max(1, len(results) // self.eta)
+                        ranked = sorted(results, key=lambda r: r['score'], reverse=True)
+                        candidates = [r['params'] for r in ranked[:n_keep]]
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # Later rungs saw more data, so they rank first
+        self.leaderboard.sort(key=lambda r: (r['n_samples'], r['score']), reverse=True)
+        if not self.leaderboard:
+            raise RuntimeError("Search budget ran out before any candidate finished")
+
+        best = self.leaderboard[0]
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Search finished in {elapsed:.1f}s with {len(self.leaderboard)} evaluations, "
+            f"best ROC AUC {best['score']:.4f}: {best['params']}"
+        )
+
+        return {
+            'best_params': best['params'],
+            'best_score': best['score'],
+            'strategy': self.strategy,
+            'engine': self.engine,
+            'elapsed_seconds': elapsed,
+            'timed_out': timed_out,
+            'leaderboard': self.leaderboard
+        }
+
+    def _schedule(self, n_train: int) -> List[int]:
+        """Training rows per fold for each rung"""
+        if self.strategy == 'random':
+            return [n_train]
+
+        # One rung per factor of eta in the candidate count
+        n_rungs = 1
+        while self.eta ** n_rungs <= self.n_candidates:
+            n_rungs += 1
+        schedule = []
+        for rung in range(n_rungs):
+            n_samples = int(n_train / self.eta ** (n_rungs - 1 - rung))
+            if n_samples >= min(self.min_samples, n_train):
+                schedule.append(n_samples)
+        return schedule or [n_train]
+
+    def _run_rung(
+        self,
+        pool: ProcessPoolExecutor,
+        candidates: List[Dict],
+        rung: int,
+        n_samples: int,
+        deadline: Optional[float]
+    ) -> List[Dict]:
+        """Evaluate candidates on every fold, returning those that finished in time"""
+        futures = {}
+        for i, params in enumerate(candidates):
+            for fold in range(self.n_splits):
+                future = pool.submit(
+                    _evaluate_fold, self.engine, params, fold,
+                    n_samples, self.random_state
+                )
+                futures[future] = i
+
+        scores = {i: [] for i in range(len(candidates))}
+        pending = set(futures)
+        while pending:
+            timeout = None if deadline is None else max(0, deadline - time.perf_counter())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                scores[futures[future]].append(future.result())
+            if deadline is not None and time.perf_counter() >= deadline and pending:
+                logger.warning(f"Search budget exhausted during rung {rung}, cancelling {len(pending)} tasks")
+                pool.shutdown(wait=False, cancel_futures=True)
+                break
+
+        logger.info(f"Rung {rung}: {len(candidates)} candidates on {n_samples} rows per fold")
+        return [
+            {
+                'params': candidates[i],
+                'score': float(np.mean(fold_scores)),
+                'fold_scores': fold_scores,
+                'rung': rung,
+                'n_samples': n_samples
+            }
+            for i, fold_scores in scores.items()
+            if len(fold_scores) == self.n_splits
+        ]
@@ -0,0 +1,156 @@
+from typing import Dict, Optional
+import threading
+import time
+import numpy as np
+
+class RollingMetrics:
+    """Time-bucketed request metrics answering any window up to the horizon
+
+    Requests are counted into fixed-width buckets held in a ring buffer, so
+    recording is O(1) and a window query sums at most horizon / bucket
+    rows regardless of traffic. Response times go into a log-spaced
+    histogram per bucket (a mergeable quantile sketch with ~5% relative
+    error) and predictions into a 10-bin histogram over [0, 1].
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = 60,
+        horizon_seconds: int = 24 * 60 * 60,
+        min_response_time: float = 1e-5,
+        max_response_time: float = 1e3,
+        growth: float = 1.1,
+        prediction_bins: int = 10
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = horizon_seconds // bucket_seconds
+        self.prediction_bins = prediction_bins
+
+        # Response time sketch bounds: bin 0 catches values below the
+        # minimum and the last bin everything above the maximum
+        n_rt_bins = int(np.ceil(np.log(max_response_time / min_response_time) / np.log(growth)))
+        self._rt_edges = min_response_time * growth ** np.arange(n_rt_bins + 1)
+        self._log_min = np.log(min_response_time)
+        self._log_growth = np.log(growth)
+        self._n_rt_bins = n_rt_bins + 2
+
+        n = self.n_buckets
+        self._bucket_id = np.full(n, -1, dtype=np.int64)
+        self._requests = np.zeros(n, dtype=np.int64)
+        self._errors = np.zeros(n, dtype=np.int64)
+        self._rt_sum = np.zeros(n)
+        self._first_seen = np.zeros(n)
+        self._last_seen = np.zeros(n)
+        self._rt_hist = np.zeros((n, self._n_rt_bins), dtype=np.int32)
+        self._pred_hist = np.zeros((n, prediction_bins), dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def record_request(
+        self,
+        response_time: float,
+        predictions=(),
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Record one request, its latency and the predictions it returned"""
+        timestamp = time.time() if timestamp is None else timestamp
+        rt_bin = self._rt_bin(response_time)
+
+        predictions = np.asarray(predictions, dtype=float).ravel()
+        if len(predictions) == 1:
+            # Skip the histogram call for the common single prediction
+            p = predictions[0]
+            pred_counts = None
+            pred_bin = min(int(p * self.prediction_bins), self.prediction_bins - 1) if 0 <= p <= 1 else -1
+        else:
+            pred_counts = np.histogram(predictions, bins=self.prediction_bins, range=(0, 1))[0]
+
+        with self._lock:
+            i = self._bucket(timestamp)
+            self._requests[i] += 1
+            self._rt_sum[i] += response_time
+            self._rt_hist[i, rt_bin] += 1
+            if pred_counts is not None:
+                self._pred_hist[i] += pred_counts
+            elif pred_bin >= 0:
+                self._pred_hist[i, pred_bin] += 1
+
+    def record_error(self, timestamp: Optional[float] = None) -> None:
+        """Record a failed request"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._errors[self._bucket(timestamp)] += 1
+
+    def summary(
+        self,
+        window_seconds: float,
+        now: Optional[float] = None
+    ) -> Optional[Dict]:
+        """Aggregate the buckets overlapping the last window_seconds"""
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_seconds)
+        n_window = min(self.n_buckets, int(np.ceil(window_seconds / self.bucket_seconds)))
+
+        with self._lock:
+            mask = (self._bucket_id > current - n_window) & (self._bucket_id <= current)
+            requests = int(self._requests[mask].sum())
+            if requests == 0:
+                return None
+
+            errors = int(self._errors[mask].sum())
+            rt_sum = float(self._rt_sum[mask].sum())
+            rt_hist = self._rt_hist[mask].sum(axis=0)
+            pred_hist = self._pred_hist[mask].sum(axis=0)
+            active = mask & (self._requests > 0)
+            span = float(self._last_seen[active].max() - self._first_seen[active].min())
+
+        span_minutes = span / 60
+        in_range = pred_hist.sum()
+        width = 1 / self.prediction_bins
+        density = pred_hist / (in_range * width) if in_range else pred_hist.astype(float)
+
+        return {
+            'avg_response_time': rt_sum / requests,
+            'p95_response_time': self._quantile(rt_hist, 0.95),
+            'requests_per_minute': requests / span_minutes if span_minutes > 0 else 0,
+            'error_rate': errors / requests,
+            'prediction_distribution': {
+                f"{i * width:.1f}-{(i + 1) * width:.1f}": float(density[i])
+                for i in range(self.prediction_bins)
+            }
+        }
+
+    def _bucket(self, timestamp: float) -> int:
+        """Return the ring slot for a timestamp, recycling stale slots"""
+        bucket_id = int(timestamp // self.bucket_seconds)
+        i = bucket_id % self.n_buckets
+        if self._bucket_id[i] != bucket_id:
+            self._bucket_id[i] = bucket_id
+            self._requests[i] = 0
+            self._errors[i] = 0
+            self._rt_sum[i] = 0
+            self._rt_hist[i] = 0
+            self._pred_hist[i] = 0
+            self._first_seen[i] = timestamp
+            self._last_seen[i] = timestamp
+        else:
+            self._first_seen[i] = min(self._first_seen[i], timestamp)
+            self._last_seen[i] = max(self._last_seen[i], timestamp)
+        return i
+
+    def _rt_bin(self, response_time: float) -> int:
+        """Map a response time to its sketch bin"""
+        if response_time <= self._rt_edges[0]:
+            return 0
+        b = int((np.log(response_time) - self._log_min) / self._log_growth) + 1
+        return min(b, self._n_rt_bins - 1)
+
+    def _quantile(self, hist: np.ndarray, q: float) -> float:
+        """Estimate a quantile from the response time sketch"""
+        rank = q * hist.sum()
+        b = int(np.searchsorted(np.cumsum(hist), rank))
+        if b == 0:
+            return float(self._rt_edges[0])
+        if b >= len(self._rt_edges):
+            return float(self._rt_edges[-1])
+        # Geometric midpoint of the bin's edges
+        return float(np.sqrt(self._rt_edges[b - 1] * self._rt_edges[b]))
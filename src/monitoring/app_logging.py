@@ -0,0 +1,131 @@
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+from datetime import datetime, timezone
+import logging
+import queue
+import random
+import sys
+import orjson
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+class _DeferredQueueHandler(QueueHandler):
+    """Hands records to the listener thread without formatting them first
+
+    The stdlib QueueHandler formats the message in the logging thread;
+    here %-arguments are merged by the listener, so the caller only pays
+    for building the record. Arguments must therefore not be mutated
+    after logging. Exceptions are rendered up front, while their frames
+    are still intact. A full queue drops records instead of blocking.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _DrainingListener(QueueListener):
+    """Waits for room to queue its stop signal, so stopping drains a full queue"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+_installed = {}  # handler and listener of the active configure_logging call
+
+def configure_logging(
+    level: str = "INFO",
+    json_output: bool = True,
+    stream: Optional[IO] = None,
+    queue_size: int = 10000,
+    capture_uvicorn: bool = True
+) -> QueueListener:
+    """Route all logging through a queue to a single writer thread
+
+    The root logger gets a queue handler, so code that logs (the event
+    loop included) never formats or writes itself. One listener thread
+    writes JSON lines, or plain text, to stream (stderr by default).
+    Uvicorn's loggers, the access log among them, are redirected the same
+    way. Calling it again replaces the previous configuration.
+    """
+    stop_logging()
+    output = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    output.setFormatter(JSONFormatter() if json_output else logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s"
+    ))
+    log_queue = queue.Queue(maxsize=queue_size)
+    handler = _DeferredQueueHandler(log_queue)
+    listener = _DrainingListener(log_queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    if capture_uvicorn:
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.propagate = True
+
+    listener.start()
+    _installed.update(handler=handler, listener=listener)
+    return listener
+
+def stop_logging() -> None:
+    """Write out queued records and remove the handler configure_logging added"""
+    handler = _installed.pop("handler", None)
+    listener = _installed.pop("listener", None)
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+
+def dropped_records() -> int:
+    """Records lost to a full queue since configure_logging"""
+    handler = _installed.get("handler")
+    return handler.dropped if handler is not None else 0
+
+class PayloadSampler:
+    """Decides per request whether to log its full payload at DEBUG
+
+    Checks the level first, so with DEBUG off a request costs one
+    comparison and no payload is ever built. At DEBUG, only a rate share
+    of requests is logged.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+
+    def sample(self, logger: logging.Logger) -> bool:
+        if self.rate <= 0 or not logger.isEnabledFor(logging.DEBUG):
+            return False
+        return self.rate >= 1 or random.random() < self.rate
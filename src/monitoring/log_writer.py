@@ -0,0 +1,141 @@
+from collections import deque
+from typing import Dict, List
+import atexit
+import json
+import logging
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; one writer per file there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class BufferedLogWriter:
+    """Append-only newline-delimited JSON log with a background flusher
+
+    write() only appends to an in-memory buffer; a daemon thread serializes
+    and appends buffered records to disk when the buffer reaches
+    max_buffer_records or every flush_interval seconds, whichever comes
+    first. Files are rotated like logging.handlers.RotatingFileHandler
+    (path, path.1, ... path.<backup_count>) once they exceed max_file_bytes.
+    If the disk cannot keep up and max_pending_records are waiting, new
+    records are dropped and counted instead of blocking the caller.
+
+    Several processes, such as uvicorn workers, may write the same file:
+    each flush holds an exclusive lock on path.lock while it checks the
+    size, rotates and appends, so writes never interleave or land in a
+    file another process has just rotated away.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_buffer_records: int = 1000,
+        flush_interval: float = 1.0,
+        max_file_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        max_pending_records: int = 100000
+    ):
+        self.path = path
+        self.max_buffer_records = max_buffer_records
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.backup_count = backup_count
+        self.max_pending_records = max_pending_records
+        self.dropped_records = 0
+
+        self._buffer = deque()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"log-writer:{os.path.basename(path)}",
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, entry: Dict) -> None:
+        """Queue a record for writing without touching the disk"""
+        if len(self._buffer) >= self.max_pending_records:
+            self.dropped_records += 1
+            return
+
+        self._buffer.append(entry)
+        if len(self._buffer) >= self.max_buffer_records:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write every buffered record to disk now"""
+        with self._write_lock:
+            records = self._drain()
+            if records:
+                self._write_records(records)
+
+    def close(self) -> None:
+        """Stop the background thread and flush what is left"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self) -> None:
+        """Background loop flushing on size or time"""
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error writing to {self.path}: {str(e)}")
+
+    def _drain(self) -> List[Dict]:
+        """Pop everything currently buffered"""
+        records = []
+        buffer = self._buffer
+        while buffer:
+            records.append(buffer.popleft())
+        return records
+
+    def _write_records(self, records: List[Dict]) -> None:
+        """Append records as JSON lines, rotating first if needed"""
+        data = ''.join(json.dumps(record) + '\n' for record in records)
+
+        with open(f"{self.path}.lock", 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # Released when the file closes
+            if self._should_rotate(len(data)):
+                self._rotate()
+
+            with open(self.path, 'a') as f:
+                f.write(data)
+
+    def _should_rotate(self, incoming_bytes: int) -> bool:
+        """Check whether appending would push the file over its size limit"""
+        if self.max_file_bytes <= 0 or not os.path.exists(self.path):
+            return False
+        size = os.path.getsize(self.path)
+        return size > 0 and size + incoming_bytes > self.max_file_bytes
+
+    def _rotate(self) -> None:
+        """Shift path -> path.1 -> ... dropping the oldest backup"""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
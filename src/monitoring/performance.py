@@ -1,18 +1,18 @@
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-import pandas as pd
-import numpy as np
 from pydantic import BaseModel
-import time
-import json
 import os
 
+from src.monitoring.aggregator import RollingMetrics
+from src.monitoring.log_writer import BufferedLogWriter
+
 class PredictionLog(BaseModel):
     timestamp: str
     customer_id: str
     prediction: float
     response_time: float
     features: Dict
+    model_version: Optional[str] = None
 
 class PerformanceMetrics(BaseModel):
     avg_response_time: float
@@ -20,22 +20,50 @@ class PerformanceMetrics(BaseModel):
     requests_per_minute: float
     error_rate: float
     prediction_distribution: Dict[str, float]
+    cache: Optional[Dict[str, float]] = None
+    batching: Optional[Dict[str, float]] = None
+    executor: Optional[Dict[str, float]] = None
+    logging: Optional[Dict[str, float]] = None
 
 class ModelMonitor:
     """Monitors model performance and prediction patterns"""
     
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        flush_interval: float = 1.0,
+        max_buffer_records: int = 1000,
+        max_file_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5
+    ):
         self.log_dir = log_dir
-        self.prediction_log_path = os.path.join(log_dir, "predictions.json")
-        self.error_log_path = os.path.join(log_dir, "errors.json")
+        self.prediction_log_path = os.path.join(log_dir, "predictions.jsonl")
+        self.error_log_path = os.path.join(log_dir, "errors.jsonl")
+        self.shadow_log_path = os.path.join(log_dir, "shadow.jsonl")
         os.makedirs(log_dir, exist_ok=True)
+        
+        # One append-only writer per log file
+        self._writers = {
+            path: BufferedLogWriter(
+                path,
+                max_buffer_records=max_buffer_records,
+                flush_interval=flush_interval,
+                max_file_bytes=max_file_bytes,
+                backup_count=backup_count
+            )
+            for path in (self.prediction_log_path, self.error_log_path, self.shadow_log_path)
+        }
+        
+        # In-memory rolling aggregates answering get_performance_metrics
+        self.metrics = RollingMetrics()
     
     def log_prediction(
         self,
         customer_id: str,
         prediction: float,
         features: Dict,
-        response_time: float
+        response_time: float,
+        model_version: Optional[str] = None
     ):
         """Log a single prediction"""
         log_entry = PredictionLog(
@@ -43,10 +71,56 @@ class ModelMonitor:
             customer_id=customer_id,
             prediction=prediction,
             response_time=response_time,
-            features=features
+            features=features,
+            model_version=model_version
         )
         
         self._append_to_log(self.prediction_log_path, log_entry.dict())
+        self.metrics.record_request(response_time, [prediction])
+    
+    def log_batch(
+        self,
+        customer_ids: List[str],
+        predictions: List[float],
+        response_time: float,
+        model_versions: Optional[List[Optional[str]]] = None
+    ):
+        """Log the predictions of one batch request"""
+        timestamp = datetime.now().isoformat()
+        if model_versions is None:
+            model_versions = [None] * len(customer_ids)
+        for customer_id, prediction, model_version in zip(customer_ids, predictions, model_versions):
+            self._append_to_log(self.prediction_log_path, {
+                "timestamp": timestamp,
+                "customer_id": customer_id,
+                "prediction": prediction,
+                "response_time": response_time,
+                "features": {"batch_size": len(customer_ids)},
+                "model_version": model_version
+            })
+        self.metrics.record_request(response_time, predictions)
+    
+    def log_shadow(
+        self,
+        customer_ids: List[str],
+        primary_version: Optional[str],
+        shadow_version: str,
+        primary_outputs: List[float],
+        shadow_outputs: List[float],
+        response_time: float
+    ):
+        """Log shadow model outputs next to the primary model's for offline comparison"""
+        timestamp = datetime.now().isoformat()
+        for customer_id, primary_output, shadow_output in zip(customer_ids, primary_outputs, shadow_outputs):
+            self._append_to_log(self.shadow_log_path, {
+                "timestamp": timestamp,
+                "customer_id": customer_id,
+                "primary_version": primary_version,
+                "shadow_version": shadow_version,
+                "primary_output": primary_output,
+                "shadow_output": shadow_output,
+                "response_time": response_time
+            })
     
     def log_error(self, error: Exception, context: Dict):
         """Log an error"""
@@ -58,93 +132,39 @@ class ModelMonitor:
         }
         
         self._append_to_log(self.error_log_path, error_entry)
+        self.metrics.record_error()
     
     def get_performance_metrics(
         self,
         time_window: timedelta = timedelta(hours=1)
     ) -> PerformanceMetrics:
         """Calculate performance metrics for recent predictions"""
-        recent_predictions = self._load_recent_logs(
-            self.prediction_log_path,
-            time_window
-        )
-        recent_errors = self._load_recent_logs(
-            self.error_log_path,
-            time_window
-        )
-        
-        if not recent_predictions:
+        summary = self.metrics.summary(time_window.total_seconds())
+        if summary is None:
             return None
         
-        df_predictions = pd.DataFrame(recent_predictions)
-        
-        # Calculate metrics
-        total_requests = len(recent_predictions)
-        time_span = (
-            pd.to_datetime(df_predictions['timestamp'].max()) -
-            pd.to_datetime(df_predictions['timestamp'].min())
-        ).total_seconds() / 60  # in minutes
-        
-        metrics = PerformanceMetrics(
-            avg_response_time=df_predictions['response_time'].mean(),
-            p95_response_time=df_predictions['response_time'].quantile(0.95),
-            requests_per_minute=total_requests / time_span if time_span > 0 else 0,
-            error_rate=len(recent_errors) / total_requests if total_requests > 0 else 0,
-            prediction_distribution=self._calculate_prediction_distribution(df_predictions)
-        )
-        
-        return metrics
+        return PerformanceMetrics(**summary)
+    
+    def dropped_records(self) -> Dict[str, int]:
+        """Records each log writer dropped because the disk fell behind, by log name"""
+        return {
+            os.path.splitext(os.path.basename(path))[0]: writer.dropped_records
+            for path, writer in self._writers.items()
+        }
+    
+    def flush(self):
+        """Write all buffered log entries to disk"""
+        for writer in self._writers.values():
+            writer.flush()
+    
+    def close(self):
+        """Flush and stop the background log writers"""
+        for writer in self._writers.values():
+            writer.close()
     
     def _append_to_log(self, log_path: str, entry: Dict):
-        """Append an entry to a log file"""
+        """Queue an entry for the log file's background writer"""
         try:
-            if os.path.exists(log_path):
-                with open(log_path, 'r') as f:
-                    logs = json.load(f)
-            else:
-                logs = []
-            
-            logs.append(entry)
-            
-            with open(log_path, 'w') as f:
-                json.dump(logs, f)
+            self._writers[log_path].write(entry)
         except Exception as e:
             print(f"Error logging to {log_path}: {str(e)}")
-    
-    def _load_recent_logs(
-        self,
-        log_path: str,
-        time_window: timedelta
-    ) -> List[Dict]:
-        """Load logs within the specified time window"""
-        if not os.path.exists(log_path):
-            return []
-        
-        with open(log_path, 'r') as f:
-            logs = json.load(f)
-        
-        cutoff_time = datetime.now() - time_window
-        recent_logs = [
-            log for log in logs
-            if datetime.fromisoformat(log['timestamp']) > cutoff_time
-        ]
-        
-        return recent_logs
-    
-    def _calculate_prediction_distribution(
-        self,
-        df: pd.DataFrame,
-        bins: int = 10
-    ) -> Dict[str, float]:
-        """Calculate distribution of prediction values"""
-        hist, bin_edges = np.histogram(
-            df['prediction'],
-            bins=bins,
-            range=(0, 1),
-            density=True
-        )
-        
-        return {
-            f"{bin_edges[i]:.1f}-{bin_edges[i+1]:.1f}": float(hist[i])
-            for i in range(len(hist))
-        } 
\ No newline at end of file
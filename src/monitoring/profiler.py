@@ -0,0 +1,60 @@
+from collections import Counter
+from typing import Dict, Optional
+import sys
+import threading
+import time
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+class SamplingProfiler:
+    """Samples the stacks of every thread in this process at a fixed interval
+
+    Meant for short captures on a live server: sampling reads
+    sys._current_frames() from a separate thread, so the profiled code
+    is not instrumented and runs at full speed between samples. Results
+    use the folded format ("thread;outer;...;inner count" per line) read
+    by flamegraph.pl, speedscope and inferno. Only one capture runs at a
+    time.
+    """
+
+    def __init__(self, max_depth: int = 128):
+        self.max_depth = max_depth
+        self._running = threading.Lock()
+
+    def sample(self, seconds: float, interval: float = 0.005) -> Counter:
+        """Folded stack -> number of samples, over the next seconds"""
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already being captured")
+        try:
+            stacks = Counter()
+            own_id = threading.get_ident()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != own_id:
+                        stacks[self._fold(names.get(thread_id, str(thread_id)), frame)] += 1
+                time.sleep(interval)
+            return stacks
+        finally:
+            self._running.release()
+
+    def _fold(self, thread_name: str, frame) -> str:
+        """One stack as root-first frames joined by semicolons"""
+        frames = []
+        while frame is not None and len(frames) < self.max_depth:
+            code = frame.f_code
+            module = frame.f_globals.get('__name__', code.co_filename)
+            frames.append(f"{module}:{getattr(code, 'co_qualname', code.co_name)}")
+            frame = frame.f_back
+        frames.append(thread_name.replace(";", "_").replace(" ", "_"))
+        return ";".join(reversed(frames))
+
+    @staticmethod
+    def folded(stacks: Dict[str, int], min_samples: Optional[int] = None) -> str:
+        """Folded-format text, most sampled stacks first"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in Counter(stacks).most_common()
+            if min_samples is None or count >= min_samples
+        )
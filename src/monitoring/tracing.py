@@ -0,0 +1,129 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from bisect import bisect_left
+import threading
+import time
+
+# Upper bounds of the duration histograms, in seconds
+DEFAULT_BUCKETS = (
+    1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+class _Histogram:
+    """Counts per bucket plus the total, as Prometheus histograms need"""
+    __slots__ = ('counts', 'sum_ns', 'count')
+
+    def __init__(self, n_buckets: int):
+        self.counts = [0] * (n_buckets + 1)  # the last one is +Inf
+        self.sum_ns = 0
+        self.count = 0
+
+class _Span:
+    """Times one stage; reused, so entering costs two clock reads and a lock"""
+    __slots__ = ('_timers', '_stage', '_start')
+
+    def __init__(self, timers: 'StageTimers', stage: str):
+        self._timers = timers
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._timers.record(self._stage, time.perf_counter_ns() - self._start)
+        return False
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+class StageTimers:
+    """Duration histograms per named stage of a request
+
+    Use `with timers.stage("model"):` around each phase. Durations come
+    from the monotonic nanosecond clock and go into fixed buckets, so
+    recording is a bisect and two additions under a lock. While disabled,
+    stage() returns a shared no-op and costs a single attribute check.
+    Timers live in the process that runs the stage: with process
+    scoring workers only the stages run by the API process show up here.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._bounds_ns = [int(b * 1e9) for b in self.buckets]
+        self._histograms: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str):
+        """Context manager timing one run of a stage"""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, duration_ns: int) -> None:
+        """Add one measured duration to a stage's histogram"""
+        i = bisect_left(self._bounds_ns, duration_ns)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram(len(self._bounds_ns))
+            histogram.counts[i] += 1
+            histogram.sum_ns += duration_ns
+            histogram.count += 1
+
+    def snapshot(self) -> Dict[str, Tuple[List[int], float, int]]:
+        """stage -> (cumulative bucket counts, total seconds, count)"""
+        with self._lock:
+            histograms = {
+                name: (list(h.counts), h.sum_ns, h.count)
+                for name, h in self._histograms.items()
+            }
+        snapshot = {}
+        for name, (counts, sum_ns, count) in histograms.items():
+            cumulative, running = [], 0
+            for c in counts:
+                running += c
+                cumulative.append(running)
+            snapshot[name] = (cumulative, sum_ns / 1e9, count)
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+def _label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_histograms(name: str, help_text: str, timers: StageTimers, label: str = "stage") -> List[str]:
+    """Lines of a Prometheus histogram family, one series per stage"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    bounds = [repr(float(b)) for b in timers.buckets] + ["+Inf"]
+    for stage, (cumulative, total, count) in sorted(timers.snapshot().items()):
+        stage_label = f'{label}="{_label_value(stage)}"'
+        for bound, value in zip(bounds, cumulative):
+            lines.append(f'{name}_bucket{{{stage_label},le="{bound}"}} {value}')
+        lines.append(f"{name}_sum{{{stage_label}}} {total!r}")
+        lines.append(f"{name}_count{{{stage_label}}} {count}")
+    return lines
+
+def prometheus_gauges(prefix: str, values: Optional[Dict[str, float]], help_text: str) -> List[str]:
+    """One gauge per numeric value, named prefix_key"""
+    lines = []
+    for key, value in sorted((values or {}).items()):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}".replace(" ", "_").replace("-", "_")
+        lines += [f"# HELP {name} {help_text} ({key})", f"# TYPE {name} gauge", f"{name} {float(value)!r}"]
+    return lines
+
+# Process-wide timers for the prediction path
+stage_timers = StageTimers()
@@ -0,0 +1,212 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import argparse
+import io
+import logging
+import multiprocessing
+import os
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.api import scoring
+from src.models.scoring import RISK_FACTOR_NAMES
+
+logger = logging.getLogger(__name__)
+
+# Offline batch scoring: python -m src.score INPUT OUTPUT_DIR
+#
+# The input (a Kaggle-layout CSV or Parquet file) is cut into shards
+# that worker processes read themselves: byte ranges of a CSV, aligned
+# to line breaks, or row groups of a Parquet file. The parent never
+# parses rows, so throughput scales with the number of workers. Each
+# worker loads the model once and writes one Parquet part per shard.
+
+OUTPUT_COLUMNS = ['customer_id', 'churn_probability'] + RISK_FACTOR_NAMES + ['risk_level', 'model_probability']
+
+class Shard(NamedTuple):
+    """A piece of the input one worker reads and scores"""
+    index: int
+    path: str
+    kind: str  # 'csv' or 'parquet'
+    start: int  # Byte offset for CSV, first row group for Parquet
+    stop: int  # Exclusive end byte or row group
+    header: Optional[List[str]] = None  # CSV column names
+
+def plan_shards(path: str, shard_bytes: int = 64 << 20) -> List[Shard]:
+    """Cut an input file into shards of about shard_bytes
+
+    CSV shards own every line that starts inside their byte range, so
+    each line is read exactly once. Quoted fields must not contain
+    newlines. Parquet shards are runs of whole row groups.
+    """
+    if path.endswith(('.parquet', '.pq')):
+        metadata = pq.ParquetFile(path).metadata
+        shards, start, size = [], 0, 0
+        for i in range(metadata.num_row_groups):
+            size += metadata.row_group(i).total_byte_size
+            if size >= shard_bytes or i == metadata.num_row_groups - 1:
+                shards.append(Shard(len(shards), path, 'parquet', start, i + 1))
+                start, size = i + 1, 0
+        return shards
+
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+    header = pd.read_csv(io.BytesIO(header_line), nrows=0).columns.tolist()
+    file_size = os.path.getsize(path)
+    return [
+        Shard(i, path, 'csv', start, min(start + shard_bytes, file_size), header)
+        for i, start in enumerate(range(len(header_line), file_size, shard_bytes))
+    ]
+
+def read_shard(shard: Shard) -> pd.DataFrame:
+    """Read the raw rows of a shard"""
+    if shard.kind == 'parquet':
+        parquet_file = pq.ParquetFile(shard.path)
+        return parquet_file.read_row_groups(range(shard.start, shard.stop)).to_pandas()
+
+    with open(shard.path, 'rb') as f:
+        # A line that straddles start belongs to the previous shard
+        f.seek(shard.start - 1)
+        f.readline()
+        data = f.read(max(0, shard.stop - f.tell()))
+        if data and not data.endswith(b"\n"):
+            data += f.readline()  # Finish the last line started before stop
+
+    if not data.strip():
+        return pd.DataFrame(columns=shard.header)
+    return pd.read_csv(
+        io.BytesIO(data), header=None, names=shard.header,
+        **scoring.data_ingestion._read_options()
+    )
+
+def score_frame(df: pd.DataFrame, ref: scoring.ModelRef = None) -> pd.DataFrame:
+    """Transform raw Kaggle-layout rows and score them like /predict/batch"""
+    df = scoring.data_ingestion._transform(df).reset_index(drop=True)
+    if df.empty:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+
+    scores = scoring.risk_scorer.score(df)
+    result = pd.DataFrame({'customer_id': df['customer_id'].to_numpy()})
+    for name in ['churn_probability'] + RISK_FACTOR_NAMES + ['risk_level']:
+        result[name] = scores[name]
+    result['model_probability'] = scoring.predict_frame(ref, df)
+    return result
+
+def score_shard(
+    shard: Shard,
+    output_dir: str,
+    ref: scoring.ModelRef = None,
+    partition_by: Sequence[str] = ()
+) -> Dict:
+    """Worker task: read, score and write one shard"""
+    start_time = time.perf_counter()
+    raw = read_shard(shard)
+    result = score_frame(raw, ref)
+
+    table = pa.Table.from_pandas(result, preserve_index=False)
+    if partition_by:
+        pq.write_to_dataset(
+            table, output_dir, partition_cols=list(partition_by),
+            basename_template=f"part-{shard.index:05d}-{{i}}.parquet"
+        )
+    else:
+        # Write under a temporary name so readers never see half a part
+        path = os.path.join(output_dir, f"part-{shard.index:05d}.parquet")
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    return {
+        "shard": shard.index,
+        "rows_read": len(raw),
+        "rows_scored": len(result),
+        "seconds": time.perf_counter() - start_time
+    }
+
+def score_file(
+    input_path: str,
+    output_dir: str,
+    model_path: str = 'models/churn_model.pkl',
+    models_dir: str = 'models',
+    version: Optional[str] = None,
+    workers: Optional[int] = None,
+    shard_bytes: int = 64 << 20,
+    partition_by: Sequence[str] = (),
+    overwrite: bool = False
+) -> Dict:
+    """Score an input file on a process pool into a Parquet dataset
+
+    version picks a saved model version or alias; the model file at
+    model_path is used otherwise. Rows dropped by the ingestion transform
+    (missing values, unknown subscription types) are not written. Models
+    saved without frozen preprocessing statistics fall back to each
+    shard's own medians, so their outputs depend on the shard size.
+    """
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        if not overwrite:
+            raise FileExistsError(f"Output directory {output_dir} is not empty")
+        for root, _, files in os.walk(output_dir):
+            for name in files:
+                if name.endswith(('.parquet', '.tmp')):
+                    os.remove(os.path.join(root, name))
+    os.makedirs(output_dir, exist_ok=True)
+
+    start_time = time.perf_counter()
+    shards = plan_shards(input_path, shard_bytes)
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"Scoring {input_path} in {len(shards)} shards on {workers} workers")
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, max(1, len(shards))),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=scoring.init_worker,
+        initargs=(model_path, models_dir, version)
+    ) as pool:
+        futures = [pool.submit(score_shard, shard, output_dir, version, partition_by) for shard in shards]
+        for future in as_completed(futures):
+            results.append(future.result())
+            logger.info(f"Shard {results[-1]['shard']}: {results[-1]['rows_scored']} rows "
+                        f"in {results[-1]['seconds']:.1f}s ({len(results)}/{len(shards)})")
+
+    elapsed = time.perf_counter() - start_time
+    rows_scored = sum(r['rows_scored'] for r in results)
+    summary = {
+        "shards": len(shards),
+        "workers": workers,
+        "rows_read": sum(r['rows_read'] for r in results),
+        "rows_scored": rows_scored,
+        "seconds": elapsed,
+        "rows_per_second": rows_scored / elapsed if elapsed > 0 else 0.0
+    }
+    logger.info(f"Scored {rows_scored} of {summary['rows_read']} rows in {elapsed:.1f}s "
+                f"({summary['rows_per_second']:.0f} rows/s)")
+    return summary
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Score a customer file offline into a Parquet dataset")
+    parser.add_argument('input', help="Kaggle-layout CSV or Parquet file")
+    parser.add_argument('output_dir', help="Directory for the Parquet parts")
+    parser.add_argument('--model-path', default='models/churn_model.pkl')
+    parser.add_argument('--models-dir', default='models')
+    parser.add_argument('--version', default=None, help="Saved model version or alias instead of --model-path")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--shard-mb', type=float, default=64, help="Input size per shard")
+    parser.add_argument('--partition-by', nargs='*', default=[], choices=['risk_level'],
+                        help="Hive-partition the output by these columns")
+    parser.add_argument('--overwrite', action='store_true', help="Replace existing parts in output_dir")
+    args = parser.parse_args()
+
+    score_file(
+        args.input,
+        args.output_dir,
+        model_path=args.model_path,
+        models_dir=args.models_dir,
+        version=args.version,
+        workers=args.workers,
+        shard_bytes=int(args.shard_mb * (1 << 20)),
+        partition_by=args.partition_by,
+        overwrite=args.overwrite
+    )
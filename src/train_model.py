@@ -1,5 +1,10 @@
 from data.ingestion import DataIngestion
+from data.cache import FeatureCache
 from models.trainer import ModelTrainer
+from models.model_manager import ModelManager
+from models.search import HyperparameterSearch
+from typing import Dict, Optional
+import argparse
 import logging
 import os
 import numpy as np
@@ -31,7 +36,11 @@ def download_dataset() -> str:
         raise
 
 def train_churn_model(
-    model_save_path: str = 'models/churn_model.pkl'
+    model_save_path: str = 'models/churn_model.pkl',
+    cache_dir: str = 'data/cache',
+    use_cache: bool = True,
+    engine: str = 'gbm',
+    search: Optional[Dict] = None
 ) -> None:
     """Train and save the churn prediction model"""
     try:
@@ -43,11 +52,19 @@ def train_churn_model(
         
         # Initialize components
         data_ingestion = DataIngestion()
-        model_trainer = ModelTrainer()
+        model_trainer = ModelTrainer(engine=engine)
         
         # Load and preprocess data
         logger.info("Loading and preprocessing data...")
-        df = data_ingestion.load_data(data_path)
+        if use_cache:
+            # Reuse the transformed data while the source file is unchanged
+            cache = FeatureCache(cache_dir)
+            df = cache.get_or_compute(
+                data_path, 'load', data_ingestion.transform_version,
+                lambda: data_ingestion.load_data(data_path)
+            )
+        else:
+            df = data_ingestion.load_data(data_path)
         
         # Log data info
         logger.info(f"Columns in data: {df.columns.tolist()}")
@@ -58,7 +75,15 @@ def train_churn_model(
         logger.info("\nSample data before preprocessing:")
         logger.info(df[['contract_type', 'tech_support', 'internet_service', 'Payment Delay', 'tenure', 'monthly_charges']].head())
         
-        df_processed = data_ingestion.preprocess_data(df)
+        # Freeze training-time statistics so inference never recomputes them
+        model_trainer.preprocessing = data_ingestion.fit_preprocessing(df)
+        if use_cache:
+            df_processed = cache.get_or_compute(
+                data_path, 'preprocess', data_ingestion.transform_version,
+                lambda: data_ingestion.preprocess_data(df)
+            )
+        else:
+            df_processed = data_ingestion.preprocess_data(df)
         
         # Log processed data statistics
         logger.info("\nProcessed data statistics:")
@@ -71,8 +96,30 @@ def train_churn_model(
         
         # Prepare and train
         X, y = model_trainer.prepare_data(df_processed)
+        
+        search_results = None
+        if search is not None:
+            # Tune on the training rows only, so the held-out metrics of the
+            # final fit come from rows the search never saw
+            X_search, _, y_search, _ = model_trainer.split_data(X, y)
+            searcher = HyperparameterSearch(engine=engine, **search)
+            search_results = searcher.run(X_search, y_search)
+            model_trainer.model.set_params(**search_results['best_params'])
+            
+            logger.info("\nSearch leaderboard:")
+            for entry in search_results['leaderboard'][:10]:
+                logger.info(f"{entry['score']:.4f}  rows={entry['n_samples']:<8} {entry['params']}")
+        
         metrics = model_trainer.train(X, y)
         
+        # Log evaluation and timing report
+        logger.info("\nHeld-out metrics:")
+        for name in ('accuracy', 'precision', 'recall', 'f1', 'roc_auc'):
+            logger.info(f"{name:30} {metrics[name]:.4f}")
+        logger.info("\nTiming report:")
+        for name, value in metrics['timing'].items():
+            logger.info(f"{name:30} {value}")
+        
         # Log feature importance
         logger.info("\nTop 10 Most Important Features:")
         sorted_features = sorted(
@@ -87,9 +134,49 @@ def train_churn_model(
         model_trainer.save_model(model_save_path)
         logger.info(f"Model saved to {model_save_path}")
         
+        if search_results is not None:
+            # Register the search winner as a new model version
+            metrics['search'] = search_results
+            version = ModelManager(os.path.dirname(model_save_path) or 'models').save_model(
+                model_trainer.get_model_data(), metrics
+            )
+            logger.info(f"Search winner saved as model version {version}")
+        
     except Exception as e:
         logger.error(f"Error during model training: {str(e)}")
         raise
 
 if __name__ == "__main__":
-    train_churn_model() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the churn prediction model")
+    parser.add_argument('--model-path', default='models/churn_model.pkl')
+    parser.add_argument('--cache-dir', default='data/cache')
+    parser.add_argument('--no-cache', action='store_true', help="Always re-parse the source data")
+    parser.add_argument(
+        '--engine', choices=ModelTrainer.engines, default='gbm',
+        help="gbm: exact single-threaded boosting; hist: multi-core histogram boosting with early stopping"
+    )
+    parser.add_argument('--search', action='store_true', help="Tune hyperparameters with cross-validation first")
+    parser.add_argument('--search-strategy', choices=['halving', 'random'], default='halving')
+    parser.add_argument('--search-candidates', type=int, default=27)
+    parser.add_argument('--search-folds', type=int, default=3)
+    parser.add_argument('--search-budget', type=float, default=None, help="Wall-clock limit in seconds")
+    parser.add_argument('--search-jobs', type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+    
+    search = None
+    if args.search:
+        search = {
+            'strategy': args.search_strategy,
+            'n_candidates': args.search_candidates,
+            'n_splits': args.search_folds,
+            'budget_seconds': args.search_budget,
+            'n_jobs': args.search_jobs
+        }
+    
+    train_churn_model(
+        args.model_path,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        engine=args.engine,
+        search=search
+    ) 
\ No newline at end of file
@@ -0,0 +1,66 @@
+import io
+import logging
+import threading
+
+import orjson
+
+from src.monitoring.app_logging import PayloadSampler, configure_logging, dropped_records, stop_logging
+
+class _Args:
+    """Records the thread that formats it"""
+    formatted_in = None
+
+    def __str__(self):
+        _Args.formatted_in = threading.current_thread().name
+        return "args"
+
+def test_records_are_written_as_json_by_the_listener_thread():
+    stream = io.StringIO()
+    logger = logging.getLogger("tests.app_logging")
+    previous_level = logging.getLogger().level
+    configure_logging("INFO", stream=stream)
+    try:
+        logger.debug("Not written")
+        logger.info("Scored %s", _Args(), extra={"customer_id": "C1"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+    finally:
+        stop_logging()
+        logging.getLogger().setLevel(previous_level)
+
+    first, second = [orjson.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["message"] == "Scored args" and first["customer_id"] == "C1"
+    assert first["level"] == "INFO" and first["logger"] == "tests.app_logging"
+    assert _Args.formatted_in != threading.current_thread().name
+    assert "ValueError: boom" in second["exc_info"]
+    assert dropped_records() == 0
+
+def test_full_queue_drops_instead_of_blocking():
+    stream = io.StringIO()
+    logger = logging.getLogger("tests.app_logging")
+    previous_level = logging.getLogger().level
+    listener = configure_logging("INFO", stream=stream, queue_size=1)
+    listener.stop()  # nothing takes records off the queue
+    try:
+        for i in range(5):
+            logger.info("Record %d", i)
+        assert dropped_records() == 4
+    finally:
+        listener.start()
+        stop_logging()
+        logging.getLogger().setLevel(previous_level)
+    assert len(stream.getvalue().splitlines()) == 1
+
+def test_payload_sampling_is_gated_on_debug():
+    logger = logging.getLogger("tests.app_logging.sampling")
+    logger.setLevel(logging.INFO)
+    try:
+        assert not PayloadSampler(1.0).sample(logger)
+        logger.setLevel(logging.DEBUG)
+        assert PayloadSampler(1.0).sample(logger)
+        assert not PayloadSampler(0.0).sample(logger)
+        assert 50 < sum(PayloadSampler(0.1).sample(logger) for _ in range(2000)) < 350
+    finally:
+        logger.setLevel(logging.NOTSET)
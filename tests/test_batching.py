@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.api import endpoints, scoring
+from src.api.batching import BatcherOverloaded, MicroBatcher
+from src.models.trainer import ModelTrainer
+
+def _slow_double(items, seconds=0.05):
+    """Score function that takes a while and records its batches"""
+    time.sleep(seconds)
+    return [2 * item for item in items]
+
+def test_concurrent_requests_share_batches():
+    """Requests arriving while a batch is running are scored together"""
+    batches = []
+    def score(items):
+        batches.append(list(items))
+        return _slow_double(items)
+
+    async def run():
+        batcher = MicroBatcher(score, ThreadPoolExecutor(1), max_batch_size=8, max_wait_ms=1)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+
+    assert asyncio.run(run()) == [2 * i for i in range(20)]
+    # The first request goes out alone, the rest wait for it in batches of at most 8
+    assert batches[0] == [0]
+    assert max(len(batch) for batch in batches) == 8
+    assert sorted(i for batch in batches for i in batch) == list(range(20))
+
+def test_overload_and_timeout():
+    """Callers are shed when the queue is full or waiting takes too long"""
+    async def run():
+        release = threading.Event()
+        batcher = MicroBatcher(
+            lambda items: release.wait() and items, ThreadPoolExecutor(1),
+            max_wait_ms=1000, max_pending=2, timeout=0.05
+        )
+        tasks = [asyncio.ensure_future(batcher.submit(i)) for i in range(4)]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        release.set()
+        return results
+
+    results = asyncio.run(run())
+    assert [type(r) for r in results] == [asyncio.TimeoutError] * 3 + [BatcherOverloaded]
+
+def test_micro_batch_matches_single_scoring():
+    """Vectorized micro-batches return what scoring one customer at a time does"""
+    customers = endpoints.CANARY_CUSTOMERS * 3
+    trainer = ModelTrainer()
+    trainer.feature_columns = ['risk_score']
+    batched = scoring.score_customers([(c, trainer) for c in customers])
+    for customer, (record, output) in zip(customers, batched):
+        expected_record, expected_output = scoring.score_customer(trainer, customer)
+        assert record == expected_record
+        assert output == expected_output
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from benchmarks.bench_hotpaths import HOT_PATHS, fit_slope, measure
+from benchmarks.workload import kaggle_frame, write_kaggle_csv
+
+def test_kaggle_generator_is_reproducible_across_blocks(tmp_path):
+    frame = kaggle_frame(25, seed=4, block_rows=10)
+    assert frame.equals(kaggle_frame(25, seed=4, block_rows=10))
+    assert frame['CustomerID'].tolist() == list(range(1, 26))
+    path = write_kaggle_csv(str(tmp_path / "kaggle.csv"), 25, seed=4, block_rows=10)
+    pd.testing.assert_frame_equal(pd.read_csv(path), frame)
+
+def test_fit_slope_ignores_small_sizes():
+    sizes = [1, 10, 100, 1000, 10000]
+    linear = [1.0, 1.0, 1.0, 1e-3, 1e-2]
+    assert abs(fit_slope(sizes, linear, fit_from=1000) - 1.0) < 1e-9
+    assert abs(fit_slope(sizes, [1e-3] * 5, fit_from=1) - 0.0) < 1e-9
+    assert fit_slope(sizes, linear, fit_from=10000) is None
+
+def test_every_hot_path_runs_at_small_sizes(tmp_path):
+    for path in HOT_PATHS:
+        curve = measure(path, [1, 10], str(tmp_path), fit_from=1)
+        assert curve["sizes"] == [1, 10]
+        assert all(t > 0 for t in curve["seconds"])
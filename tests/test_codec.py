@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.api import codec, endpoints
+from src.config import settings
+from src.data.ingestion import CustomerData
+from src.models.trainer import ModelTrainer
+
+app = FastAPI()
+app.include_router(endpoints.router, prefix="/api")
+client = TestClient(app)
+
+BASE = endpoints.CANARY_CUSTOMERS[0].dict(by_alias=True)
+
+@pytest.fixture
+def served():
+    untrained = ModelTrainer()
+    untrained.feature_columns = ['risk_score']
+    with patch.object(endpoints, 'model', untrained), \
+            patch.object(endpoints, 'model_version', None), \
+            patch.object(endpoints, 'candidate_route', None):
+        yield untrained
+
+@pytest.mark.parametrize("changes, fast", [
+    ({}, True),
+    ({"monthly_charges": 900}, True),  # ints are fine for floats
+    ({"Payment Delay": 3, "Payment_Delay": 7}, True),  # the alias wins
+    ({"extra_field": 1}, True),
+    ({"tenure": "12"}, False),  # pydantic coerces
+    ({"tenure": 12.7}, False),
+    ({"tenure": True}, False),
+    ({"contract_type": "Gold"}, False),
+    ({"Age": None}, False)
+])
+def test_fast_path_matches_pydantic(changes, fast):
+    payload = {**BASE, **changes}
+    assert (codec.fast_customer(payload) is not None) == fast
+    try:
+        expected = CustomerData.parse_obj(payload)
+    except ValidationError:
+        with pytest.raises(ValidationError):
+            codec.parse_customer(payload)
+        return
+    customer = codec.parse_customer(payload)
+    assert customer.dict() == expected.dict()
+    assert customer.__fields_set__ == expected.__fields_set__
+    assert type(customer.monthly_charges) is float
+
+def test_invalid_bodies_get_fastapi_errors(served):
+    response = client.post("/api/predict", json={**BASE, "contract_type": "Gold"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "contract_type"]
+
+    response = client.post("/api/predict/batch", json={"customers": [BASE, {**BASE, "Age": "old"}]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "customers", 1, "Age"]
+
+    response = client.post("/api/predict", content=b"{not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1]
+
+def test_internal_callers_skip_validation(served):
+    """Only callers with the internal token get unchecked construction"""
+    with patch.object(settings, 'internal_token', "secret"):
+        with patch.object(codec, 'fast_customer', side_effect=AssertionError("validated")):
+            response = client.post("/api/predict", json=BASE, headers={"X-Internal-Token": "secret"})
+            batch = client.post("/api/predict/batch", json={"customers": [BASE]},
+                                headers={"X-Internal-Token": "secret"})
+        assert response.status_code == 200
+        assert response.json() == client.post("/api/predict", json=BASE).json()
+        assert batch.json()["predictions"] == [response.json()]
+        assert client.post("/api/predict", json={**BASE, "Age": "x"},
+                           headers={"X-Internal-Token": "wrong"}).status_code == 422
+
+def test_request_schemas_stay_documented():
+    paths = app.openapi()["paths"]
+    single = paths["/api/predict"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert single["properties"]["Payment Delay"]["type"] == "integer"
+    batch = paths["/api/predict/batch"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert batch["properties"]["customers"]["items"]["title"] == "CustomerData"
+
+def test_internal_callers_still_need_every_field(served):
+    """A misspelled key from an internal caller is a 422, not a null prediction"""
+    payload = {k: v for k, v in BASE.items() if k != "contract_type"}
+    payload["contract_typ"] = BASE["contract_type"]
+    assert codec.trusted_customer(payload) is None
+    with patch.object(settings, 'internal_token', "secret"):
+        response = client.post("/api/predict", json=payload, headers={"X-Internal-Token": "secret"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "contract_type"]
+
+@pytest.mark.parametrize("changes", [{"contract_type": "Gold"}, {"tech_support": ["Yes"]}])
+def test_internal_callers_still_need_known_categories(served, changes):
+    """Categories outside the schema from an internal caller are a 422, not a NaN prediction"""
+    payload = {**BASE, **changes}
+    assert codec.trusted_customer(payload) is None
+    with patch.object(settings, 'internal_token', "secret"):
+        response = client.post("/api/predict", json=payload, headers={"X-Internal-Token": "secret"})
+        batch = client.post("/api/predict/batch", json={"customers": [BASE, payload]},
+                            headers={"X-Internal-Token": "secret"})
+    field = next(iter(changes))
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", field]
+    assert batch.status_code == 422
+    assert batch.json()["detail"][0]["loc"] == ["body", "customers", 1, field]
+
+def test_internal_token_mismatch_is_not_trusted():
+    with patch.object(settings, 'internal_token', "secret"):
+        assert endpoints._is_internal("secret")
+        assert not endpoints._is_internal("secreT")
+        assert not endpoints._is_internal("sécret")
+        assert not endpoints._is_internal(None)
+    with patch.object(settings, 'internal_token', None):
+        assert not endpoints._is_internal("secret")
@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api import endpoints, scoring
+from src.api.executor import ScoringExecutor
+from src.models.model_manager import ModelManager
+from src.models.trainer import ModelTrainer
+
+def test_thread_executor_reports_queue_and_waits():
+    """Tasks beyond the worker count queue up and their waits are recorded"""
+    executor = ScoringExecutor('thread', workers=1)
+    futures = [executor.submit(time.sleep, 0.02) for _ in range(4)]
+    stats = executor.stats()
+    assert stats["pending"] == 4
+    assert stats["queue_depth"] == 3
+
+    for future in futures:
+        future.result()
+    stats = executor.stats()
+    executor.shutdown()
+    assert stats["pending"] == 0
+    assert stats["completed"] == 4
+    # The last task waited for the three before it
+    assert stats["p95_wait_ms"] >= 40
+
+def test_executor_passes_errors_through():
+    """Exceptions raised by a task reach the caller, also through asyncio"""
+    executor = ScoringExecutor('thread', workers=1)
+
+    async def run():
+        return await asyncio.wrap_future(executor.submit(int, "not a number"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    executor.shutdown()
+
+def test_unknown_executor_kind():
+    with pytest.raises(ValueError):
+        ScoringExecutor('fiber')
+
+def _trained_model() -> ModelTrainer:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'risk_score': rng.uniform(0, 100, 500)})
+    df['churn'] = (df['risk_score'] + rng.normal(0, 20, 500) > 50).astype(int)
+    trainer = ModelTrainer()
+    trainer.model.set_params(n_estimators=20)
+    X, y = trainer.prepare_data(df)
+    trainer.train(X, y)
+    return trainer
+
+def _loaded_models():
+    """Runs in a process worker"""
+    return list(scoring._worker_models)
+
+def test_process_workers_match_thread_scoring(tmp_path):
+    """Process workers preload the model and score like the API's own copy"""
+    trainer = _trained_model()
+    model_path = str(tmp_path / "model.pkl")
+    trainer.save_model(model_path)
+    version = ModelManager(str(tmp_path)).save_model(trainer.get_model_data(), {})
+
+    customers = endpoints.CANARY_CUSTOMERS
+    executor = ScoringExecutor(
+        'process', workers=1, initializer=scoring.init_worker, initargs=(model_path, str(tmp_path))
+    )
+    try:
+        # The startup model and a saved version, loaded inside the worker
+        startup = executor.submit(scoring.score_customers, [(c, None) for c in customers]).result()
+        versioned = executor.submit(scoring.score_batch, customers, version).result()
+        assert executor.stats()["completed"] == 2
+    finally:
+        executor.shutdown()
+
+    expected = scoring.score_customers([(c, trainer) for c in customers])
+    for (record, output), (expected_record, expected_output) in zip(startup, expected):
+        assert record == expected_record
+        np.testing.assert_allclose(output, expected_output)
+    records, outputs, _ = versioned
+    assert records == [record for record, _ in expected]
+    np.testing.assert_allclose(outputs, scoring.predict_frame(trainer, scoring.risk_scorer.customers_to_frame(customers)))
+
+def test_broadcast_warms_up_every_process_worker(tmp_path):
+    """A version is loaded in each worker before it takes traffic"""
+    trainer = _trained_model()
+    model_path = str(tmp_path / "model.pkl")
+    trainer.save_model(model_path)
+    version = ModelManager(str(tmp_path)).save_model(trainer.get_model_data(), {})
+
+    executor = ScoringExecutor(
+        'process', workers=2, initializer=scoring.init_worker, initargs=(model_path, str(tmp_path))
+    )
+    try:
+        pids = executor.broadcast(scoring.warm_up_worker, version, endpoints.CANARY_CUSTOMERS)
+        loaded = executor.broadcast(_loaded_models)
+    finally:
+        executor.shutdown()
+
+    assert len(set(pids)) == 2
+    assert loaded == [[None, version], [None, version]]
+
+def test_thread_broadcast_runs_once():
+    executor = ScoringExecutor('thread', workers=2)
+    try:
+        assert executor.broadcast(scoring.worker_pid) == [scoring.worker_pid()]
+    finally:
+        executor.shutdown()
@@ -0,0 +1,164 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.data.cache import FeatureCache
+from src.data.ingestion import DataIngestion
+
+def _raw_frame(n, seed=0):
+    """Build a transformed customer frame like load_data returns"""
+    rng = np.random.default_rng(seed)
+    tenure = rng.integers(0, 60, n)
+    monthly_charges = rng.uniform(100, 1000, n).round(2)
+    return pd.DataFrame({
+        'customer_id': np.arange(n).astype(str),
+        'tenure': tenure,
+        'monthly_charges': monthly_charges,
+        'total_charges': monthly_charges * tenure,
+        'contract_type': rng.choice(['Basic', 'Standard', 'Premium'], n),
+        'tech_support': rng.choice(['Yes', 'No'], n),
+        'internet_service': rng.choice(['Fiber optic', 'DSL', 'No'], n),
+        'churn': rng.integers(0, 2, n),
+        'Age': rng.integers(18, 65, n),
+        'Gender': rng.choice(['Male', 'Female'], n),
+        'Payment Delay': rng.integers(0, 30, n),
+        'Contract Length': rng.choice(['Monthly', 'Quarterly', 'Annual'], n)
+    })
+
+def _kaggle_csv(path, n, seed=0):
+    """Write a CSV in the Kaggle churn dataset layout"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'CustomerID': np.arange(n) + 1.0,
+        'Age': rng.integers(18, 65, n),
+        'Gender': rng.choice(['Male', 'Female'], n),
+        'Tenure': rng.integers(1, 60, n),
+        'Usage Frequency': rng.integers(1, 30, n),
+        'Support Calls': rng.integers(0, 10, n),
+        'Payment Delay': rng.integers(0, 30, n),
+        'Subscription Type': rng.choice(['Basic', 'Standard', 'Premium', 'Gold'], n),
+        'Contract Length': rng.choice(['Monthly', 'Quarterly', 'Annual'], n),
+        'Total Spend': rng.uniform(100, 1000, n).round(2),
+        'Last Interaction': rng.integers(1, 30, n),
+        'Churn': rng.integers(0, 2, n)
+    })
+    df.loc[3, 'Age'] = np.nan
+    df.to_csv(path, index=False)
+    return df
+
+def test_load_data_maps_kaggle_values(tmp_path):
+    """Support calls, usage frequency and subscription types map to our categories"""
+    path = str(tmp_path / "churn.csv")
+    raw = _kaggle_csv(path, 500)
+    df = DataIngestion().load_data(path)
+
+    source = raw.set_index('CustomerID').loc[df['customer_id']]
+    expected_support = np.where(source['Support Calls'] > 2, 'Yes', 'No')
+    expected_service = [
+        'Fiber optic' if x > 5 else 'DSL' if x > 2 else 'No'
+        for x in source['Usage Frequency']
+    ]
+    assert (df['tech_support'].values == expected_support).all()
+    assert (df['internet_service'].values == np.array(expected_service)).all()
+    assert set(df['contract_type']) <= {'Basic', 'Standard', 'Premium'}
+    assert 4.0 not in df['customer_id'].values  # Row with missing Age dropped
+    assert (df['total_charges'] == df['monthly_charges'] * df['tenure']).all()
+
+def test_load_data_keeps_source_columns_and_types(tmp_path):
+    """Unmapped columns stay, count for dropna, and integers stay integers"""
+    path = str(tmp_path / "churn.csv")
+    raw = _kaggle_csv(path, 500)
+    raw.loc[7, 'Last Interaction'] = np.nan
+    raw.to_csv(path, index=False)
+    df = DataIngestion().load_data(path)
+
+    assert 'Last Interaction' in df.columns
+    assert not {4.0, 8.0} & set(df['customer_id'])  # Missing Age, missing Last Interaction
+    assert len(df) == len(raw[raw['Subscription Type'] != 'Gold'].dropna())
+    assert df['tenure'].dtype == np.int64 and df['Payment Delay'].dtype == np.int64
+    assert df['Age'].dtype == np.float64  # Had a missing value in the file
+    assert df['Gender'].dtype == object and df['Contract Length'].dtype == object
+
+def test_iter_load_data_matches_load_data(tmp_path):
+    """Concatenated chunks equal the in-memory load"""
+    path = str(tmp_path / "churn.csv")
+    _kaggle_csv(path, 2000, seed=1)
+    data_ingestion = DataIngestion()
+
+    chunks = list(data_ingestion.iter_load_data(path, chunksize=300))
+    assert len(chunks) == 7
+    assert max(len(chunk) for chunk in chunks) <= 300
+    pd.testing.assert_frame_equal(pd.concat(chunks), data_ingestion.load_data(path))
+
+def test_fit_preprocessing_matches_legacy_on_training_frame():
+    """Frozen statistics reproduce the batch-statistics features they came from"""
+    df = _raw_frame(1000)
+    legacy = DataIngestion().preprocess_data(df)
+
+    data_ingestion = DataIngestion()
+    state = data_ingestion.fit_preprocessing(df)
+    assert state['medians']['monthly_charges'] == df['monthly_charges'].median()
+    pd.testing.assert_frame_equal(data_ingestion.preprocess_data(df), legacy)
+
+def test_chunked_preprocessing_matches_whole_frame():
+    """With a fitted state, features do not depend on how rows are batched"""
+    df = _raw_frame(1000, seed=1)
+    data_ingestion = DataIngestion()
+    state = data_ingestion.fit_preprocessing(df)
+
+    whole = data_ingestion.preprocess_data(df, state)
+    chunks = pd.concat(
+        [data_ingestion.preprocess_data(df.iloc[i:i + 97], state) for i in range(0, len(df), 97)],
+        ignore_index=True
+    )
+    np.testing.assert_array_equal(chunks['risk_score'].values, whole['risk_score'].values)
+
+def test_preprocess_record_matches_frame_with_state():
+    """The per-record path applies the same frozen statistics"""
+    df = _raw_frame(200, seed=2)
+    data_ingestion = DataIngestion()
+    state = data_ingestion.fit_preprocessing(df)
+    expected = data_ingestion.preprocess_data(df, state)['risk_score'].values
+
+    records = df.to_dict('records')
+    scores = [data_ingestion.preprocess_record(r, state)['risk_score'] for r in records]
+    np.testing.assert_array_equal(np.array(scores), expected)
+
+def test_single_row_cost_risk_uses_training_median():
+    """A single expensive customer gets cost risk once the median is frozen"""
+    df = _raw_frame(1000, seed=3)
+    data_ingestion = DataIngestion()
+    state = data_ingestion.fit_preprocessing(df)
+
+    row = df.iloc[[0]].copy()
+    row['monthly_charges'] = state['medians']['monthly_charges'] * 2
+    without_state = DataIngestion().preprocess_data(row)['risk_score'].iloc[0]
+    with_state = data_ingestion.preprocess_data(row, state)['risk_score'].iloc[0]
+    assert with_state - without_state == pytest.approx(10)
+
+def test_feature_cache_round_trip(tmp_path):
+    """A second run on unchanged data skips the transformation"""
+    path = str(tmp_path / "churn.csv")
+    _kaggle_csv(path, 300, seed=4)
+    data_ingestion = DataIngestion()
+    cache = FeatureCache(str(tmp_path / "cache"))
+    calls = []
+
+    def load():
+        calls.append(1)
+        return data_ingestion.load_data(path)
+
+    fresh = cache.get_or_compute(path, 'load', data_ingestion.transform_version, load)
+    cached = cache.get_or_compute(path, 'load', data_ingestion.transform_version, load)
+    assert len(calls) == 1
+    assert isinstance(cached['contract_type'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        data_ingestion.preprocess_data(cached),
+        data_ingestion.preprocess_data(fresh.reset_index(drop=True))
+    )
+
+    # Changed content or transformation version misses the cache
+    cache.get_or_compute(path, 'load', 'other', load)
+    _kaggle_csv(path, 300, seed=5)
+    cache.get_or_compute(path, 'load', data_ingestion.transform_version, load)
+    assert len(calls) == 3
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from unittest.mock import patch
+
+from benchmarks.loadtest import Scenario, Target, compare, run_scenario
+from benchmarks.workload import customer_payloads
+from src.api import endpoints, scoring
+from src.api.batching import MicroBatcher
+from src.api.executor import ScoringExecutor
+from src.api.routing import ShadowScorer
+from src.config import settings
+
+def _result(name, **metrics):
+    return {"name": name, "rate": None, "errors": 0, **metrics}
+
+def test_compare_flags_only_changes_beyond_tolerance():
+    baseline = {"scenarios": [
+        _result("predict", throughput_rps=1000.0, latency_p95_ms=10.0, cpu_ms_per_request=1.0),
+        {**_result("open", throughput_rps=100.0, latency_p99_ms=5.0), "rate": 100.0}
+    ]}
+    results = {"scenarios": [
+        _result("predict", throughput_rps=800.0, latency_p95_ms=10.5, cpu_ms_per_request=None),
+        {**_result("open", throughput_rps=50.0, latency_p99_ms=9.0), "rate": 100.0, "errors": 2},
+        _result("new", throughput_rps=1.0)
+    ]}
+    regressions = compare(results, baseline, tolerance=0.1)
+    assert [r.split(" ")[0:2] for r in regressions] == [
+        ["predict:", "throughput_rps"], ["open:", "errors"], ["open:", "latency_p99_ms"]
+    ]
+
+def test_workload_is_reproducible():
+    assert customer_payloads(50, seed=3) == customer_payloads(50, seed=3)
+    assert customer_payloads(50, seed=3) != customer_payloads(50, seed=4)
+
+def test_in_process_scenarios_run():
+    """Closed- and open-loop runs against the app report every request"""
+    async def run():
+        payloads = customer_payloads(200)
+        async with Target('inprocess', log_level='warning') as target:
+            assert logging.getLogger().level == logging.WARNING
+            closed = await run_scenario(target, Scenario("c4", "/api/predict", concurrency=4),
+                                        payloads, duration=0.3, warmup=0)
+            opened = await run_scenario(target, Scenario("open", "/api/predict/batch", rate=20, batch_size=10),
+                                        payloads, duration=0.5, warmup=0)
+        return closed, opened
+
+    # App startup and shutdown would otherwise stop the pools other tests share
+    executor = ScoringExecutor('thread', 2)
+    with patch.object(endpoints, 'model', None), \
+            patch.object(endpoints, 'model_version', None), \
+            patch.object(endpoints, 'scoring_executor', executor), \
+            patch.object(endpoints, 'micro_batcher', MicroBatcher(scoring.score_customers, executor)), \
+            patch.object(endpoints, 'shadow_scorer', ShadowScorer(endpoints.monitor)), \
+            patch.object(settings, 'log_level', settings.log_level):
+        closed, opened = asyncio.run(run())
+    assert closed["requests"] > 0 and closed["errors"] == 0
+    assert closed["latency_p50_ms"] <= closed["latency_p99_ms"]
+    assert opened["requests"] == 10 and opened["errors"] == 0
+    assert opened["customers_per_second"] > 0
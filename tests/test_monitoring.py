@@ -0,0 +1,118 @@
+import json
+import multiprocessing
+import os
+import numpy as np
+import pytest
+
+from src.monitoring.aggregator import RollingMetrics
+from src.monitoring.log_writer import BufferedLogWriter
+from src.monitoring.performance import ModelMonitor
+
+def test_log_writer_appends_json_lines(tmp_path):
+    """Buffered records land on disk as one JSON object per line"""
+    path = str(tmp_path / "log.jsonl")
+    writer = BufferedLogWriter(path, flush_interval=60)
+    for i in range(5):
+        writer.write({"i": i})
+    assert not os.path.exists(path)  # Nothing written on the caller's thread
+
+    writer.flush()
+    with open(path) as f:
+        assert [json.loads(line)["i"] for line in f] == list(range(5))
+    writer.close()
+
+def _read_rotated(path, backup_count):
+    """Records of a log and its backups, oldest first"""
+    records = []
+    for name in [f"{path}.{i}" for i in range(backup_count, 0, -1)] + [path]:
+        if os.path.exists(name):
+            with open(name) as f:
+                records += [json.loads(line) for line in f]
+    return records
+
+def test_log_writer_rotates_in_order(tmp_path):
+    """Rotation shifts older records into numbered backups"""
+    path = str(tmp_path / "log.jsonl")
+    writer = BufferedLogWriter(path, flush_interval=60, max_file_bytes=40, backup_count=10)
+    for i in range(20):
+        writer.write({"i": i})
+        writer.flush()
+
+    assert os.path.exists(path + ".1")
+    assert [r["i"] for r in _read_rotated(path, 10)] == list(range(20))
+    writer.close()
+
+def _write_from_process(path, worker):
+    writer = BufferedLogWriter(path, flush_interval=60, max_file_bytes=2000, backup_count=1000)
+    for i in range(200):
+        writer.write({"worker": worker, "i": i, "padding": "x" * 50})
+        if i % 7 == 0:
+            writer.flush()
+    writer.close()
+
+def test_log_writer_shared_between_processes(tmp_path):
+    """Writers in several processes rotate one file without losing or mixing lines"""
+    path = str(tmp_path / "log.jsonl")
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_write_from_process, args=(path, w)) for w in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+
+    records = _read_rotated(path, 1000)
+    assert sorted((r["worker"], r["i"]) for r in records) == [(w, i) for w in range(3) for i in range(200)]
+    for w in range(3):
+        assert [r["i"] for r in records if r["worker"] == w] == list(range(200))
+
+def test_log_writer_drops_when_backlogged(tmp_path):
+    """A full buffer drops records instead of blocking the caller"""
+    writer = BufferedLogWriter(str(tmp_path / "log.jsonl"), flush_interval=60, max_pending_records=3, max_buffer_records=100)
+    for i in range(5):
+        writer.write({"i": i})
+    assert writer.dropped_records == 2
+    writer.close()
+
+def test_monitor_reports_dropped_records(tmp_path):
+    monitor = ModelMonitor(log_dir=str(tmp_path), flush_interval=60)
+    monitor._writers[monitor.error_log_path].dropped_records = 3
+    assert monitor.dropped_records() == {"predictions": 0, "errors": 3, "shadow": 0}
+    monitor.close()
+
+def test_monitor_logs_predictions_and_errors(tmp_path):
+    """Logged predictions and errors are visible to the metrics query"""
+    monitor = ModelMonitor(log_dir=str(tmp_path), flush_interval=60)
+    for i in range(4):
+        monitor.log_prediction(f"CUST{i}", 0.25 * i, {"tenure": i}, 0.01 * (i + 1))
+    monitor.log_error(ValueError("bad input"), {"customer_id": "CUST9"})
+
+    metrics = monitor.get_performance_metrics()
+    assert metrics.avg_response_time == pytest.approx(0.025)
+    assert metrics.error_rate == 0.25
+    monitor.close()
+
+def test_rolling_metrics_windows():
+    """Window queries only count buckets inside the window"""
+    metrics = RollingMetrics(bucket_seconds=60)
+    now = 1_700_000_000.0
+    for minute in range(120):
+        metrics.record_request(0.01, [0.05], timestamp=now - minute * 60)
+    metrics.record_error(timestamp=now)
+
+    last_hour = metrics.summary(3600, now=now)
+    assert last_hour['requests_per_minute'] == pytest.approx(60 / 59)
+    assert last_hour['error_rate'] == pytest.approx(1 / 60)
+    assert last_hour['prediction_distribution']['0.0-0.1'] == pytest.approx(10)
+    assert metrics.summary(24 * 3600, now=now)['error_rate'] == pytest.approx(1 / 120)
+    assert metrics.summary(3600, now=now + 3 * 3600) is None
+
+def test_rolling_metrics_p95_sketch():
+    """The quantile sketch stays within its relative error bound"""
+    metrics = RollingMetrics()
+    response_times = np.linspace(0.001, 0.1, 1000)
+    for rt in response_times:
+        metrics.record_request(rt, [0.5], timestamp=1_700_000_000.0)
+
+    summary = metrics.summary(3600, now=1_700_000_000.0)
+    assert summary['p95_response_time'] == pytest.approx(np.quantile(response_times, 0.95), rel=0.1)
+    assert summary['avg_response_time'] == pytest.approx(response_times.mean())
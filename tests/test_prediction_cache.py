@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from src.api.prediction_cache import PredictionCache
+from src.data.ingestion import CustomerData
+
+CUSTOMER = dict(
+    customer_id="CUST1", tenure=5, monthly_charges=250.0, total_charges=1250.0,
+    contract_type="Basic", tech_support="No", internet_service="DSL",
+    churn=0, Age=30, Gender="Male", Payment_Delay=3
+)
+
+def test_key_ignores_customer_id_and_normalizes_numbers():
+    """Equal attributes share a key, a different version does not"""
+    cache = PredictionCache()
+    key = cache.key(CustomerData(**CUSTOMER), "v1")
+    same = cache.key(CustomerData(**{**CUSTOMER, "customer_id": "CUST2", "monthly_charges": 250}), "v1")
+    assert key == same and hash(key) == hash(same)
+    # Fields no feature or risk factor reads do not split entries
+    assert cache.key(CustomerData(**{**CUSTOMER, "churn": 1, "total_charges": 99.0}), "v1") == key
+    assert cache.key(CustomerData(**CUSTOMER), "v2") != key
+    assert cache.key(CustomerData(**{**CUSTOMER, "tenure": 6}), "v1") != key
+
+def test_lru_eviction_and_ttl():
+    """The cache stays bounded and expires old entries"""
+    cache = PredictionCache(max_entries=2, ttl_seconds=10)
+    with patch('src.api.prediction_cache.time.monotonic', return_value=0.0):
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1  # 'b' is now least recently used
+        cache.put('c', 3)
+        assert cache.get('b') is None
+    with patch('src.api.prediction_cache.time.monotonic', return_value=11.0):
+        assert cache.get('a') is None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (1, 2, 1, 1)
+
+def test_puts_started_before_clear_are_dropped():
+    """A result computed by a model replaced meanwhile is not cached"""
+    cache = PredictionCache()
+    generation = cache.generation
+    cache.clear()  # e.g. /admin/reload while the request was scoring
+    cache.put('a', 1, generation=generation)
+    assert cache.get('a') is None
+    cache.put('a', 2, generation=cache.generation)
+    assert cache.get('a') == 2
@@ -0,0 +1,77 @@
+import json
+import pytest
+
+from src.models.model_manager import ModelManager
+from src.models.registry import ModelRegistry
+
+def _register(registry, version, roc_auc):
+    """Register a version with a small artifact file"""
+    path = f"{registry.models_dir}/model_{version}.pkl"
+    with open(path, 'wb') as f:
+        f.write(version.encode())
+    return registry.register(version, version[2:], {'roc_auc': roc_auc, 'timing': {}}, ['risk_score'], path)
+
+def test_latest_and_aliases(tmp_path):
+    """Latest is the last registered version and aliases resolve to versions"""
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.latest() is None
+    _register(registry, 'v_20240102_000000', 0.8)
+    _register(registry, 'v_20240101_000000', 0.7)
+    registry.set_alias('production', 'v_20240102_000000')
+
+    assert registry.latest()['version'] == 'v_20240101_000000'
+    assert registry.resolve('production') == 'v_20240102_000000'
+    assert registry.get('production')['aliases'] == ['production']
+    assert registry.get('v_20240101_000000')['metrics'] == {'roc_auc': 0.7}
+    with pytest.raises(ValueError):
+        registry.set_alias('production', 'v_missing')
+
+def test_alias_of_an_alias_pins_its_version(tmp_path):
+    """Pointing an alias at another alias stores the version behind it"""
+    manager = ModelManager(str(tmp_path))
+    registry = manager.registry
+    _register(registry, 'v_20240101_000000', 0.7)
+    _register(registry, 'v_20240102_000000', 0.8)
+    registry.set_alias('staging', 'v_20240101_000000')
+    registry.set_alias('production', 'staging')
+    registry.set_alias('staging', 'v_20240102_000000')
+
+    assert registry.resolve('production') == 'v_20240101_000000'
+    assert registry.get('production')['aliases'] == ['production']
+    assert ModelRegistry(str(tmp_path)).aliases() == {
+        'staging': 'v_20240102_000000', 'production': 'v_20240101_000000'
+    }
+
+def test_list_versions_filters(tmp_path):
+    """Listing is newest first and honours filters"""
+    registry = ModelRegistry(str(tmp_path))
+    for day, roc_auc in enumerate([0.6, 0.9, 0.75]):
+        _register(registry, f'v_2024010{day + 1}_000000', roc_auc)
+    registry.set_alias('production', 'v_20240101_000000')
+
+    versions = lambda **kw: [e['version'] for e in registry.list_versions(**kw)]
+    assert versions() == ['v_20240103_000000', 'v_20240102_000000', 'v_20240101_000000']
+    assert versions(metric='roc_auc', min_value=0.7) == ['v_20240103_000000', 'v_20240102_000000']
+    assert versions(since='20240102_000000', limit=1) == ['v_20240103_000000']
+    assert versions(alias='production') == ['v_20240101_000000']
+
+def test_registry_sees_other_writers(tmp_path):
+    """Appends from another instance are picked up incrementally"""
+    reader = ModelRegistry(str(tmp_path))
+    writer = ModelRegistry(str(tmp_path))
+    _register(writer, 'v_20240101_000000', 0.8)
+    assert reader.latest()['version'] == 'v_20240101_000000'
+    writer.set_alias('production', 'v_20240101_000000')
+    assert reader.resolve('production') == 'v_20240101_000000'
+
+def test_manager_backfills_existing_versions(tmp_path):
+    """Versions saved before the manifest existed are indexed in order"""
+    for version in ['v_20240102_000000', 'v_20240101_000000']:
+        with open(tmp_path / f"model_{version}.pkl", 'wb') as f:
+            f.write(b'model')
+        with open(tmp_path / f"info_{version}.json", 'w') as f:
+            json.dump({'version': version, 'timestamp': version[2:], 'metrics': {}, 'feature_columns': []}, f)
+
+    manager = ModelManager(str(tmp_path))
+    assert manager.latest_version() == 'v_20240102_000000'
+    assert manager.get_model_info('v_20240101_000000')['sha256']
@@ -0,0 +1,158 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.api import endpoints, scoring
+from src.api.prediction_cache import PredictionCache
+from src.api.routing import CandidateRoute, ShadowScorer
+from src.models.model_manager import ModelManager
+from src.models.trainer import ModelTrainer
+from src.monitoring.performance import ModelMonitor
+
+app = FastAPI()
+app.include_router(endpoints.router, prefix="/api")
+ADMIN_TOKEN = "test-admin"
+client = TestClient(app, headers={"X-Admin-Token": ADMIN_TOKEN})
+
+@pytest.fixture
+def served(tmp_path):
+    """An untrained model being served and one trained version saved on disk"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'risk_score': rng.uniform(0, 100, 500)})
+    df['churn'] = (df['risk_score'] + rng.normal(0, 20, 500) > 50).astype(int)
+    trainer = ModelTrainer()
+    trainer.model.set_params(n_estimators=20)
+    X, y = trainer.prepare_data(df)
+    trainer.train(X, y)
+
+    manager = ModelManager(str(tmp_path))
+    version = manager.save_model(trainer.get_model_data(), {})
+
+    old_model = ModelTrainer()
+    old_model.feature_columns = ['risk_score']
+    with patch.object(endpoints, 'model_manager', ModelManager(str(tmp_path))), \
+            patch.object(endpoints, 'model', old_model), \
+            patch.object(endpoints, 'model_version', None), \
+            patch.object(endpoints, 'candidate_route', None), \
+            patch.object(endpoints, 'prediction_cache', PredictionCache()), \
+            patch.object(endpoints.settings, 'admin_token', ADMIN_TOKEN):
+        yield version, old_model
+
+def test_reload_swaps_in_latest_version(served):
+    """Reloading serves the newest saved version"""
+    version, old_model = served
+    response = client.post("/api/admin/reload")
+    assert response.status_code == 200
+    assert response.json()["version"] == version
+    assert endpoints.model is not old_model
+    assert endpoints.model.is_trained
+    assert client.get("/api/health").json()["model_version"] == version
+
+    customer = endpoints.CANARY_CUSTOMERS[0].dict(by_alias=True)
+    assert client.post("/api/predict", json=customer).status_code == 200
+
+def test_failed_reload_keeps_current_model(served):
+    """An unknown version is rejected and the old model keeps serving"""
+    _, old_model = served
+    response = client.post("/api/admin/reload", params={"version": "v_missing"})
+    assert response.status_code == 404
+    assert endpoints.model is old_model
+
+    with patch.object(endpoints, '_warm_up', side_effect=RuntimeError("bad canary")):
+        response = client.post("/api/admin/reload")
+    assert response.status_code == 500
+    assert endpoints.model is old_model
+
+def test_reload_requires_admin_token(served):
+    """A configured admin token must be presented"""
+    with patch.object(endpoints.settings, 'admin_token', 'secret'):
+        assert client.post("/api/admin/reload").status_code == 403
+        response = client.post("/api/admin/reload", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
+
+def test_admin_endpoints_are_off_without_a_token(served):
+    """An unconfigured deployment rejects every admin call, whatever the caller sends"""
+    version, old_model = served
+    with patch.object(endpoints.settings, 'admin_token', None):
+        for method, path in [
+            ("POST", "/api/admin/reload"),
+            ("POST", f"/api/admin/candidate?version={version}"),
+            ("DELETE", "/api/admin/candidate"),
+            ("POST", f"/api/admin/models/{version}/alias/production"),
+            ("POST", "/api/admin/tracing?enabled=false"),
+            ("POST", "/api/admin/profile?seconds=0.1")
+        ]:
+            for headers in ({}, {"X-Admin-Token": ""}, {"X-Admin-Token": ADMIN_TOKEN}):
+                response = client.request(method, path, headers=headers)
+                assert response.status_code == 403, (method, path, headers)
+    assert endpoints.model is old_model
+    assert endpoints.model_manager.registry.aliases() == {}
+
+def test_models_endpoint_lists_registry(served):
+    """The registry listing includes saved versions and aliases"""
+    version, _ = served
+    assert client.post(f"/api/admin/models/{version}/alias/production").status_code == 200
+    assert client.post("/api/admin/models/v_missing/alias/production").status_code == 404
+
+    body = client.get("/api/models").json()
+    assert [m['version'] for m in body['models']] == [version]
+    assert body['aliases'] == {'production': version}
+
+    response = client.post("/api/admin/reload", params={"version": "production"})
+    assert response.json()["version"] == version
+
+def test_shadow_candidate_logs_comparisons(served, tmp_path):
+    """Shadow scoring leaves responses alone and logs both models' outputs"""
+    version, old_model = served
+    monitor = ModelMonitor(log_dir=str(tmp_path / "logs"), flush_interval=60)
+    scorer = ShadowScorer(monitor)
+    customers = [c.dict(by_alias=True) for c in endpoints.CANARY_CUSTOMERS]
+
+    with patch.object(endpoints, 'monitor', monitor), patch.object(endpoints, 'shadow_scorer', scorer):
+        expected = client.post("/api/predict/batch", json={"customers": customers}).json()
+        response = client.post("/api/admin/candidate", params={"version": version, "mode": "shadow"})
+        assert response.json() == {"version": version, "mode": "shadow", "traffic": 0.0}
+
+        assert client.post("/api/predict/batch", json={"customers": customers}).json() == expected
+        client.post("/api/predict", json=customers[0])
+        assert scorer.wait_idle(timeout=10)
+
+    monitor.flush()
+    with open(monitor.shadow_log_path) as f:
+        records = sorted((json.loads(line) for line in f), key=lambda r: r['customer_id'])
+    assert [r['customer_id'] for r in records] == ['CANARY1', 'CANARY1', 'CANARY2']
+    assert {r['shadow_version'] for r in records} == {version}
+    assert all(r['primary_output'] != r['shadow_output'] for r in records)
+    monitor.close()
+
+def test_split_routing_is_stable_per_customer():
+    """A customer always lands in the same arm and the share matches the traffic"""
+    route = CandidateRoute(ModelTrainer(), 'v_candidate', mode='split', traffic=0.2)
+    customer_ids = [f"CUST{i}" for i in range(10000)]
+    assigned = route.assign(customer_ids)
+    assert assigned.mean() == pytest.approx(0.2, abs=0.02)
+    np.testing.assert_array_equal(route.assign(customer_ids), assigned)
+    assert not CandidateRoute(ModelTrainer(), 'v', mode='shadow').assign(customer_ids).any()
+    with pytest.raises(ValueError):
+        CandidateRoute(ModelTrainer(), 'v', mode='mirror')
+
+def test_prediction_cache_hits_and_reload_invalidates(served):
+    """Repeated customers are served from the cache until the model changes"""
+    cache = endpoints.prediction_cache
+    customer = endpoints.CANARY_CUSTOMERS[0].dict(by_alias=True)
+    first = client.post("/api/predict", json=customer).json()
+
+    with patch.object(scoring, 'predict_customer', side_effect=AssertionError("not cached")):
+        again = client.post("/api/predict", json={**customer, "customer_id": "OTHER"}).json()
+    assert again == {**first, "customer_id": "OTHER"}
+    assert cache.stats()['hits'] == 1
+
+    client.post("/api/admin/reload")
+    assert cache.stats()['entries'] == 0
+    client.post("/api/predict", json=customer)
+    assert cache.stats()['misses'] == 2
+    assert client.get("/api/metrics").json()['cache']['hits'] == 1
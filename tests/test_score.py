@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import score
+from src.data.ingestion import DataIngestion
+from src.models.trainer import ModelTrainer
+from tests.test_ingestion import _kaggle_csv, _raw_frame
+
+@pytest.fixture
+def model_path(tmp_path):
+    """A small trained model saved to disk"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'risk_score': rng.uniform(0, 100, 500)})
+    df['churn'] = (df['risk_score'] + rng.normal(0, 20, 500) > 50).astype(int)
+    trainer = ModelTrainer()
+    trainer.model.set_params(n_estimators=20)
+    X, y = trainer.prepare_data(df)
+    trainer.train(X, y)
+    # Frozen statistics make every row's features independent of its shard
+    trainer.preprocessing = DataIngestion().fit_preprocessing(_raw_frame(500))
+    path = str(tmp_path / "model.pkl")
+    trainer.save_model(path)
+    return path
+
+@pytest.mark.parametrize("shard_bytes", [1, 97, 4096, 1 << 20])
+def test_csv_shards_cover_every_line_once(tmp_path, shard_bytes):
+    path = str(tmp_path / "churn.csv")
+    raw = _kaggle_csv(path, 300)
+    shards = score.plan_shards(path, shard_bytes)
+    rows = pd.concat([score.read_shard(shard) for shard in shards], ignore_index=True)
+    assert rows['CustomerID'].tolist() == raw['CustomerID'].tolist()
+
+def test_score_file_matches_single_process_scoring(tmp_path, model_path):
+    """Sharded, multi-process output equals scoring the whole file at once"""
+    path = str(tmp_path / "churn.csv")
+    _kaggle_csv(path, 2000)
+    output_dir = str(tmp_path / "scored")
+    summary = score.score_file(path, output_dir, model_path=model_path, workers=2, shard_bytes=20000)
+    assert summary["shards"] > 2
+    assert summary["rows_read"] == 2000
+
+    result = pd.read_parquet(output_dir).sort_values('customer_id', ignore_index=True)
+    trainer = ModelTrainer.load_model(model_path)
+    expected = score.score_frame(pd.read_csv(path), trainer)
+    assert summary["rows_scored"] == len(DataIngestion().load_data(path)) == len(result)
+    assert result.columns.tolist() == score.OUTPUT_COLUMNS
+    pd.testing.assert_frame_equal(result, expected)
+
+    with pytest.raises(FileExistsError):
+        score.score_file(path, output_dir, model_path=model_path, workers=1)
+
+def test_parquet_input_partitioned_output(tmp_path, model_path):
+    path = str(tmp_path / "churn.parquet")
+    raw = _kaggle_csv(str(tmp_path / "churn.csv"), 1000)
+    raw.to_parquet(path, row_group_size=250)
+    assert len(score.plan_shards(path, shard_bytes=1)) == 4
+
+    output_dir = str(tmp_path / "scored")
+    summary = score.score_file(
+        path, output_dir, model_path=model_path, workers=2, shard_bytes=1, partition_by=['risk_level']
+    )
+    result = pd.read_parquet(output_dir)
+    assert len(result) == summary["rows_scored"] > 0
+    assert set(result['risk_level'].astype(str)) <= {'Low', 'Medium', 'High'}
@@ -0,0 +1,162 @@
+import pytest
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.api.endpoints import router
+from src.data.ingestion import DataIngestion, CustomerData
+from src.models.scoring import RiskScorer, RowFeaturePlan
+from src.models.trainer import ModelTrainer
+
+app = FastAPI()
+app.include_router(router, prefix="/api")
+client = TestClient(app)
+
+CUSTOMERS = [
+    {
+        "customer_id": "CUST009",
+        "tenure": 1,
+        "monthly_charges": 200.0,
+        "total_charges": 200.0,
+        "contract_type": "Basic",
+        "tech_support": "No",
+        "internet_service": "Fiber optic",
+        "churn": 0,
+        "Age": 22,
+        "Gender": "Male",
+        "Payment_Delay": 30
+    },
+    {
+        "customer_id": "CUST011",
+        "tenure": 12,
+        "monthly_charges": 120.0,
+        "total_charges": 1440.0,
+        "contract_type": "Standard",
+        "tech_support": "Yes",
+        "internet_service": "Fiber optic",
+        "churn": 0,
+        "Age": 35,
+        "Gender": "Male",
+        "Payment_Delay": 5
+    },
+    {
+        "customer_id": "CUST010",
+        "tenure": 60,
+        "monthly_charges": 70.0,
+        "total_charges": 4200.0,
+        "contract_type": "Premium",
+        "tech_support": "Yes",
+        "internet_service": "DSL",
+        "churn": 0,
+        "Age": 45,
+        "Gender": "Female",
+        "Payment Delay": 0
+    },
+    {
+        "customer_id": "CUST012",
+        "tenure": 3,
+        "monthly_charges": 95.5,
+        "total_charges": 286.5,
+        "contract_type": "Basic",
+        "tech_support": "No",
+        "internet_service": "No",
+        "churn": 1,
+        "Age": 19,
+        "Gender": "Female",
+        "Payment_Delay": 12
+    }
+]
+
+@pytest.fixture
+def risk_model():
+    """Fixture with an untrained model scoring from the risk score"""
+    trainer = ModelTrainer()
+    trainer.feature_columns = ['risk_score']
+    with patch('src.api.endpoints.model', trainer):
+        yield trainer
+
+def test_batch_matches_single_predictions(risk_model):
+    """Batch scoring must return exactly what the single endpoint returns"""
+    singles = []
+    for customer in CUSTOMERS:
+        response = client.post("/api/predict", json=customer)
+        assert response.status_code == 200
+        singles.append(response.json())
+
+    response = client.post("/api/predict/batch", json={"customers": CUSTOMERS})
+    assert response.status_code == 200
+    assert response.json()["predictions"] == singles
+
+def test_single_prediction_values(risk_model):
+    """Risk factors follow the documented formulas"""
+    response = client.post("/api/predict", json=CUSTOMERS[0])
+    result = response.json()
+    factors = result["risk_factors"]
+
+    assert factors["tenure_risk"] == pytest.approx(0.3 * np.exp(-1 / 3))
+    assert factors["payment_risk"] == pytest.approx(0.24)
+    assert factors["contract_risk"] == pytest.approx(0.15)
+    assert factors["service_risk"] == pytest.approx(0.15)
+    assert factors["cost_risk"] == pytest.approx(0.05)
+    assert factors["age_risk"] == pytest.approx(0.016)
+    assert result["churn_probability"] == pytest.approx(
+        sum(factors.values()) * 1.1
+    )
+    assert result["risk_level"] == "High"
+
+def test_batch_empty(risk_model):
+    """An empty batch returns no predictions"""
+    response = client.post("/api/predict/batch", json={"customers": []})
+    assert response.status_code == 200
+    assert response.json() == {"predictions": []}
+
+def test_batch_no_model():
+    """Batch endpoint reports a missing model like the single endpoint"""
+    with patch('src.api.endpoints.model', None):
+        response = client.post("/api/predict/batch", json={"customers": CUSTOMERS})
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Model not loaded"
+
+def _random_customers(n, seed=0):
+    """Generate valid random customers covering every category"""
+    rng = np.random.default_rng(seed)
+    return [
+        CustomerData(
+            customer_id=f"CUST{i}",
+            tenure=int(rng.integers(0, 80)),
+            monthly_charges=float(rng.uniform(-20, 400)),
+            total_charges=float(rng.uniform(0, 10000)),
+            contract_type=rng.choice(["Basic", "Premium", "Standard"]),
+            tech_support=rng.choice(["Yes", "No"]),
+            internet_service=rng.choice(["Fiber optic", "DSL", "No"]),
+            churn=int(rng.integers(0, 2)),
+            Age=int(rng.integers(15, 90)),
+            Gender=rng.choice(["Male", "Female"]),
+            Payment_Delay=int(rng.integers(0, 40))
+        )
+        for i in range(n)
+    ]
+
+def test_row_plan_matches_dataframe_path():
+    """The single-row fast path fills exactly what preprocess_data produces"""
+    feature_columns = ['unknown_feature', 'risk_score']
+    plan = RowFeaturePlan(feature_columns)
+    data_ingestion = DataIngestion()
+
+    for customer in _random_customers(200):
+        df = RiskScorer.customers_to_frame([customer])
+        df_processed = data_ingestion.preprocess_data(df)
+        df_processed['unknown_feature'] = 0
+        expected = df_processed[feature_columns].values
+
+        np.testing.assert_array_equal(plan.fill(customer), expected)
+
+def test_customer_columns_match_frame_scores():
+    """Scoring from plain arrays equals scoring from a DataFrame"""
+    scorer = RiskScorer()
+    for customer in _random_customers(50, seed=1):
+        from_frame = scorer.score(scorer.customers_to_frame([customer]))
+        from_columns = scorer.score(scorer.customer_columns(customer))
+        for name, values in from_frame.items():
+            np.testing.assert_array_equal(from_columns[name], values)
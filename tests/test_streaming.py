@@ -0,0 +1,113 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import endpoints
+from src.api.streaming import CustomerStreamParser
+from src.data.ingestion import CustomerData
+from src.models.trainer import ModelTrainer
+
+app = FastAPI()
+app.include_router(endpoints.router, prefix="/api")
+client = TestClient(app)
+
+CSV_HEADER = ("customer_id,tenure,monthly_charges,total_charges,contract_type,tech_support,"
+              "internet_service,churn,Age,Gender,Payment Delay\n")
+
+def _customer(i: int) -> dict:
+    return {**endpoints.CANARY_CUSTOMERS[i % 2].dict(by_alias=True), "customer_id": f"C{i}"}
+
+def _csv_row(i: int) -> str:
+    c = _customer(i)
+    return ",".join(str(c[name]) for name in CSV_HEADER.strip().split(",")) + "\n"
+
+@pytest.fixture
+def served():
+    untrained = ModelTrainer()
+    untrained.feature_columns = ['risk_score']
+    with patch.object(endpoints, 'model', untrained), \
+            patch.object(endpoints, 'model_version', None), \
+            patch.object(endpoints, 'candidate_route', None):
+        yield untrained
+
+def test_parser_handles_lines_split_across_pieces():
+    """Lines are parsed only once complete, however the bytes arrive"""
+    upload = (CSV_HEADER + _csv_row(0) + "\n" + _csv_row(1).replace("Premium", "Gold") + _csv_row(2)).encode()
+    parser = CustomerStreamParser('csv')
+    parsed = []
+    for i in range(0, len(upload), 7):
+        parsed.extend(parser.feed(upload[i:i + 7]))
+    parsed.extend(parser.close())
+
+    assert [line for line, _ in parsed] == [2, 4, 5]
+    assert isinstance(parsed[0][1], CustomerData) and parsed[0][1].customer_id == "C0"
+    assert "contract_type" in parsed[1][1]
+    assert parsed[2][1].Payment_Delay == _customer(2)["Payment Delay"]
+
+def test_parser_rejects_overlong_lines():
+    parser = CustomerStreamParser('ndjson', max_line_bytes=500)
+    parsed = parser.feed(b"x" * 600) + parser.feed(b"x" * 600 + b"\n" + json.dumps(_customer(0)).encode())
+    parsed += parser.close()
+    assert [line for line, _ in parsed] == [1, 2]
+    assert "longer than" in parsed[0][1]
+    assert parsed[1][1].customer_id == "C0"
+
+def test_stream_matches_batch_endpoint(served):
+    """NDJSON and CSV uploads score like /predict/batch and report bad lines in place"""
+    customers = [_customer(i) for i in range(7)]
+    expected = client.post("/api/predict/batch", json={"customers": customers}).json()["predictions"]
+
+    ndjson = "".join(json.dumps(c) + "\n" for c in customers[:3]) + "{bad json\n" + \
+        "".join(json.dumps(c) + "\n" for c in customers[3:])
+    response = client.post("/api/predict/stream", params={"chunk_size": 3}, content=ndjson,
+                           headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[3]["line"] == 4 and "error" in lines[3]
+    assert lines[:3] + lines[4:] == expected
+
+    csv_body = CSV_HEADER + "".join(_csv_row(i) for i in range(7))
+    response = client.post("/api/predict/stream", params={"chunk_size": 2}, content=csv_body,
+                           headers={"Content-Type": "text/csv"})
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+def test_results_arrive_before_upload_finishes(served):
+    """The first chunk is answered while the client is still sending"""
+    async def run():
+        body = asyncio.Queue()
+        sent = asyncio.Queue()
+
+        async def receive():
+            return await body.get()
+
+        async def send(message):
+            await sent.put(message)
+
+        scope = {
+            "type": "http", "method": "POST", "path": "/api/predict/stream",
+            "query_string": b"chunk_size=2", "headers": [(b"content-type", b"application/x-ndjson")],
+            "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("test", 1),
+            "root_path": ""
+        }
+        serving = asyncio.ensure_future(app(scope, receive, send))
+
+        piece = "".join(json.dumps(_customer(i)) + "\n" for i in range(2)).encode()
+        await body.put({"type": "http.request", "body": piece, "more_body": True})
+        assert (await asyncio.wait_for(sent.get(), 5))["type"] == "http.response.start"
+        first = await asyncio.wait_for(sent.get(), 5)
+        assert [json.loads(line)["customer_id"] for line in first["body"].splitlines()] == ["C0", "C1"]
+
+        # Only now does the rest of the upload arrive
+        await body.put({"type": "http.request", "body": json.dumps(_customer(2)).encode(), "more_body": False})
+        await asyncio.wait_for(serving, 5)
+        messages = []
+        while not sent.empty():
+            messages.append(await sent.get())
+        return b"".join(message.get("body", b"") for message in messages)
+
+    rest = asyncio.run(run())
+    assert [json.loads(line)["customer_id"] for line in rest.splitlines()] == ["C2"]
@@ -0,0 +1,114 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import endpoints
+from src.config import settings
+from src.models.trainer import ModelTrainer
+from src.monitoring.profiler import ProfilerBusy, SamplingProfiler
+from src.monitoring.tracing import StageTimers, prometheus_histograms
+
+app = FastAPI()
+app.include_router(endpoints.router, prefix="/api")
+ADMIN_TOKEN = "test-admin"
+client = TestClient(app, headers={"X-Admin-Token": ADMIN_TOKEN})
+
+def test_stage_histograms_are_cumulative():
+    timers = StageTimers(buckets=[0.001, 0.01])
+    timers.record("model", 500_000)  # 0.5ms
+    timers.record("model", 5_000_000)
+    timers.record("model", 50_000_000)
+    with timers.stage("validate"):
+        pass
+    cumulative, total, count = timers.snapshot()["model"]
+    assert cumulative == [1, 2, 3]
+    assert count == 3 and total == pytest.approx(0.0555)
+    assert timers.snapshot()["validate"][2] == 1
+
+    lines = prometheus_histograms("stage_seconds", "Stages", timers)
+    assert 'stage_seconds_bucket{stage="model",le="0.01"} 2' in lines
+    assert 'stage_seconds_bucket{stage="model",le="+Inf"} 3' in lines
+    assert 'stage_seconds_count{stage="model"} 3' in lines
+
+def test_disabled_timers_record_nothing():
+    timers = StageTimers(enabled=False)
+    with timers.stage("model"):
+        pass
+    assert timers.snapshot() == {}
+
+@pytest.fixture
+def served():
+    untrained = ModelTrainer()
+    untrained.feature_columns = ['risk_score']
+    with patch.object(endpoints, 'model', untrained), \
+            patch.object(endpoints, 'model_version', None), \
+            patch.object(endpoints, 'candidate_route', None), \
+            patch.object(endpoints, 'stage_timers', StageTimers()) as timers, \
+            patch('src.api.scoring.stage_timers', timers), \
+            patch.object(settings, 'admin_token', ADMIN_TOKEN):
+        endpoints.prediction_cache.clear()
+        yield timers
+
+def test_metrics_negotiate_prometheus_text(served):
+    customer = endpoints.CANARY_CUSTOMERS[0].dict(by_alias=True)
+    assert client.post("/api/predict", json=customer).status_code == 200
+    assert client.post("/api/predict/batch", json={"customers": [customer]}).status_code == 200
+    assert {"validate", "score", "features", "model", "risk_factors", "preprocess", "align", "log"} \
+        <= set(served.snapshot())
+
+    metrics = client.get("/api/metrics").json()
+    assert "avg_response_time" in metrics
+    assert metrics["logging"]["app_records_dropped"] == 0
+    assert metrics["logging"]["predictions_records_dropped"] == 0
+    scraped = client.get("/api/metrics", headers={
+        "Accept": "application/openmetrics-text;version=1.0.0,text/plain;version=0.0.4;q=0.5,*/*;q=0.1"
+    })
+    assert scraped.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'churn_stage_duration_seconds_count{stage="model"}' in scraped.text
+    assert "churn_executor_workers" in scraped.text
+    assert "churn_logging_predictions_records_dropped 0.0" in scraped.text
+    assert client.get("/api/metrics?format=prometheus").text.startswith("# HELP")
+
+def test_tracing_can_be_switched_off(served):
+    assert client.post("/api/admin/tracing?enabled=false&reset=true").json() == {"enabled": False}
+    client.post("/api/predict", json=endpoints.CANARY_CUSTOMERS[1].dict(by_alias=True))
+    assert served.snapshot() == {}
+
+def test_profiler_samples_busy_threads():
+    stop = threading.Event()
+
+    def busy_loop():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_loop, name="busy worker")
+    worker.start()
+    profiler = SamplingProfiler()
+    try:
+        stacks = profiler.sample(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+    busy = [stack for stack in stacks if stack.startswith("busy_worker;")]
+    assert busy and all("test_tracing:test_profiler_samples_busy_threads.<locals>.busy_loop" in s for s in busy)
+    line = profiler.folded(stacks).splitlines()[0]
+    assert int(line.rsplit(" ", 1)[1]) >= 1
+
+def test_profiles_are_opt_in_and_exclusive():
+    with patch.object(settings, 'admin_token', ADMIN_TOKEN):
+        assert client.post("/api/admin/profile?seconds=0.1").status_code == 404
+    with patch.object(settings, 'profiling_enabled', True), patch.object(settings, 'admin_token', ADMIN_TOKEN):
+        response = client.post("/api/admin/profile?seconds=0.1")
+        assert response.status_code == 200 and response.text
+
+        profiler = SamplingProfiler()
+        capture = threading.Thread(target=profiler.sample, args=(0.3,))
+        capture.start()
+        time.sleep(0.05)
+        with pytest.raises(ProfilerBusy):
+            profiler.sample(0.1)
+        capture.join()
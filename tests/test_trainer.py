@@ -0,0 +1,149 @@
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from src.models.search import HyperparameterSearch
+from src.models.trainer import ModelTrainer
+
+def _training_frame(n, seed=0):
+    """Risk-score features with a churn label that depends on them"""
+    rng = np.random.default_rng(seed)
+    risk_score = rng.uniform(0, 100, n)
+    churn = (rng.uniform(0, 100, n) < risk_score).astype(int)
+    return pd.DataFrame({'risk_score': risk_score, 'churn': churn})
+
+@pytest.mark.parametrize("engine", ["gbm", "hist"])
+def test_train_reports_held_out_metrics(engine):
+    """Training fits the model and evaluates it on unseen rows"""
+    trainer = ModelTrainer(engine=engine)
+    if engine == 'gbm':
+        trainer.model.set_params(n_estimators=20)
+    X, y = trainer.prepare_data(_training_frame(2000))
+    metrics = trainer.train(X, y)
+
+    assert trainer.is_trained
+    assert 0.6 < metrics['roc_auc'] <= 1.0
+    assert set(metrics['feature_importance']) == {'risk_score'}
+    assert metrics['timing']['engine'] == engine
+    assert metrics['timing']['n_test'] == 400
+
+    probabilities = trainer.predict(X[:5])
+    np.testing.assert_array_equal(probabilities, trainer.model.predict_proba(X[:5])[:, 1])
+
+def test_split_data_holds_out_the_rows_train_evaluates():
+    """Rows kept from a search with split_data are the ones train() scores"""
+    trainer = ModelTrainer()
+    trainer.model.set_params(n_estimators=20)
+    X, y = trainer.prepare_data(_training_frame(1000))
+    _, X_test, _, y_test = trainer.split_data(X, y)
+    metrics = trainer.train(X, y)
+
+    assert metrics['roc_auc'] == roc_auc_score(y_test, trainer.model.predict_proba(X_test)[:, 1])
+
+def test_untrained_model_scores_from_risk_score(tmp_path):
+    """An unfitted saved model keeps the risk-score conversion"""
+    trainer = ModelTrainer()
+    trainer.feature_columns = ['risk_score']
+    path = str(tmp_path / "model.pkl")
+    trainer.save_model(path)
+
+    loaded = ModelTrainer.load_model(path)
+    assert not loaded.is_trained
+    np.testing.assert_array_equal(loaded.predict(np.array([[42.0]])), [0.42])
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        ModelTrainer(engine='xgboost')
+
+def test_hyperparameter_search_halving():
+    """Successive halving narrows the candidates and ranks the largest rung first"""
+    trainer = ModelTrainer()
+    X, y = trainer.prepare_data(_training_frame(1500, seed=1))
+    search = HyperparameterSearch(
+        engine='hist', n_candidates=9, n_splits=2,
+        min_samples=50, n_jobs=2
+    )
+    search.sample_candidates = lambda: [
+        {'learning_rate': lr, 'max_depth': 2, 'max_iter': 10}
+        for lr in np.linspace(0.05, 0.3, 9)
+    ]
+    results = search.run(X, y)
+
+    rows = sorted({entry['n_samples'] for entry in results['leaderboard']})
+    assert len(rows) == 3
+    assert [sum(e['n_samples'] == r for e in results['leaderboard']) for r in rows] == [9, 3, 1]
+    assert results['best_params'] == results['leaderboard'][0]['params']
+    assert not results['timed_out']
+
+@pytest.mark.parametrize("engine", ["gbm", "hist"])
+def test_search_score_matches_raw_feature_refit(engine):
+    """The winner scores the same when refit on raw features over the search's folds"""
+    rng = np.random.default_rng(3)
+    # The signal sits in a few crowded values; a long sparse tail holds most distinct ones
+    levels = rng.integers(0, 20, 1500)
+    tail = rng.random(1500) < 0.3
+    df = pd.DataFrame({
+        'a': np.where(tail, rng.uniform(1, 100, 1500), levels / 20),
+        'b': rng.normal(size=1500)
+    })
+    df['churn'] = np.where(tail, 0, levels % 2)
+    trainer = ModelTrainer(engine=engine)
+    X, y = trainer.prepare_data(df)
+
+    params = {'learning_rate': 0.1, 'max_depth': 3}
+    params.update({'max_iter': 50} if engine == 'hist' else {'n_estimators': 50, 'subsample': 1.0})
+    search = HyperparameterSearch(engine=engine, strategy='random', n_splits=3, n_jobs=1)
+    search.sample_candidates = lambda: [params]
+    results = search.run(X, y)
+
+    folds = StratifiedKFold(n_splits=3, shuffle=True, random_state=search.random_state).split(X, y)
+    scores = []
+    for train, test in folds:
+        model = ModelTrainer(engine=engine).model.set_params(**params)
+        model.fit(X[train], y[train])
+        scores.append(roc_auc_score(y[test], model.predict_proba(X[test])[:, 1]))
+    assert results['best_score'] == pytest.approx(np.mean(scores), abs=0.01)
+
+@pytest.mark.parametrize("engine", ["gbm", "hist"])
+def test_compiled_ensemble_matches_predict_proba(engine, tmp_path):
+    """The saved array-backed ensemble reproduces predict_proba exactly"""
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(rng.normal(size=(3000, 4)), columns=['a', 'b', 'c', 'd'])
+    df['churn'] = (df['a'] + df['b'] ** 2 + rng.normal(size=3000) > 1).astype(int)
+    df.loc[rng.random(3000) < 0.05, 'c'] = np.nan
+
+    trainer = ModelTrainer(engine=engine)
+    if engine == 'gbm':
+        df['c'] = df['c'].fillna(0)  # Exact trees do not accept missing values
+        trainer.model.set_params(n_estimators=50)
+    X, y = trainer.prepare_data(df)
+    trainer.train(X, y)
+
+    path = str(tmp_path / "model.pkl")
+    trainer.save_model(path)
+    loaded = ModelTrainer.load_model(path)
+    assert loaded.compiled is not None
+
+    expected = trainer.model.predict_proba(X)
+    np.testing.assert_array_equal(loaded.compiled.predict_proba(X), expected)
+    for n in (1, 7):
+        np.testing.assert_array_equal(loaded.predict(X[:n]), expected[:n, 1])
+
+def test_load_model_maps_arrays_from_file(tmp_path):
+    """Loaded arrays are file-backed and survive the file being replaced"""
+    trainer = ModelTrainer(engine='hist')
+    X, y = trainer.prepare_data(_training_frame(2000))
+    trainer.train(X, y)
+    path = str(tmp_path / "model.pkl")
+    trainer.save_model(path)
+
+    loaded = ModelTrainer.load_model(path)
+    assert isinstance(loaded.compiled.children, np.memmap)
+    assert isinstance(loaded.model._predictors[0][0].nodes, np.memmap)
+
+    expected = trainer.model.predict_proba(X)[:, 1]
+    trainer.save_model(path)  # Overwrite while the old file is still mapped
+    np.testing.assert_array_equal(loaded.predict(X), expected)
+    np.testing.assert_array_equal(loaded.predict(X[:5]), expected[:5])
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from src.data.ingestion import DataIngestion
+from src.data.validator import DataValidator
+from tests.test_ingestion import _kaggle_csv, _raw_frame
+
+def _frame(n=5000):
+    """Transformed customers with missing values in a numeric and a categorical column"""
+    df = _raw_frame(n)
+    df['Contract Length'] = np.random.default_rng(1).choice(['Monthly', 'Annual'], n)
+    df.loc[::9, 'Age'] = np.nan
+    df.loc[::11, 'tech_support'] = None
+    return df
+
+def test_statistics_match_pandas():
+    """Blocked statistics equal pandas' on the same frame"""
+    df = _frame()
+    validator = DataValidator(block_rows=512)
+    report = validator.validate_data(df)
+    assert report.is_valid and report.total_records == len(df)
+    assert report.missing_values == df[validator.required_columns].isnull().sum().to_dict()
+    for col in validator.numerical_columns:
+        expected = {"mean": df[col].mean(), "std": df[col].std(), "min": df[col].min(), "max": df[col].max()}
+        assert report.numerical_statistics[col] == pytest.approx(expected)
+    for col in validator.categorical_columns:
+        assert report.categorical_distributions[col] == pytest.approx(df[col].value_counts(normalize=True).to_dict())
+
+def test_merged_chunks_match_one_pass():
+    """Partial statistics merged in any split give the one-pass report"""
+    df = _frame()
+    validator = DataValidator()
+    whole = validator.validate_data(df)
+
+    # Partials computed separately (e.g. in other processes) and merged
+    left = validator.new_stats().update(df.iloc[:1234])
+    right = validator.new_stats().update(df.iloc[1234:4000]).update(df.iloc[4000:])
+    merged = validator.report(left.merge(right))
+    chunked = validator.validate_chunks(df.iloc[i:i + 700] for i in range(0, len(df), 700))
+    for report in (merged, chunked):
+        assert report.total_records == whole.total_records
+        assert report.missing_values == whole.missing_values
+        assert report.categorical_distributions == whole.categorical_distributions
+        for col, stats in whole.numerical_statistics.items():
+            assert report.numerical_statistics[col] == pytest.approx(stats)
+
+def test_schema_errors():
+    """Missing columns, non-numeric values and unknown categories are reported"""
+    df = _frame(200).drop(columns=['Gender'])
+    df['contract_type'] = df['contract_type'].where(df.index % 5 > 0, 'Gold')
+    df['tenure'] = df['tenure'].astype(object).where(df.index % 7 > 0, 'twelve')
+    report = DataValidator().validate_data(df)
+    assert not report.is_valid
+    assert report.validation_errors == [
+        "Missing required columns: ['Gender']",
+        f"Non-numeric values in tenure: {len(df.index[::7])}",
+        "Unexpected values in contract_type: ['Gold']"
+    ]
+    assert 'Gender' not in report.missing_values
+
+def test_validates_chunked_loader_output(tmp_path):
+    """Streaming the loader's chunks validates like the loaded frame"""
+    path = str(tmp_path / "kaggle.csv")
+    _kaggle_csv(path, 3000)
+    ingestion = DataIngestion()
+    validator = DataValidator(ingestion)
+    streamed = validator.validate_chunks(ingestion.iter_load_data(path, chunksize=500))
+    loaded = validator.validate_data(ingestion.load_data(path))
+    assert streamed.is_valid, streamed.validation_errors
+    assert streamed.total_records == loaded.total_records
+    assert streamed.numerical_statistics['Age'] == pytest.approx(loaded.numerical_statistics['Age'])
+    assert streamed.categorical_distributions == loaded.categorical_distributions
+
+def test_non_numeric_values_are_not_also_missing():
+    """A value that is not a number counts as invalid only, a missing one as missing only"""
+    df = _frame(200)
+    df['tenure'] = df['tenure'].astype(object)
+    df.loc[[0, 1, 2], 'tenure'] = 'twelve'
+    df.loc[[3, 4], 'tenure'] = None
+    validator = DataValidator(block_rows=64)
+    report = validator.validate_data(df)
+    assert report.missing_values['tenure'] == 2
+    assert report.validation_errors == ["Non-numeric values in tenure: 3"]
+
+    merged = validator.report(validator.new_stats().update(df.iloc[:100]).merge(
+        validator.new_stats().update(df.iloc[100:])))
+    assert merged.missing_values['tenure'] == 2
+    assert merged.validation_errors == report.validation_errors